@@ -17,9 +17,24 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.database import Base
-from app.models import user, wish, like, comment, view, engagement, user_statistics
+import app.models  # noqa: F401  (registers every model on Base.metadata)
+from app.models.types import UTCDateTime
 target_metadata = Base.metadata
 
+
+def render_item(type_, obj, autogen_context):
+    # UTCDateTime is a Python-side wrapper, the column itself is a plain DateTime
+    if type_ == "type" and isinstance(obj, UTCDateTime):
+        return "sa.DateTime()"
+    return False
+
+
+def include_name(name, type_, parent_names):
+    # The FTS5 search index and its shadow tables are managed by hand
+    if type_ == "table" and name.startswith("search_index"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -44,6 +59,9 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_name=include_name,
+        render_item=render_item,
     )
 
     with context.begin_transaction():
@@ -65,7 +83,11 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,  # SQLite needs batch mode for ALTER TABLE
+            include_name=include_name,
+            render_item=render_item,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,32 @@
+"""full text search index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 11:02:15.381204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.search_index import install_search_index, SEARCH_INDEX_DROP_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # FTS5 virtual table + sync triggers, then index the existing rows once
+    install_search_index(op.get_bind(), backfill=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DROP_DDL:
+        op.execute(statement)
@@ -0,0 +1,50 @@
+"""content addressed blob store
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 05:34:05.718249
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(), nullable=False),
+    sa.Column('extension', sa.String(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_attachments_blob_sha256'), ['blob_sha256'], unique=False)
+        batch_op.create_foreign_key('fk_attachments_blob_sha256_blobs', 'blobs', ['blob_sha256'], ['sha256'])
+
+    # Plain ADD COLUMN without a foreign key: recreating wishes in batch mode
+    # would drop the search index triggers
+    op.add_column('wishes', sa.Column('cover_blob_sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('wishes', 'cover_blob_sha256')
+
+    with op.batch_alter_table('attachments', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_attachments_blob_sha256_blobs', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_attachments_blob_sha256'))
+        batch_op.drop_column('blob_sha256')
+
+    op.drop_table('blobs')
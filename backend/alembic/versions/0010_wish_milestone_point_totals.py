@@ -0,0 +1,37 @@
+"""wish milestone point totals
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 05:47:23.125370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain ADD COLUMN: recreating wishes in batch mode would drop the search index triggers
+    op.add_column('wishes', sa.Column('total_points', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('wishes', sa.Column('completed_points', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing milestones; from here on they are maintained incrementally
+    op.execute(
+        "UPDATE wishes SET "
+        "total_points = (SELECT coalesce(sum(coalesce(points, 0)), 0) FROM milestones WHERE milestones.wish_id = wishes.id), "
+        "completed_points = (SELECT coalesce(sum(coalesce(points, 0)), 0) FROM milestones "
+        "WHERE milestones.wish_id = wishes.id AND milestones.is_completed)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('wishes', 'completed_points')
+    op.drop_column('wishes', 'total_points')
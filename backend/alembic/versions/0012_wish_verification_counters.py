@@ -0,0 +1,41 @@
+"""wish verification counters
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 05:51:36.485778
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain ADD COLUMN: recreating wishes in batch mode would drop the search index triggers
+    op.add_column('wishes', sa.Column('verifications_pending', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('wishes', sa.Column('verifications_approved', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('wishes', sa.Column('verifications_disputed', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing verification records (statuses are stored by enum name)
+    op.execute(
+        "UPDATE wishes SET "
+        + ", ".join(
+            f"verifications_{name.lower()} = (SELECT count(*) FROM completion_verifications "
+            f"WHERE completion_verifications.wish_id = wishes.id AND completion_verifications.status = '{name}')"
+            for name in ("PENDING", "APPROVED", "DISPUTED")
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('wishes', 'verifications_disputed')
+    op.drop_column('wishes', 'verifications_approved')
+    op.drop_column('wishes', 'verifications_pending')
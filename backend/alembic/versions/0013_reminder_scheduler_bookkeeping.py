@@ -0,0 +1,51 @@
+"""reminder scheduler bookkeeping
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 05:54:13.631557
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('milestones', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deadline_reminded_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_milestones_is_completed_target_date', ['is_completed', 'target_date'], unique=False)
+
+    # Plain ADD COLUMN: recreating wishes in batch mode would drop the search index triggers
+    op.add_column('wishes', sa.Column('verification_requested_at', sa.DateTime(), nullable=True))
+    op.add_column('wishes', sa.Column('verification_reminded_at', sa.DateTime(), nullable=True))
+    op.add_column('wishes', sa.Column('verification_escalated_at', sa.DateTime(), nullable=True))
+    op.add_column('wishes', sa.Column('deadline_reminded_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_wishes_completion_status_verification_requested_at', 'wishes', ['completion_status', 'verification_requested_at'], unique=False)
+
+    # Wishes already waiting on verification count from their latest verification request
+    op.execute(
+        "UPDATE wishes SET verification_requested_at = coalesce("
+        "(SELECT max(created_at) FROM completion_verifications WHERE completion_verifications.wish_id = wishes.id), "
+        "datetime('now')) "
+        "WHERE completion_status = 'PENDING_VERIFICATION'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wishes_completion_status_verification_requested_at', table_name='wishes')
+    op.drop_column('wishes', 'deadline_reminded_at')
+    op.drop_column('wishes', 'verification_escalated_at')
+    op.drop_column('wishes', 'verification_reminded_at')
+    op.drop_column('wishes', 'verification_requested_at')
+
+    with op.batch_alter_table('milestones', schema=None) as batch_op:
+        batch_op.drop_index('ix_milestones_is_completed_target_date')
+        batch_op.drop_column('deadline_reminded_at')
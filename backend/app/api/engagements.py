@@ -4,7 +4,7 @@ from sqlalchemy import func
 from typing import Optional
 from datetime import datetime, timezone
 from app.schemas.engagement import LikeCreate, CommentCreate, CommentUpdate, ViewCreate, EngagementStats
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.like import Like
 from app.models.comment import Comment
 from app.models.view import View
@@ -12,6 +12,7 @@ from app.models.user import User
 from app.models.wish import Wish
 from app.api.users import get_current_user_from_token
 from app.api.notifications import create_notification
+from app.services.write_coordinator import run_write
 
 router = APIRouter()
 
@@ -39,35 +40,37 @@ def toggle_like(
         user_id = user.id
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    return run_write(db, lambda session: _toggle_like(session, user_id, like.wish_id))
+
+def _toggle_like(db: Session, user_id: int, wish_id: int):
     # Check if already liked
     existing_like = db.query(Like).filter(
         Like.user_id == user_id,
-        Like.wish_id == like.wish_id
+        Like.wish_id == wish_id
     ).first()
     
     if existing_like:
         # Unlike
         db.delete(existing_like)
-        db.commit()
         return {"message": "Unliked", "liked": False}
-    else:
-        # Like
-        new_like = Like(user_id=user_id, wish_id=like.wish_id)
-        db.add(new_like)
-        db.commit()
-        
-        # Create notification for wish owner
-        wish = db.query(Wish).filter(Wish.id == like.wish_id).first()
-        if wish:
-            create_notification(
-                db=db,
-                user_id=wish.user_id,
-                notification_type="like",
-                wish_id=wish.id,
-                actor_id=user_id
-            )
-        
-        return {"message": "Liked", "liked": True}
+    
+    # Like
+    db.add(Like(user_id=user_id, wish_id=wish_id))
+    
+    # Create notification for wish owner
+    wish_owner_id = db.query(Wish.user_id).filter(Wish.id == wish_id).scalar()
+    if wish_owner_id is not None:
+        create_notification(
+            db=db,
+            user_id=wish_owner_id,
+            notification_type="like",
+            wish_id=wish_id,
+            actor_id=user_id,
+            commit=False
+        )
+    
+    return {"message": "Liked", "liked": True}
 
 @router.post("/comments", status_code=status.HTTP_201_CREATED)
 def create_comment(
@@ -110,7 +113,7 @@ def create_comment(
     return new_comment
 
 @router.get("/wishes/{wish_id}/stats")
-def get_engagement_stats(wish_id: int, user_id: int = 1, db: Session = Depends(get_db)):
+def get_engagement_stats(wish_id: int, user_id: int = 1, db: Session = Depends(get_read_db)):
     likes_count = db.query(func.count(Like.id)).filter(Like.wish_id == wish_id).scalar()
     comments_count = db.query(func.count(Comment.id)).filter(Comment.wish_id == wish_id).scalar()
     views_count = db.query(func.count(View.id)).filter(View.wish_id == wish_id).scalar()
@@ -130,24 +133,24 @@ def get_engagement_stats(wish_id: int, user_id: int = 1, db: Session = Depends(g
 
 @router.post("/views", status_code=status.HTTP_201_CREATED)
 def record_view(view: ViewCreate, user_id: int = 1, db: Session = Depends(get_db)):
-    new_view = View(user_id=user_id, wish_id=view.wish_id)
-    db.add(new_view)
-    db.commit()
+    run_write(db, lambda session: session.add(View(user_id=user_id, wish_id=view.wish_id)))
     return {"message": "View recorded"}
 
 @router.get("/wishes/{wish_id}/comments")
-def get_comments(wish_id: int, db: Session = Depends(get_db)):
+def get_comments(wish_id: int, db: Session = Depends(get_read_db)):
     """Get all comments for a wish"""
-    comments = db.query(Comment).filter(Comment.wish_id == wish_id).order_by(Comment.created_at.desc()).all()
-    
+    # Authors joined in, rather than one user lookup per comment
+    comments = db.query(Comment, User.username).outerjoin(
+        User, User.id == Comment.user_id
+    ).filter(Comment.wish_id == wish_id).order_by(Comment.created_at.desc()).all()
+
     result = []
-    for comment in comments:
-        user = db.query(User).filter(User.id == comment.user_id).first()
+    for comment, username in comments:
         result.append({
             "id": comment.id,
             "wish_id": comment.wish_id,
             "user_id": comment.user_id,
-            "username": user.username if user else "Unknown",
+            "username": username or "Unknown",
             "content": comment.content,
             "created_at": ensure_utc(comment.created_at).isoformat()
         })
@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.models.follow import Follow
 from app.models.notification import Notification
 from app.api.users import get_current_user_from_token
+from app.core.serializers import json_response, encode_user_summary, encode_many
+from app.read_models import list_followers, list_following
 from datetime import datetime, timezone
 
 router = APIRouter()
@@ -89,50 +91,26 @@ def unfollow_user(
 @router.get("/{user_id}/followers")
 def get_user_followers(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_header)
 ):
     """Get list of users following the specified user"""
-    followers = db.query(Follow).filter(Follow.following_id == user_id).all()
-    
-    result = []
-    for follow in followers:
-        follower = db.query(User).filter(User.id == follow.follower_id).first()
-        if follower:
-            result.append({
-                "id": follower.id,
-                "username": follower.username,
-                "email": follower.email
-            })
-    
-    return result
+    return json_response(encode_many(encode_user_summary, list_followers(db, user_id)))
 
 @router.get("/{user_id}/following")
 def get_user_following(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_header)
 ):
     """Get list of users that the specified user is following"""
-    following = db.query(Follow).filter(Follow.follower_id == user_id).all()
-    
-    result = []
-    for follow in following:
-        followed_user = db.query(User).filter(User.id == follow.following_id).first()
-        if followed_user:
-            result.append({
-                "id": followed_user.id,
-                "username": followed_user.username,
-                "email": followed_user.email
-            })
-    
-    return result
+    return json_response(encode_many(encode_user_summary, list_following(db, user_id)))
 
 @router.get("/{user_id}/is-following")
 def check_following_status(
     user_id: int,
     current_user: User = Depends(get_current_user_from_header),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Check if current user is following the specified user"""
     follow = db.query(Follow).filter(
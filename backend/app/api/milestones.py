@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Header
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timezone
-from app.schemas.milestone import MilestoneCreate, MilestoneUpdate, Milestone as MilestoneSchema
-from app.database import get_db
+from app.schemas.milestone import MilestoneCreate, MilestoneUpdate, MilestoneBulkUpdate, Milestone as MilestoneSchema
+from app.database import get_async_db
 from app.models.milestone import Milestone
 from app.models.wish import Wish
-from app.api.users import get_current_user_from_token
+from app.models.user import User
+from app.api.users import get_current_user_from_token_async, get_current_user_from_credentials_async
 
 router = APIRouter()
 
@@ -16,11 +19,11 @@ async def create_milestone(
     wish_id: int,
     milestone: MilestoneCreate,
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new milestone for a wish"""
     # Verify wish exists and user has access
-    wish = db.query(Wish).filter(Wish.id == wish_id).first()
+    wish = await db.get(Wish, wish_id)
     if not wish:
         raise HTTPException(status_code=404, detail="Wish not found")
     
@@ -28,7 +31,7 @@ async def create_milestone(
     if authorization and authorization.startswith("Bearer "):
         token = authorization.replace("Bearer ", "")
         try:
-            user = get_current_user_from_token(token, db)
+            user = await get_current_user_from_token_async(token, db)
             if wish.user_id != user.id:
                 raise HTTPException(status_code=403, detail="Not authorized to add milestones to this wish")
         except:
@@ -43,11 +46,11 @@ async def create_milestone(
         target_date=milestone.target_date
     )
     db.add(db_milestone)
-    db.commit()
-    db.refresh(db_milestone)
     
-    # Update wish progress based on milestones
-    _update_wish_progress(wish, db)
+    # Update wish progress based on milestones, in the same transaction
+    await db.run_sync(lambda session: _update_wish_progress(wish, session, commit=False))
+    await db.commit()
+    await db.refresh(db_milestone)
     
     return db_milestone
 
@@ -55,18 +58,18 @@ async def create_milestone(
 @router.get("/api/wishes/{wish_id}/milestones", response_model=List[MilestoneSchema])
 async def get_milestones(
     wish_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all milestones for a wish"""
-    wish = db.query(Wish).filter(Wish.id == wish_id).first()
+    wish = await db.get(Wish, wish_id)
     if not wish:
         raise HTTPException(status_code=404, detail="Wish not found")
     
-    milestones = db.query(Milestone).filter(
-        Milestone.wish_id == wish_id
-    ).order_by(Milestone.order_index).all()
+    milestones = await db.scalars(
+        select(Milestone).where(Milestone.wish_id == wish_id).order_by(Milestone.order_index)
+    )
     
-    return milestones
+    return milestones.all()
 
 
 @router.patch("/api/milestones/{milestone_id}", response_model=MilestoneSchema)
@@ -74,25 +77,36 @@ async def update_milestone(
     milestone_id: int,
     milestone_update: MilestoneUpdate,
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a milestone"""
-    db_milestone = db.query(Milestone).filter(Milestone.id == milestone_id).first()
+    db_milestone = await db.get(Milestone, milestone_id)
     if not db_milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
     
     # Check authorization
-    wish = db.query(Wish).filter(Wish.id == db_milestone.wish_id).first()
+    wish = await db.get(Wish, db_milestone.wish_id)
     if authorization and authorization.startswith("Bearer "):
         token = authorization.replace("Bearer ", "")
         try:
-            user = get_current_user_from_token(token, db)
+            user = await get_current_user_from_token_async(token, db)
             if wish.user_id != user.id:
                 raise HTTPException(status_code=403, detail="Not authorized to update this milestone")
         except:
             pass
     
     # Update fields
+    _apply_milestone_update(db_milestone, milestone_update)
+    
+    # Update wish progress, in the same transaction
+    await db.run_sync(lambda session: _update_wish_progress(wish, session, commit=False))
+    await db.commit()
+    await db.refresh(db_milestone)
+    
+    return db_milestone
+
+
+def _apply_milestone_update(db_milestone: Milestone, milestone_update: MilestoneUpdate):
     update_data = milestone_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_milestone, field, value)
@@ -103,69 +117,96 @@ async def update_milestone(
             db_milestone.completed_at = datetime.now(timezone.utc)
         elif not milestone_update.is_completed:
             db_milestone.completed_at = None
+
+
+@router.patch("/api/wishes/{wish_id}/milestones:bulk", response_model=List[MilestoneSchema])
+async def bulk_update_milestones(
+    wish_id: int,
+    bulk: MilestoneBulkUpdate,
+    current_user: User = Depends(get_current_user_from_credentials_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Edit, complete and reorder several milestones of a wish in one transaction.
     
-    db.commit()
-    db.refresh(db_milestone)
-    
-    # Update wish progress
-    _update_wish_progress(wish, db)
-    
-    return db_milestone
+    Wish progress (and any completion notification) is evaluated once, after
+    all operations are applied. Returns the wish's milestones in order.
+    """
+    wish = await db.get(Wish, wish_id)
+    if not wish:
+        raise HTTPException(status_code=404, detail="Wish not found")
+    if wish.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to update milestones of this wish")
+    
+    milestones = {m.id: m for m in await db.scalars(select(Milestone).where(Milestone.wish_id == wish_id))}
+    requested_ids = [item.id for item in bulk.updates] + (bulk.order or [])
+    unknown = sorted(set(requested_ids) - milestones.keys())
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Milestones not found on this wish: {unknown}")
+    if bulk.order is not None and len(set(bulk.order)) != len(bulk.order):
+        raise HTTPException(status_code=400, detail="Milestone order contains duplicates")
+    
+    for item in bulk.updates:
+        _apply_milestone_update(milestones[item.id], MilestoneUpdate(**item.model_dump(exclude={"id"}, exclude_unset=True)))
+    for position, milestone_id in enumerate(bulk.order or []):
+        milestones[milestone_id].order_index = position
+    
+    await db.run_sync(lambda session: _update_wish_progress(wish, session, commit=False))
+    await db.commit()
+    
+    return sorted(milestones.values(), key=lambda m: (m.order_index, m.id))
 
 
 @router.delete("/api/milestones/{milestone_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_milestone(
     milestone_id: int,
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a milestone"""
-    db_milestone = db.query(Milestone).filter(Milestone.id == milestone_id).first()
+    db_milestone = await db.get(Milestone, milestone_id)
     if not db_milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
     
     # Check authorization
-    wish = db.query(Wish).filter(Wish.id == db_milestone.wish_id).first()
+    wish = await db.get(Wish, db_milestone.wish_id)
     if authorization and authorization.startswith("Bearer "):
         token = authorization.replace("Bearer ", "")
         try:
-            user = get_current_user_from_token(token, db)
+            user = await get_current_user_from_token_async(token, db)
             if wish.user_id != user.id:
                 raise HTTPException(status_code=403, detail="Not authorized to delete this milestone")
         except:
             pass
     
-    db.delete(db_milestone)
-    db.commit()
+    await db.delete(db_milestone)
     
-    # Update wish progress
-    _update_wish_progress(wish, db)
+    # Update wish progress, in the same transaction
+    await db.run_sync(lambda session: _update_wish_progress(wish, session, commit=False))
+    await db.commit()
     
     return None
 
 
-def _update_wish_progress(wish: Wish, db: Session):
+def _update_wish_progress(wish: Wish, db: Session, commit: bool = True):
     """Calculate and update wish progress based on completed milestones (weighted by points)"""
     from app.models.wish import CompletionStatus
     from app.models.completion_verification import CompletionVerification
     from app.models.user import User
-    from app.api.notifications import create_notification
+    from app.api.notifications import notify_users
     
     if wish.progress_mode != "milestone":
         return
     
-    milestones = db.query(Milestone).filter(Milestone.wish_id == wish.id).all()
-    if not milestones:
-        return
-    
-    # Calculate progress based on points (weighted)
-    total_points = sum(m.points for m in milestones)
-    completed_points = sum(m.points for m in milestones if m.is_completed)
-    
-    if total_points == 0:
+    # Point sums are maintained on the wish as milestones change (see app.models.milestone)
+    db.flush()
+    if wish.total_points == 0:
+        # Only a wish without milestones keeps its progress; zero-point milestones mean 0%
+        has_milestones = db.query(Milestone.id).filter(Milestone.wish_id == wish.id).first() is not None
+        if not has_milestones:
+            return
         new_progress = 0
     else:
-        new_progress = int((completed_points / total_points) * 100)
+        new_progress = int((wish.completed_points / wish.total_points) * 100)
     
     old_progress = wish.progress
     wish.progress = new_progress
@@ -178,24 +219,24 @@ def _update_wish_progress(wish: Wish, db: Session):
             # Don't mark as completed yet - wait for verification
             print(f"[milestones] Wish {wish.id} reached 100% - pending verification")
             
-            # Notify all verifiers
-            verifications = db.query(CompletionVerification).filter(
+            # Notify all verifiers, in one batch
+            verifier_ids = [row.verifier_user_id for row in db.query(CompletionVerification.verifier_user_id).filter(
                 CompletionVerification.wish_id == wish.id
-            ).all()
+            )]
             
             wish_owner = db.query(User).filter(User.id == wish.user_id).first()
-            for verification in verifications:
-                try:
-                    create_notification(
-                        db=db,
-                        user_id=verification.verifier_user_id,
-                        actor_id=wish.user_id,
-                        notification_type="verification_ready",
-                        wish_id=wish.id,
-                        content=f"{wish_owner.username if wish_owner else 'Someone'} has completed their goal '{wish.title}' and needs your verification!"
-                    )
-                except Exception as e:
-                    print(f"[milestones] Failed to notify verifier {verification.verifier_user_id}: {e}")
+            try:
+                notify_users(
+                    db=db,
+                    user_ids=verifier_ids,
+                    actor_id=wish.user_id,
+                    notification_type="verification_ready",
+                    wish_id=wish.id,
+                    content=f"{wish_owner.username if wish_owner else 'Someone'} has completed their goal '{wish.title}' and needs your verification!",
+                    commit=commit
+                )
+            except Exception as e:
+                print(f"[milestones] Failed to notify verifiers {verifier_ids}: {e}")
         else:
             # No verification required - mark as completed
             wish.status = "completed"
@@ -203,5 +244,6 @@ def _update_wish_progress(wish: Wish, db: Session):
             wish.completion_status = CompletionStatus.SELF_VERIFIED
             print(f"[milestones] Wish {wish.id} reached 100% - auto-completed (no verification required)")
     
-    db.commit()
+    if commit:
+        db.commit()
 
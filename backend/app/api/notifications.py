@@ -4,26 +4,40 @@ from sqlalchemy import func, or_, and_
 from typing import Optional, List
 from datetime import datetime, timedelta, timezone
 import json
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.notification import Notification
 from app.models.user import User
 from app.models.wish import Wish
 from app.api.users import get_current_user_from_token
+from app.services.change_tracking import record_changes, UPSERT
+from app.core.serializers import json_response, encode_notification
+from app.services.write_coordinator import run_write
+from app.read_models import list_notifications
 
 router = APIRouter()
 
 AGGREGATION_THRESHOLD = 3  # Aggregate if more than this many notifications
 AGGREGATION_WINDOW_HOURS = 24  # Aggregate within this time window
 
+def _commit_or_flush(db: Session, commit: bool):
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
 def create_notification(
     db: Session,
     user_id: int,
     notification_type: str,
     wish_id: int,
     actor_id: int,
-    content: Optional[str] = None
+    content: Optional[str] = None,
+    commit: bool = True
 ):
-    """Create a notification with smart aggregation"""
+    """Create a notification with smart aggregation.
+    
+    Pass commit=False to only flush, leaving the commit to the caller's transaction.
+    """
     
     # Don't notify yourself
     if user_id == actor_id:
@@ -49,7 +63,7 @@ def create_notification(
                 existing.actor_ids = json.dumps(actor_ids)
                 existing.updated_at = datetime.now(timezone.utc)
                 existing.is_read = False  # Mark as unread again
-                db.commit()
+                _commit_or_flush(db, commit)
         else:
             # Check if we should start aggregating
             count = db.query(func.count(Notification.id)).filter(
@@ -66,7 +80,7 @@ def create_notification(
                 existing.actor_id = None
                 existing.updated_at = datetime.now(timezone.utc)
                 existing.is_read = False
-                db.commit()
+                _commit_or_flush(db, commit)
             else:
                 # Create new individual notification
                 new_notif = Notification(
@@ -77,7 +91,7 @@ def create_notification(
                     content=content
                 )
                 db.add(new_notif)
-                db.commit()
+                _commit_or_flush(db, commit)
     else:
         # Create new notification
         new_notif = Notification(
@@ -88,14 +102,80 @@ def create_notification(
             content=content
         )
         db.add(new_notif)
-        db.commit()
+        _commit_or_flush(db, commit)
     
     return True
 
+def notify_users(
+    db: Session,
+    user_ids: List[int],
+    notification_type: str,
+    wish_id: int,
+    actor_id: int,
+    content: Optional[str] = None,
+    commit: bool = True
+):
+    """Send the same notification to several users, aggregating like create_notification.
+
+    Existing notifications of all recipients are looked up in one query and the
+    new ones are inserted in a single flush, instead of one round trip per user.
+    """
+    user_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id != actor_id]
+    if not user_ids:
+        return
+
+    aggregated_type = f"{notification_type}_aggregated"
+    time_threshold = datetime.now(timezone.utc) - timedelta(hours=AGGREGATION_WINDOW_HOURS)
+    recent = db.query(Notification).filter(
+        Notification.user_id.in_(user_ids),
+        Notification.wish_id == wish_id,
+        Notification.type.in_([notification_type, aggregated_type]),
+        Notification.created_at >= time_threshold
+    ).order_by(Notification.id).all()
+
+    # Per recipient: their aggregated notification if any, else their oldest one, and how many plain ones there are
+    existing_by_user = {}
+    plain_counts = {}
+    for notification in recent:
+        current = existing_by_user.get(notification.user_id)
+        if current is None or (notification.type == aggregated_type and current.type != aggregated_type):
+            existing_by_user[notification.user_id] = notification
+        if notification.type == notification_type:
+            plain_counts[notification.user_id] = plain_counts.get(notification.user_id, 0) + 1
+
+    now = datetime.now(timezone.utc)
+    new_notifications = []
+    for user_id in user_ids:
+        existing = existing_by_user.get(user_id)
+        if existing is not None and existing.type == aggregated_type:
+            actor_ids = json.loads(existing.actor_ids) if existing.actor_ids else []
+            if actor_id not in actor_ids:
+                actor_ids.append(actor_id)
+                existing.actor_ids = json.dumps(actor_ids)
+                existing.updated_at = now
+                existing.is_read = False
+        elif existing is not None and plain_counts.get(user_id, 0) >= AGGREGATION_THRESHOLD:
+            existing.type = aggregated_type
+            existing.actor_ids = json.dumps([existing.actor_id, actor_id])
+            existing.actor_id = None
+            existing.updated_at = now
+            existing.is_read = False
+        else:
+            new_notifications.append(Notification(
+                user_id=user_id,
+                type=notification_type,
+                wish_id=wish_id,
+                actor_id=actor_id,
+                content=content
+            ))
+
+    db.add_all(new_notifications)
+    _commit_or_flush(db, commit)
+
 @router.get("/")
 def get_notifications(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all notifications for the current user"""
     # Get current user
@@ -108,56 +188,26 @@ def get_notifications(
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    # Get notifications
-    notifications = db.query(Notification).filter(
-        Notification.user_id == user.id
-    ).order_by(Notification.updated_at.desc()).limit(50).all()
-    
-    # Enrich notifications with user and wish data
+    # Notifications with wish titles and actor names joined in
     result = []
-    for notif in notifications:
-        # Ensure timestamps are timezone-aware
-        created_at = notif.created_at if notif.created_at.tzinfo else notif.created_at.replace(tzinfo=timezone.utc)
-        updated_at = notif.updated_at if notif.updated_at.tzinfo else notif.updated_at.replace(tzinfo=timezone.utc)
-        
-        notif_data = {
-            "id": notif.id,
-            "type": notif.type,
-            "wish_id": notif.wish_id,
-            "content": notif.content,
-            "is_read": notif.is_read,
-            "created_at": created_at.isoformat(),
-            "updated_at": updated_at.isoformat(),
-        }
-        
-        # Get wish info
-        if notif.wish_id:
-            wish = db.query(Wish).filter(Wish.id == notif.wish_id).first()
-            if wish:
-                notif_data["wish_title"] = wish.title
-        
-        # Get actor info
-        if notif.actor_id:
-            actor = db.query(User).filter(User.id == notif.actor_id).first()
-            if actor:
-                notif_data["actor_username"] = actor.username
-                notif_data["actor_id"] = actor.id
-        
-        # Get aggregated actors
-        if notif.actor_ids:
-            actor_ids = json.loads(notif.actor_ids)
-            actors = db.query(User).filter(User.id.in_(actor_ids)).all()
-            notif_data["actor_usernames"] = [a.username for a in actors]
-            notif_data["count"] = len(actor_ids)
-        
+    for entry in list_notifications(db, user.id, limit=50):
+        notif_data = encode_notification(entry)
+        if entry.wish_title is not None:
+            notif_data["wish_title"] = entry.wish_title
+        if entry.actor_username is not None:
+            notif_data["actor_username"] = entry.actor_username
+            notif_data["actor_id"] = entry.actor_id
+        if entry.actor_usernames is not None:
+            notif_data["actor_usernames"] = entry.actor_usernames
+            notif_data["count"] = entry.actor_count
         result.append(notif_data)
     
-    return result
+    return json_response(result)
 
 @router.get("/unread-count")
 def get_unread_count(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get count of unread notifications"""
     # Get current user
@@ -194,16 +244,20 @@ def mark_as_read(
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    notif = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == user.id
-    ).first()
+    user_id = user.id
     
-    if not notif:
-        raise HTTPException(status_code=404, detail="Notification not found")
+    def _mark_as_read(session: Session):
+        notif = session.query(Notification).filter(
+            Notification.id == notification_id,
+            Notification.user_id == user_id
+        ).first()
+        
+        if not notif:
+            raise HTTPException(status_code=404, detail="Notification not found")
+        
+        notif.is_read = True
     
-    notif.is_read = True
-    db.commit()
+    run_write(db, _mark_as_read)
     
     return {"message": "Marked as read"}
 
@@ -223,12 +277,21 @@ def mark_all_as_read(
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    db.query(Notification).filter(
-        Notification.user_id == user.id,
-        Notification.is_read == False
-    ).update({"is_read": True})
+    user_id = user.id
+    
+    def _mark_all_as_read(session: Session):
+        unread_ids = [notif_id for (notif_id,) in session.query(Notification.id).filter(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).all()]
+        
+        if unread_ids:
+            session.query(Notification).filter(
+                Notification.id.in_(unread_ids)
+            ).update({"is_read": True}, synchronize_session=False)
+            record_changes(session, [(user_id, "notification", notif_id, UPSERT) for notif_id in unread_ids])
     
-    db.commit()
+    run_write(db, _mark_all_as_read)
     
     return {"message": "All notifications marked as read"}
 
@@ -1,32 +1,64 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime, timezone
+import base64
+import json
 from app.schemas.progress_update import ProgressUpdateCreate, ProgressUpdateResponse
-from app.database import get_db
+from app.database import get_async_db, get_read_db
 from app.models.progress_update import ProgressUpdate
 from app.models.wish import Wish
 from app.models.attachment import Attachment
-from app.api.users import get_current_user_from_credentials
+from app.api.users import get_current_user_from_credentials_async
 from app.models.user import User
-import os
-import uuid
-import mimetypes
-from pathlib import Path
+from app.core.serializers import json_response, encode_progress_update, encode_many
+from app.services.uploads import save_uploads
+from app.services.blobs import register_blobs
+from app.services.derivatives import schedule_derivatives
+from app.services.progress_series import LTTB, BUCKET_MAX, get_progress_series
 
 router = APIRouter()
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
-def ensure_utc(dt):
-    """Ensure datetime is timezone-aware UTC"""
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt
+def apply_progress_value(db: Session, wish: Wish, progress_value: int, current_user: User, commit: bool = True):
+    """Set a wish's progress and complete it (or ask verifiers to check it) once it reaches 100%"""
+    from app.models.wish import CompletionStatus
+    from app.models.completion_verification import CompletionVerification
+    from app.api.notifications import notify_users
+    
+    old_progress = wish.progress
+    wish.progress = progress_value
+    if progress_value >= 100 and old_progress < 100:
+        if wish.requires_verification:
+            # If verification is required, set status to pending verification
+            wish.completion_status = CompletionStatus.PENDING_VERIFICATION
+            # Don't mark as completed yet - wait for verification
+            print(f"[progress_updates] Wish {wish.id} reached 100% - pending verification")
+            
+            # Notify all verifiers, in one batch
+            verifier_ids = [row.verifier_user_id for row in db.query(CompletionVerification.verifier_user_id).filter(
+                CompletionVerification.wish_id == wish.id
+            )]
+            
+            try:
+                notify_users(
+                    db=db,
+                    user_ids=verifier_ids,
+                    actor_id=wish.user_id,
+                    notification_type="verification_ready",
+                    wish_id=wish.id,
+                    content=f"{current_user.username} has completed their goal '{wish.title}' and needs your verification!",
+                    commit=commit
+                )
+            except Exception as e:
+                print(f"[progress_updates] Failed to notify verifiers {verifier_ids}: {e}")
+        else:
+            # No verification required - mark as completed
+            wish.is_completed = True
+            wish.status = "completed"
+            wish.completion_status = CompletionStatus.SELF_VERIFIED
+            print(f"[progress_updates] Wish {wish.id} reached 100% - auto-completed (no verification required)")
 
 @router.post("/wishes/{wish_id}/progress", status_code=status.HTTP_201_CREATED)
 async def create_progress_update(
@@ -34,12 +66,12 @@ async def create_progress_update(
     content: str = Form(""),
     progress_value: Optional[int] = Form(None),
     files: List[UploadFile] = File([]),
-    current_user: User = Depends(get_current_user_from_credentials),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_from_credentials_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new progress update for a wish with optional file attachments"""
     # Verify wish exists and belongs to user
-    wish = db.query(Wish).filter(Wish.id == wish_id, Wish.user_id == current_user.id).first()
+    wish = (await db.scalars(select(Wish).where(Wish.id == wish_id, Wish.user_id == current_user.id))).first()
     if not wish:
         raise HTTPException(status_code=404, detail="Wish not found or doesn't belong to you")
     
@@ -62,140 +94,121 @@ async def create_progress_update(
         else:
             raise HTTPException(status_code=400, detail="Content, progress value, or files must be provided")
     
-    # Create progress update
-    progress_update = ProgressUpdate(
-        wish_id=wish_id,
-        user_id=current_user.id,
-        content=content,
-        progress_value=progress_value
-    )
-    
-    db.add(progress_update)
-    db.flush()  # Get the ID for attachments
+    # Stream attachments to disk concurrently (size limits enforced while streaming)
+    stored = await save_uploads([file for file in files if file and file.filename])
     
-    # Handle file uploads
-    for file in files:
-        if file and file.filename:
-            # Generate unique filename
-            file_extension = os.path.splitext(file.filename)[1]
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = UPLOAD_DIR / unique_filename
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                content_bytes = await file.read()
-                buffer.write(content_bytes)
-            
-            # Guess MIME type
-            mime_type = mimetypes.guess_type(file.filename)[0] or "application/octet-stream"
-            
-            # Create attachment record
+    def _add_progress_update(session: Session) -> ProgressUpdate:
+        register_blobs(session, stored)
+        
+        # Create progress update
+        progress_update = ProgressUpdate(
+            wish_id=wish_id,
+            user_id=current_user.id,
+            content=content,
+            progress_value=progress_value
+        )
+        session.add(progress_update)
+        session.flush()  # Get the ID for attachments
+        
+        # Handle file uploads
+        for upload in stored:
             attachment = Attachment(
-                file_name=file.filename,
-                file_path=f"/uploads/{unique_filename}",
-                file_type=mime_type,
-                file_size=len(content_bytes),
+                file_name=upload.original_name,
+                file_path=upload.url,
+                file_type=upload.content_type,
+                file_size=upload.size,
+                blob_sha256=upload.sha256,
                 progress_update_id=progress_update.id
             )
-            db.add(attachment)
-    
-    # Update wish progress if provided
-    if progress_value is not None:
-        from app.models.wish import CompletionStatus
-        from app.models.completion_verification import CompletionVerification
-        from app.api.notifications import create_notification
+            session.add(attachment)
         
-        old_progress = wish.progress
-        wish.progress = progress_value
-        if progress_value >= 100 and old_progress < 100:
-            if wish.requires_verification:
-                # If verification is required, set status to pending verification
-                wish.completion_status = CompletionStatus.PENDING_VERIFICATION
-                # Don't mark as completed yet - wait for verification
-                print(f"[progress_updates] Wish {wish.id} reached 100% - pending verification")
-                
-                # Notify all verifiers
-                verifications = db.query(CompletionVerification).filter(
-                    CompletionVerification.wish_id == wish.id
-                ).all()
-                
-                for verification in verifications:
-                    try:
-                        create_notification(
-                            db=db,
-                            user_id=verification.verifier_user_id,
-                            actor_id=wish.user_id,
-                            notification_type="verification_ready",
-                            wish_id=wish.id,
-                            content=f"{current_user.username} has completed their goal '{wish.title}' and needs your verification!"
-                        )
-                    except Exception as e:
-                        print(f"[progress_updates] Failed to notify verifier {verification.verifier_user_id}: {e}")
-            else:
-                # No verification required - mark as completed
-                wish.is_completed = True
-                wish.status = "completed"
-                wish.completion_status = CompletionStatus.SELF_VERIFIED
-                print(f"[progress_updates] Wish {wish.id} reached 100% - auto-completed (no verification required)")
+        # Update wish progress if provided
+        if progress_value is not None:
+            apply_progress_value(session, wish, progress_value, current_user, commit=False)
+        return progress_update
     
-    db.commit()
-    db.refresh(progress_update)
+    progress_update = await db.run_sync(_add_progress_update)
+    await db.commit()
+    await db.refresh(progress_update, attribute_names=["attachments"])
+    
+    # Thumbnails, dimensions and placeholders are rendered in the background
+    schedule_derivatives(stored)
     
     # Return response with attachments
-    return {
-        "id": progress_update.id,
-        "wish_id": progress_update.wish_id,
-        "user_id": progress_update.user_id,
-        "content": progress_update.content,
-        "progress_value": progress_update.progress_value,
-        "created_at": ensure_utc(progress_update.created_at).isoformat(),
-        "attachments": [
-            {
-                "id": att.id,
-                "file_name": att.file_name,
-                "file_path": att.file_path,
-                "file_type": att.file_type,
-                "file_size": att.file_size
-            }
-            for att in progress_update.attachments
-        ]
-    }
+    return json_response(encode_progress_update(progress_update), status_code=status.HTTP_201_CREATED)
+
+def encode_cursor(created_at: datetime, update_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at.isoformat(), update_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, update_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(update_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
 @router.get("/wishes/{wish_id}/progress")
 def get_progress_updates(
     wish_id: int,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    before: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all progress updates for a wish"""
+    """Get a wish's progress updates, newest first.
+
+    With `limit`, one page is returned and the cursor for the next (older) page
+    is sent in the X-Next-Cursor header; pass it back as `before`. Without it
+    the whole timeline is returned, as older clients expect.
+    """
     # Verify wish exists
     wish = db.query(Wish).filter(Wish.id == wish_id).first()
     if not wish:
         raise HTTPException(status_code=404, detail="Wish not found")
     
-    updates = db.query(ProgressUpdate).filter(
+    # Walks ix_progress_updates_wish_id_created_at backwards; attachments (and their
+    # blobs) for the whole page come in one extra query
+    query = db.query(ProgressUpdate).options(
+        selectinload(ProgressUpdate.attachments)
+    ).filter(
         ProgressUpdate.wish_id == wish_id
-    ).order_by(ProgressUpdate.created_at.desc()).all()
+    )
+    if before:
+        query = query.filter(tuple_(ProgressUpdate.created_at, ProgressUpdate.id) < decode_cursor(before))
+    query = query.order_by(ProgressUpdate.created_at.desc(), ProgressUpdate.id.desc())
+    
+    headers = {}
+    if limit is None:
+        updates = query.all()
+    else:
+        updates = query.limit(limit + 1).all()
+        if len(updates) > limit:
+            updates = updates[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(updates[-1].created_at, updates[-1].id)
     
-    return [
-        {
-            "id": update.id,
-            "wish_id": update.wish_id,
-            "user_id": update.user_id,
-            "content": update.content,
-            "progress_value": update.progress_value,
-            "created_at": ensure_utc(update.created_at).isoformat(),
-            "image_url": update.image_url,  # Keep for backwards compatibility
-            "attachments": [
-                {
-                    "id": att.id,
-                    "file_name": att.file_name,
-                    "file_path": att.file_path,
-                    "file_type": att.file_type,
-                    "file_size": att.file_size
-                }
-                for att in update.attachments
-            ]
-        }
-        for update in updates
-    ]
+    return json_response(encode_many(encode_progress_update, updates), headers=headers)
 
+
+@router.get("/wishes/{wish_id}/progress/series")
+def get_progress_history(
+    wish_id: int,
+    points: int = Query(100, ge=3, le=1000),
+    method: str = Query(LTTB, pattern=f"^({LTTB}|{BUCKET_MAX})$"),
+    db: Session = Depends(get_read_db)
+):
+    """A wish's progress over time for charts, downsampled to at most `points` points.
+
+    `method` is "lttb" (Largest-Triangle-Three-Buckets, keeps the shape) or
+    "max" (highest value per bucket).
+    """
+    wish = db.query(Wish.id).filter(Wish.id == wish_id).first()
+    if not wish:
+        raise HTTPException(status_code=404, detail="Wish not found")
+    
+    series = get_progress_series(db, wish_id, points, method)
+    return json_response({
+        "wish_id": wish_id,
+        "method": method,
+        "series": [{"created_at": created_at, "progress_value": value} for created_at, value in series],
+    })
@@ -0,0 +1,133 @@
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import select, and_, or_, func, literal_column
+from typing import Optional
+import base64
+import html
+import json
+import re
+from app.database import get_read_db
+from app.models.search_index import search_index, ROWID_STRIDE
+from app.models.wish import Wish
+from app.api.users import get_current_user_from_token
+from app.api.wishes import get_visibility_filter
+
+router = APIRouter()
+
+# FTS5 marks matches with control characters, which text typed by users does not contain;
+# the snippet is HTML-escaped and only then are they turned into <mark> tags
+SNIPPET_OPEN = "\x02"
+SNIPPET_CLOSE = "\x03"
+SNIPPET_TOKENS = 12
+
+# FTS5 auxiliary functions take the table itself as first argument
+_fts_table = literal_column("search_index")
+# Column weights in declaration order: kind, wish_id (unindexed), title, body
+_rank = func.bm25(_fts_table, 0.0, 0.0, 10.0, 1.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix"""
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"  # Search-as-you-type
+    return " ".join(terms)
+
+
+def highlight_snippet(snippet: Optional[str]) -> Optional[str]:
+    """The snippet as HTML: user text escaped, matches wrapped in <mark>"""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(SNIPPET_OPEN, "<mark>").replace(SNIPPET_CLOSE, "</mark>")
+
+
+def encode_cursor(rank: float, rowid: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, rowid]).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        rank, rowid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(rowid)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("")
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """Full-text search over wishes, progress updates and comments the viewer is allowed to see"""
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Search requires the SQLite FTS5 index")
+
+    # Get current user if authenticated
+    current_user_id = None
+    if authorization and authorization.startswith("Bearer "):
+        token = authorization.replace("Bearer ", "")
+        try:
+            user = get_current_user_from_token(token, db)
+            current_user_id = user.id
+        except:
+            pass
+
+    match_query = build_match_query(q)
+    if match_query is None:
+        return {"results": [], "next_cursor": None}
+
+    visibility_filter, _ = get_visibility_filter(db, current_user_id, include_own_private=True)
+
+    rank = _rank.label("rank")
+    stmt = select(
+        search_index.c.rowid,
+        search_index.c.kind,
+        search_index.c.wish_id,
+        rank,
+        func.snippet(_fts_table, -1, SNIPPET_OPEN, SNIPPET_CLOSE, "…", SNIPPET_TOKENS).label("snippet"),
+        Wish.title.label("wish_title"),
+        Wish.user_id.label("wish_user_id"),
+    ).select_from(
+        search_index.join(Wish, Wish.id == search_index.c.wish_id)
+    ).where(
+        _fts_table.op("MATCH")(match_query),
+        visibility_filter
+    )
+
+    if cursor:
+        after_rank, after_rowid = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            _rank > after_rank,
+            and_(_rank == after_rank, search_index.c.rowid > after_rowid)
+        ))
+
+    # bm25 is lower-is-better; rowid breaks ties so pages never overlap
+    rows = db.execute(stmt.order_by(_rank, search_index.c.rowid).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].rowid)
+
+    return {
+        "results": [
+            {
+                "type": row.kind,
+                "id": row.rowid // ROWID_STRIDE,
+                "wish_id": row.wish_id,
+                "wish_title": row.wish_title,
+                "user_id": row.wish_user_id,
+                "snippet": highlight_snippet(row.snippet),
+                "score": -row.rank,
+            }
+            for row in rows
+        ],
+        "next_cursor": next_cursor
+    }
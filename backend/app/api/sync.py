@@ -0,0 +1,290 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict
+import json
+from app.database import get_db, get_read_db
+from app.models.milestone import Milestone
+from app.models.notification import Notification
+from app.models.progress_update import ProgressUpdate
+from app.models.sync_change import SyncChange
+from app.models.sync_idempotency_key import SyncIdempotencyKey
+from app.models.user import User
+from app.models.wish import Wish
+from app.schemas.sync import SyncBatchRequest, SyncOperation
+from app.api.users import get_current_user_from_credentials
+from app.api.wishes import auto_update_wish_status
+from app.api.progress_updates import apply_progress_value
+from app.api.tags import get_or_create_tag
+from app.services.change_tracking import DELETE
+from app.core.serializers import (
+    json_response, encode_wish, encode_milestone, encode_progress_update, encode_notification
+)
+
+router = APIRouter()
+
+# entity_type -> (response key, model, loader options, serializer)
+SYNC_ENTITIES = {
+    "wish": ("wishes", Wish, (), encode_wish),
+    "milestone": ("milestones", Milestone, (), lambda m: {**encode_milestone(m), "wish_id": m.wish_id}),
+    "progress_update": ("progress_updates", ProgressUpdate, (selectinload(ProgressUpdate.attachments),), encode_progress_update),
+    "notification": ("notifications", Notification, (), encode_notification),
+}
+
+@router.get("/changes")
+def get_changes(
+    since: int = Query(0, ge=0),  # next_token from the previous sync, 0 for a full sync
+    limit: int = Query(500, ge=1, le=2000),
+    current_user: User = Depends(get_current_user_from_credentials),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get everything that changed for the current user since the given sync token.
+    Deleted entities are returned as tombstones (ids only).
+    A lagging read replica only returns fewer changes: the token is the last change read.
+    """
+    changes = db.query(SyncChange).filter(
+        SyncChange.user_id == current_user.id,
+        SyncChange.id > since
+    ).order_by(SyncChange.id).limit(limit + 1).all()
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    # Only the latest operation per entity matters
+    latest = {}
+    for change in changes:
+        latest[(change.entity_type, change.entity_id)] = change.operation
+
+    upserts = {key: [] for key, _, _, _ in SYNC_ENTITIES.values()}
+    deleted = {key: [] for key, _, _, _ in SYNC_ENTITIES.values()}
+
+    for entity_type, (key, model, options, serialize) in SYNC_ENTITIES.items():
+        ids = [entity_id for (etype, entity_id), op in latest.items() if etype == entity_type]
+        if not ids:
+            continue
+
+        upsert_ids = [entity_id for entity_id in ids if latest[(entity_type, entity_id)] != DELETE]
+        found = set()
+        if upsert_ids:
+            for obj in db.query(model).options(*options).filter(model.id.in_(upsert_ids)).all():
+                upserts[key].append(serialize(obj))
+                found.add(obj.id)
+
+        # Deleted, or upserted and then deleted before this page was read
+        deleted[key] = sorted(entity_id for entity_id in ids if entity_id not in found)
+
+    return json_response({
+        "changes": upserts,
+        "deleted": deleted,
+        "next_token": changes[-1].id if changes else since,
+        "has_more": has_more
+    })
+
+
+class _BatchContext:
+    """Wishes touched by a batch, so later operations can refer to them"""
+
+    def __init__(self, db: Session, user: User, wishes: Dict[int, Wish]):
+        self.db = db
+        self.user = user
+        self.wishes = wishes  # server id -> owned Wish
+        self.created = {}  # client_id -> Wish created in this batch
+
+    def resolve_wish(self, op: SyncOperation) -> Wish:
+        if op.wish_client_id is not None:
+            wish = self.created.get(op.wish_client_id)
+        elif op.wish_id is not None:
+            wish = self.wishes.get(op.wish_id)
+            if wish is None:
+                wish = self.db.query(Wish).filter(Wish.id == op.wish_id, Wish.user_id == self.user.id).first()
+                if wish is not None:
+                    self.wishes[wish.id] = wish
+        else:
+            raise HTTPException(status_code=400, detail="wish_id or wish_client_id is required")
+        
+        if wish is None:
+            raise HTTPException(status_code=404, detail="Wish not found or doesn't belong to you")
+        return wish
+
+
+def _apply_create_wish(ctx: _BatchContext, op: SyncOperation):
+    data = op.wish
+    if data is None:
+        raise HTTPException(status_code=400, detail="create_wish requires 'wish'")
+    if op.client_id is not None and op.client_id in ctx.created:
+        raise HTTPException(status_code=400, detail=f"Duplicate client_id '{op.client_id}' in batch")
+    
+    wish = Wish(
+        title=data.title,
+        description=data.description or "",
+        target_date=data.target_date,
+        consequence=data.consequence,
+        cover_image=data.cover_image,
+        visibility=data.visibility.value if data.visibility else "public",
+        user_id=ctx.user.id,
+        status="current",
+        progress_mode=data.progress_mode
+    )
+    ctx.db.add(wish)
+    
+    for tag_name in data.tags:
+        tag = get_or_create_tag(ctx.db, tag_name)
+        if tag:
+            wish.tags.append(tag)
+            tag.usage_count += 1
+    
+    if data.progress_mode == "milestone":
+        for idx, milestone in enumerate(data.milestones):
+            wish.milestones.append(Milestone(
+                title=milestone.title,
+                description=milestone.description,
+                order_index=idx,
+                points=milestone.points,
+                target_date=milestone.target_date
+            ))
+    
+    if op.client_id is not None:
+        ctx.created[op.client_id] = wish
+    return wish
+
+
+def _apply_update_wish(ctx: _BatchContext, op: SyncOperation):
+    if op.update is None:
+        raise HTTPException(status_code=400, detail="update_wish requires 'update'")
+    wish = ctx.resolve_wish(op)
+    
+    update_data = op.update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(wish, field, value)
+    if "progress" in update_data:
+        auto_update_wish_status(wish)
+    return wish
+
+
+def _apply_progress(ctx: _BatchContext, op: SyncOperation):
+    data = op.progress
+    if data is None:
+        raise HTTPException(status_code=400, detail="progress requires 'progress'")
+    wish = ctx.resolve_wish(op)
+    
+    progress_value = data.progress_value
+    if progress_value is not None and progress_value < (wish.progress or 0):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot decrease progress below current value of {wish.progress}%"
+        )
+    
+    content = data.content
+    if not content.strip():
+        if progress_value is None:
+            raise HTTPException(status_code=400, detail="Content or progress value must be provided")
+        content = "Goal completed! 🎉" if progress_value >= 100 else f"Progress updated to {progress_value}%"
+    
+    progress_update = ProgressUpdate(wish=wish, user_id=ctx.user.id, content=content, progress_value=progress_value)
+    ctx.db.add(progress_update)
+    
+    if progress_value is not None:
+        apply_progress_value(ctx.db, wish, progress_value, ctx.user, commit=False)
+    return progress_update
+
+
+BATCH_HANDLERS = {
+    "create_wish": _apply_create_wish,
+    "update_wish": _apply_update_wish,
+    "progress": _apply_progress,
+}
+
+@router.post("/batch")
+def apply_batch(
+    batch: SyncBatchRequest,
+    current_user: User = Depends(get_current_user_from_credentials),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply queued offline operations in order, in a single transaction.
+    Operations whose idempotency key was already applied return their original result.
+    """
+    try:
+        return _apply_batch(db, current_user, batch.operations)
+    except IntegrityError:
+        # A concurrent submission of the same keys committed first: run again to replay its results
+        db.rollback()
+        return _apply_batch(db, current_user, batch.operations)
+
+
+def _apply_batch(db: Session, current_user: User, operations):
+    if db.get_bind().dialect.name == "sqlite":
+        # Take the write lock before reading the applied keys, so concurrent retries of a batch
+        # run one after the other; it also keeps the per-operation SAVEPOINTs inside this transaction
+        db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+    
+    # Already applied operations, one query for the whole batch
+    keys = {op.idempotency_key for op in operations}
+    applied = {
+        row.key: json.loads(row.result)
+        for row in db.query(SyncIdempotencyKey).filter(
+            SyncIdempotencyKey.user_id == current_user.id,
+            SyncIdempotencyKey.key.in_(keys)
+        ).all()
+    }
+    
+    # Wishes referenced by server id, one query for the whole batch
+    wish_ids = {op.wish_id for op in operations if op.wish_id is not None and op.idempotency_key not in applied}
+    wishes = {}
+    if wish_ids:
+        wishes = {w.id: w for w in db.query(Wish).filter(Wish.id.in_(wish_ids), Wish.user_id == current_user.id).all()}
+    ctx = _BatchContext(db, current_user, wishes)
+    
+    results = []
+    in_batch = {}  # idempotency_key -> result of its first occurrence in this batch
+    created = []  # (result, entity) pairs whose ids are known after the flush
+    for op in operations:
+        if op.idempotency_key in applied:
+            result = applied[op.idempotency_key]
+            results.append({**result, "replayed": True})
+            # Later operations may still refer to a replayed wish by its client_id
+            if op.op == "create_wish" and op.client_id is not None and result.get("wish_id"):
+                wish = db.query(Wish).filter(Wish.id == result["wish_id"], Wish.user_id == current_user.id).first()
+                if wish is not None:
+                    ctx.created[op.client_id] = wish
+            continue
+        if op.idempotency_key in in_batch:
+            results.append(in_batch[op.idempotency_key])
+            continue
+        
+        result = {"idempotency_key": op.idempotency_key, "op": op.op}
+        try:
+            # A failing operation rolls back only its own changes
+            with db.begin_nested():
+                entity = BATCH_HANDLERS[op.op](ctx, op)
+        except HTTPException as e:
+            result.update({"status": "error", "status_code": e.status_code, "detail": e.detail})
+        else:
+            result["status"] = "ok"
+            if op.client_id is not None:
+                result["client_id"] = op.client_id
+            created.append((result, entity))
+        in_batch[op.idempotency_key] = result
+        results.append(result)
+    
+    # One flush inserts everything the batch created
+    db.flush()
+    for result, entity in created:
+        if isinstance(entity, ProgressUpdate):
+            result["progress_update_id"] = entity.id
+            result["wish_id"] = entity.wish_id
+        else:
+            result["wish_id"] = entity.id
+    
+    # Remember successful operations so retries are no-ops
+    key_rows = [
+        {"user_id": current_user.id, "key": result["idempotency_key"], "result": json.dumps(result)}
+        for result, _ in created
+    ]
+    if key_rows:
+        db.execute(SyncIdempotencyKey.__table__.insert(), key_rows)
+    
+    db.commit()
+    
+    return {"results": results}
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, status, Depends, Header
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_read_db
 from app.models.tag import Tag
 from app.schemas.tag import TagResponse, PopularTagResponse
 from app.api.users import get_current_user_from_token
@@ -12,7 +12,7 @@ router = APIRouter()
 @router.get("/popular", response_model=List[PopularTagResponse])
 def get_popular_tags(
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get popular tags sorted by usage count"""
     tags = db.query(Tag).order_by(Tag.usage_count.desc()).limit(limit).all()
@@ -22,7 +22,7 @@ def get_popular_tags(
 def search_tags(
     q: str,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search tags by name (autocomplete)"""
     if len(q) < 2:
@@ -38,14 +38,14 @@ def search_tags(
 def get_all_tags(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all tags"""
     tags = db.query(Tag).order_by(Tag.name).offset(skip).limit(limit).all()
     return tags
 
 @router.get("/{tag_id}", response_model=TagResponse)
-def get_tag(tag_id: int, db: Session = Depends(get_db)):
+def get_tag(tag_id: int, db: Session = Depends(get_read_db)):
     """Get a specific tag by ID"""
     tag = db.query(Tag).filter(Tag.id == tag_id).first()
     if not tag:
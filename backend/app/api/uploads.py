@@ -0,0 +1,96 @@
+"""
+Serving of uploaded files under /uploads.
+
+Stored files never change: blobs and their derivatives are named after the
+content hash, and legacy uploads have unique random names. Responses therefore
+carry a year-long immutable Cache-Control and a strong ETag, and revalidation
+(If-None-Match) is answered with 304 from a single stat() without opening the
+file. Range and If-Range requests are served by Starlette's FileResponse.
+
+With UPLOAD_SERVE_MODE set to "x-accel-redirect" (nginx) or "x-sendfile"
+(Apache, lighttpd) the response only names the file, and the fronting server
+sends it with sendfile(), so no file bytes pass through this process.
+"""
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path, PurePosixPath
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.services.uploads import BLOB_TMP_DIR, UPLOAD_DIR
+
+router = APIRouter()
+
+# <sha256>, or <sha256>_<derivative name>, before the extension
+_CONTENT_NAME_RE = re.compile(r"^([0-9a-f]{64}(?:_\w+)?)(?:\.|$)")
+_TMP_PARTS = BLOB_TMP_DIR.relative_to(UPLOAD_DIR).parts
+
+
+class UploadFileResponse(FileResponse):
+    # Fewer, larger reads than Starlette's 64 KiB default
+    chunk_size = settings.UPLOAD_CHUNK_SIZE
+
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        # FileResponse only knows its own ETag format; also accept the one we sent
+        return http_if_range == self.headers.get("etag") or super()._should_use_range(http_if_range, stat_result)
+
+
+def _resolve(path: str) -> Optional[Path]:
+    """The file a request path refers to, or None if it points outside the served files"""
+    relative = PurePosixPath(path)
+    if relative.is_absolute() or ".." in relative.parts or relative.parts[:len(_TMP_PARTS)] == _TMP_PARTS:
+        return None
+    return UPLOAD_DIR / relative
+
+
+def _etag(file_path: Path, stat_result: os.stat_result) -> str:
+    match = _CONTENT_NAME_RE.match(file_path.name)
+    if match:
+        return f'"{match.group(1)}"'  # Content hash: strong by construction
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+# A sync endpoint: the stat() runs in the threadpool instead of on the event loop
+@router.api_route("/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_upload(path: str, request: Request):
+    file_path = _resolve(path)
+    try:
+        stat_result = os.stat(file_path) if file_path is not None else None
+    except (FileNotFoundError, NotADirectoryError):
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    etag = _etag(file_path, stat_result)
+    headers = {
+        "Cache-Control": f"public, max-age={settings.UPLOAD_CACHE_MAX_AGE}, immutable",
+        "ETag": etag,
+        "X-Content-Type-Options": "nosniff",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+    if settings.UPLOAD_SERVE_MODE == "x-accel-redirect":
+        headers["X-Accel-Redirect"] = quote(settings.UPLOAD_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + path)
+        return Response(headers=headers, media_type=media_type)
+    if settings.UPLOAD_SERVE_MODE == "x-sendfile":
+        headers["X-Sendfile"] = str(file_path.resolve())
+        return Response(headers=headers, media_type=media_type)
+
+    return UploadFileResponse(file_path, headers=headers, media_type=media_type, stat_result=stat_result)
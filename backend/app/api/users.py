@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 from app.schemas.user import UserResponse
-from app.database import get_db
+from app.database import get_db, get_async_db, get_read_db
 from app.models.user import User
 from app.models.wish import Wish
 from app.core.config import settings
@@ -25,7 +26,7 @@ class UserUpdate(BaseModel):
     linkedin: Optional[str] = None
     github: Optional[str] = None
 
-def get_current_user_from_token(token: str, db: Session) -> User:
+def _email_from_token(token: str) -> str:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -33,7 +34,10 @@ def get_current_user_from_token(token: str, db: Session) -> User:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    
+    return email
+
+def get_current_user_from_token(token: str, db: Session) -> User:
+    email = _email_from_token(token)
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
@@ -45,10 +49,24 @@ def get_current_user_from_credentials(
 ) -> User:
     return get_current_user_from_token(credentials.credentials, db)
 
+async def get_current_user_from_token_async(token: str, db: AsyncSession) -> User:
+    email = _email_from_token(token)
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
+
+async def get_current_user_from_credentials_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user_from_credentials for `async def` endpoints using the AsyncSession"""
+    return await get_current_user_from_token_async(credentials.credentials, db)
+
 @router.get("/me")
 def get_current_user(
     current_user: User = Depends(get_current_user_from_credentials),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     # Calculate statistics
     all_wishes = db.query(Wish).filter(Wish.user_id == current_user.id).all()
@@ -138,7 +156,7 @@ def update_profile(
 @router.get("/search")
 def search_users(
     q: str = Query(..., min_length=1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_credentials)
 ):
     """Search for users by username or email"""
@@ -158,7 +176,7 @@ def search_users(
 @router.get("/{user_id}")
 def get_user_profile(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_credentials)
 ):
     """Get another user's public profile including their statistics and public goals"""
@@ -210,7 +228,7 @@ def get_user_profile(
 @router.get("/{user_id}/stats")
 def get_user_stats(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_credentials)
 ):
     """Get another user's statistics"""
@@ -239,7 +257,7 @@ def get_user_stats(
 @router.get("/{user_id}/wishes")
 def get_user_wishes(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user_from_credentials)
 ):
     """Get another user's public wishes"""
@@ -248,7 +266,7 @@ def get_user_wishes(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Get only current and completed wishes (not archived/missed) for display
-    wishes = db.query(Wish).filter(
+    wishes = db.query(Wish).options(selectinload(Wish.tags)).filter(
         Wish.user_id == user.id,
         Wish.status.in_(["current", "completed"])
     ).all()
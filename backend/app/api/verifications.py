@@ -1,25 +1,20 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Header
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timezone
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.completion_verification import CompletionVerification, VerificationStatus
 from app.models.wish import Wish, CompletionStatus
 from app.models.user import User
 from app.api.users import get_current_user_from_token
-from app.api.notifications import create_notification
+from app.api.notifications import create_notification, notify_users
+from app.services.verifications import add_verifiers, record_vote, reset_disputed
+from app.core.serializers import json_response, encode_verification, encode_inbox_entry, encode_many
+from app.read_models import list_verifier_inbox, load_verifications
 
 router = APIRouter()
 
-def ensure_utc(dt):
-    """Ensure datetime is timezone-aware UTC"""
-    if dt is None:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt
-
 
 @router.post("/wishes/{wish_id}/request-verification")
 def request_completion_verification(
@@ -49,9 +44,7 @@ def request_completion_verification(
         raise HTTPException(status_code=403, detail="Only goal owner can request verification")
     
     # Check if verifiers already exist (can't change verifiers after creation)
-    existing_verifications = db.query(CompletionVerification).filter(
-        CompletionVerification.wish_id == wish_id
-    ).count()
+    existing_verifications = wish.verifications_pending + wish.verifications_approved + wish.verifications_disputed
     
     if existing_verifications > 0:
         raise HTTPException(
@@ -78,26 +71,8 @@ def request_completion_verification(
     if current_user.id in verifier_user_ids:
         raise HTTPException(status_code=400, detail="You cannot verify your own goal")
     
-    # Create verification records
-    verifications = []
-    for verifier_id in verifier_user_ids:
-        verification = CompletionVerification(
-            wish_id=wish_id,
-            verifier_user_id=verifier_id,
-            status=VerificationStatus.PENDING
-        )
-        db.add(verification)
-        verifications.append(verification)
-        
-        # Send notification to verifier
-        create_notification(
-            db=db,
-            user_id=verifier_id,
-            actor_id=current_user.id,
-            notification_type="verification_request",
-            wish_id=wish_id,
-            content=f"{current_user.username} has selected you to verify their goal: {wish.title}"
-        )
+    # Create verification records (one bulk insert) and notify the verifiers in one batch
+    add_verifiers(db, wish, verifiers, requested_by=current_user)
     
     # Update wish
     wish.requires_verification = True
@@ -107,13 +82,13 @@ def request_completion_verification(
     
     return {
         "message": "Verification requested",
-        "verifiers_count": len(verifications),
+        "verifiers_count": len(verifiers),
         "verifiers": [
             {
-                "id": v.verifier_user_id,
-                "username": db.query(User).filter(User.id == v.verifier_user_id).first().username
+                "id": verifier.id,
+                "username": verifier.username
             }
-            for v in verifications
+            for verifier in verifiers
         ]
     }
 
@@ -143,67 +118,50 @@ def verify_completion(
     if not wish:
         raise HTTPException(status_code=404, detail="Goal not found")
     
-    # Check if user is a designated verifier
-    verification = db.query(CompletionVerification).filter(
-        CompletionVerification.wish_id == wish_id,
-        CompletionVerification.verifier_user_id == current_user.id
-    ).first()
-    
-    if not verification:
-        raise HTTPException(
-            status_code=403,
-            detail="You are not a designated verifier for this goal"
-        )
-    
-    # Check if already verified
-    if verification.status != VerificationStatus.PENDING:
+    # Record the vote; the returned counters decide the consensus
+    counts = record_vote(db, wish, current_user.id, approved, comment=comment, dispute_reason=dispute_reason)
+    if counts is None:
+        verification = db.query(CompletionVerification.status).filter(
+            CompletionVerification.wish_id == wish_id,
+            CompletionVerification.verifier_user_id == current_user.id
+        ).first()
+        if not verification:
+            raise HTTPException(
+                status_code=403,
+                detail="You are not a designated verifier for this goal"
+            )
         raise HTTPException(
             status_code=400,
             detail=f"You have already {verification.status.value} this goal"
         )
     
-    # Update verification
-    verification.status = VerificationStatus.APPROVED if approved else VerificationStatus.DISPUTED
-    verification.comment = comment
-    verification.dispute_reason = dispute_reason if not approved else None
-    verification.verified_at = datetime.now(timezone.utc)
-    
     # Check if all verifiers have responded
-    all_verifications = db.query(CompletionVerification).filter(
-        CompletionVerification.wish_id == wish_id
-    ).all()
-    
-    all_responded = all(v.status != VerificationStatus.PENDING for v in all_verifications)
+    all_responded = counts.verifications_pending == 0
+    all_approved = all_responded and counts.verifications_disputed == 0
     
     if all_responded:
-        # Check for consensus
-        all_approved = all(v.status == VerificationStatus.APPROVED for v in all_verifications)
-        any_disputed = any(v.status == VerificationStatus.DISPUTED for v in all_verifications)
-        
         if all_approved:
             wish.completion_status = CompletionStatus.VERIFIED
             wish.status = "completed"
             wish.is_completed = True
-        elif any_disputed:
+        else:
             wish.completion_status = CompletionStatus.DISPUTED
         
         # Notify goal owner
-        owner = db.query(User).filter(User.id == wish.user_id).first()
-        if owner:
-            if all_approved:
-                notification_content = f"Your goal '{wish.title}' has been verified by all verifiers!"
-            else:
-                disputed_count = sum(1 for v in all_verifications if v.status == VerificationStatus.DISPUTED)
-                notification_content = f"Your goal '{wish.title}' has {disputed_count} dispute(s). You can respond to disputes."
-            
-            create_notification(
-                db=db,
-                user_id=wish.user_id,
-                actor_id=current_user.id,
-                notification_type="verification_complete",
-                wish_id=wish_id,
-                content=notification_content
-            )
+        if all_approved:
+            notification_content = f"Your goal '{wish.title}' has been verified by all verifiers!"
+        else:
+            notification_content = f"Your goal '{wish.title}' has {counts.verifications_disputed} dispute(s). You can respond to disputes."
+        
+        create_notification(
+            db=db,
+            user_id=wish.user_id,
+            actor_id=current_user.id,
+            notification_type="verification_complete",
+            wish_id=wish_id,
+            content=notification_content,
+            commit=False
+        )
     else:
         # Notify owner of partial verification
         create_notification(
@@ -212,18 +170,17 @@ def verify_completion(
             actor_id=current_user.id,
             notification_type="verification_response",
             wish_id=wish_id,
-            content=f"{current_user.username} has {'approved' if approved else 'disputed'} your goal completion"
+            content=f"{current_user.username} has {'approved' if approved else 'disputed'} your goal completion",
+            commit=False
         )
     
     db.commit()
-    db.refresh(wish)
-    db.refresh(verification)
     
     return {
         "message": "Verification recorded",
-        "status": verification.status.value,
+        "status": (VerificationStatus.APPROVED if approved else VerificationStatus.DISPUTED).value,
         "wish_completion_status": wish.completion_status.value,
-        "all_verified": all_responded and all_approved if all_responded else False
+        "all_verified": all_approved
     }
 
 
@@ -254,38 +211,33 @@ def respond_to_dispute(
         raise HTTPException(status_code=403, detail="Only goal owner can respond to disputes")
     
     # Check if there are any disputes
-    disputed = db.query(CompletionVerification).filter(
-        CompletionVerification.wish_id == wish_id,
-        CompletionVerification.status == VerificationStatus.DISPUTED
-    ).count()
-    
-    if disputed == 0:
+    if wish.verifications_disputed == 0:
         raise HTTPException(status_code=400, detail="No disputes to respond to")
     
     # Save response
     wish.owner_dispute_response = response
     
     # Notify verifiers who disputed
-    disputed_verifications = db.query(CompletionVerification).filter(
+    disputed_verifier_ids = [row.verifier_user_id for row in db.query(CompletionVerification.verifier_user_id).filter(
         CompletionVerification.wish_id == wish_id,
         CompletionVerification.status == VerificationStatus.DISPUTED
-    ).all()
-    
-    for verification in disputed_verifications:
-        create_notification(
-            db=db,
-            user_id=verification.verifier_user_id,
-            actor_id=current_user.id,
-            notification_type="dispute_response",
-            wish_id=wish_id,
-            content=f"{current_user.username} has responded to your dispute on '{wish.title}'"
-        )
+    )]
+    
+    notify_users(
+        db=db,
+        user_ids=disputed_verifier_ids,
+        actor_id=current_user.id,
+        notification_type="dispute_response",
+        wish_id=wish_id,
+        content=f"{current_user.username} has responded to your dispute on '{wish.title}'",
+        commit=False
+    )
     
     db.commit()
     
     return {
         "message": "Response sent to verifiers",
-        "disputed_count": len(disputed_verifications)
+        "disputed_count": len(disputed_verifier_ids)
     }
 
 
@@ -315,29 +267,22 @@ def re_request_verification(
     if wish.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Only goal owner can re-request verification")
     
-    # Check if there are any disputed verifications
-    disputed_verifications = db.query(CompletionVerification).filter(
-        CompletionVerification.wish_id == wish_id,
-        CompletionVerification.status == VerificationStatus.DISPUTED
-    ).all()
+    # Reset disputed verifications to pending
+    reset_verifier_ids = reset_disputed(db, wish)
     
-    if not disputed_verifications:
+    if not reset_verifier_ids:
         raise HTTPException(status_code=400, detail="No disputed verifications to reset")
     
-    # Reset disputed verifications to pending
-    for verification in disputed_verifications:
-        verification.status = VerificationStatus.PENDING
-        verification.verified_at = None
-        
-        # Notify verifier that owner has addressed concerns
-        create_notification(
-            db=db,
-            user_id=verification.verifier_user_id,
-            actor_id=current_user.id,
-            notification_type="verification_ready",
-            wish_id=wish_id,
-            content=f"{current_user.username} has addressed your concerns. Please review '{wish.title}' again."
-        )
+    # Notify verifiers that owner has addressed concerns
+    notify_users(
+        db=db,
+        user_ids=reset_verifier_ids,
+        actor_id=current_user.id,
+        notification_type="verification_ready",
+        wish_id=wish_id,
+        content=f"{current_user.username} has addressed your concerns. Please review '{wish.title}' again.",
+        commit=False
+    )
     
     # Update wish status back to pending verification
     wish.completion_status = CompletionStatus.PENDING_VERIFICATION
@@ -346,7 +291,7 @@ def re_request_verification(
     
     return {
         "message": "Verification re-requested successfully",
-        "reset_count": len(disputed_verifications)
+        "reset_count": len(reset_verifier_ids)
     }
 
 
@@ -405,11 +350,81 @@ def verifier_reply_to_owner(
     }
 
 
+def _verifications_payload(wish, verifications) -> dict:
+    """Verification records of one wish with status counts"""
+    counts = {status: 0 for status in VerificationStatus}
+    for v in verifications:
+        counts[v.status] += 1
+    
+    return {
+        "verifications": encode_many(encode_verification, verifications),
+        "summary": {
+            "total": len(verifications),
+            "approved": counts[VerificationStatus.APPROVED],
+            "disputed": counts[VerificationStatus.DISPUTED],
+            "pending": counts[VerificationStatus.PENDING]
+        },
+        "completion_status": wish.completion_status,
+        "owner_dispute_response": wish.owner_dispute_response
+    }
+
+
+@router.get("/inbox")
+def get_verifier_inbox(
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[int] = None,
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Goals the current user has been asked to verify and that are waiting for
+    their decision, newest request first. Pass `next_cursor` back as `before`
+    for the next page.
+    """
+    # Get current user
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    token = authorization.replace("Bearer ", "")
+    current_user = get_current_user_from_token(token, db)
+    
+    rows = list_verifier_inbox(db, current_user.id, limit + 1, before_id=before)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+    
+    return json_response({
+        "results": encode_many(encode_inbox_entry, rows),
+        "next_cursor": next_cursor
+    })
+
+
+@router.get("/wishes")
+def get_verifications_for_wishes(
+    wish_ids: List[int] = Query(..., max_length=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Verification records for several goals at once, keyed by wish id.
+    Unknown wish ids are left out.
+    """
+    wishes = db.query(Wish.id, Wish.completion_status, Wish.owner_dispute_response).filter(
+        Wish.id.in_(wish_ids)
+    ).all()
+    verifications_by_wish = load_verifications(db, [wish.id for wish in wishes])
+    
+    return json_response({
+        str(wish.id): _verifications_payload(wish, verifications_by_wish[wish.id])
+        for wish in wishes
+    })
+
+
 @router.get("/wishes/{wish_id}/verifications")
 def get_verifications(
     wish_id: int,
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all verification records for a goal.
@@ -419,41 +434,7 @@ def get_verifications(
     if not wish:
         raise HTTPException(status_code=404, detail="Goal not found")
     
-    # Get verifications
-    verifications = db.query(CompletionVerification).filter(
-        CompletionVerification.wish_id == wish_id
-    ).all()
-    
-    result = []
-    for v in verifications:
-        verifier = db.query(User).filter(User.id == v.verifier_user_id).first()
-        result.append({
-            "id": v.id,
-            "verifier": {
-                "id": verifier.id,
-                "username": verifier.username
-            },
-            "status": v.status.value,
-            "comment": v.comment,
-            "dispute_reason": v.dispute_reason,
-            "verifier_reply_to_owner": v.verifier_reply_to_owner,
-            "verified_at": ensure_utc(v.verified_at).isoformat() if v.verified_at else None,
-            "created_at": ensure_utc(v.created_at).isoformat()
-        })
-    
-    approved_count = sum(1 for v in verifications if v.status == VerificationStatus.APPROVED)
-    disputed_count = sum(1 for v in verifications if v.status == VerificationStatus.DISPUTED)
-    pending_count = sum(1 for v in verifications if v.status == VerificationStatus.PENDING)
+    # Verifications with their verifiers' usernames, in one query
+    verifications = load_verifications(db, [wish_id])[wish_id]
     
-    return {
-        "verifications": result,
-        "summary": {
-            "total": len(verifications),
-            "approved": approved_count,
-            "disputed": disputed_count,
-            "pending": pending_count
-        },
-        "completion_status": wish.completion_status.value,
-        "owner_dispute_response": wish.owner_dispute_response
-    }
-
+    return json_response(_verifications_payload(wish, verifications))
@@ -1,31 +1,31 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Header, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from fastapi import APIRouter, HTTPException, status, Depends, Header, UploadFile, File, Form, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, select
 from typing import List, Optional
 from datetime import datetime, timezone
 from app.schemas.wish import WishCreate, WishUpdate, WishResponse
-from app.database import get_db
-from app.models.wish import Wish
+from app.database import get_db, get_async_db, get_read_db
+from app.models.wish import Wish, WishStatus
+from app.models.milestone import Milestone
+from app.models.completion_verification import CompletionVerification
 from app.models.attachment import Attachment
-from app.models.tag import Tag
+from app.models.tag import Tag, wish_tags
 from app.models.user import User
-from app.models.like import Like
-from app.models.comment import Comment
-from app.models.view import View
-from app.api.users import get_current_user_from_token
+from app.api.users import get_current_user_from_token, get_current_user_from_token_async
 from app.api.tags import get_or_create_tag
-import shutil
-import mimetypes
-from pathlib import Path
-import uuid
-import os
+from app.core.serializers import (
+    json_response, encode_wish, encode_wish_card, encode_milestone, encode_verifier,
+    encode_tag, encode_attachment, encode_many
+)
+from app.read_models import list_feed, list_user_wishes, load_milestones_and_verifications
+from app.services.uploads import save_uploads
+from app.services.blobs import register_blobs
+from app.services.derivatives import schedule_derivatives
 import json
 
 router = APIRouter()
 
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 def ensure_utc(dt):
     """Ensure datetime is timezone-aware UTC"""
     if dt is None:
@@ -51,7 +51,7 @@ def auto_update_wish_status(wish: Wish):
             wish.is_completed = True
             wish.completion_status = CompletionStatus.SELF_VERIFIED
             print(f"[wishes] Wish {wish.id} reached 100% - auto-completed (no verification required)")
-    elif wish.target_date and wish.target_date < datetime.now(timezone.utc) and wish.progress < 100:
+    elif wish.target_date and ensure_utc(wish.target_date) < datetime.now(timezone.utc) and wish.progress < 100:
         wish.status = "missed"
     return wish
 
@@ -69,220 +69,148 @@ async def create_wish(
     cover_image: Optional[UploadFile] = File(None),
     files: List[UploadFile] = File([]),
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Try to get user from token, default to user_id=1 if offline/no token
     user_id = 1
     if authorization and authorization.startswith("Bearer "):
         token = authorization.replace("Bearer ", "")
         try:
-            user = get_current_user_from_token(token, db)
+            user = await get_current_user_from_token_async(token, db)
             user_id = user.id
         except:
             pass  # Use default user_id if token invalid
     
-    # Handle cover image upload
-    cover_image_url = None
-    if cover_image:
-        unique_filename = f"{uuid.uuid4()}_{cover_image.filename}"
-        file_path = UPLOAD_DIR / unique_filename
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(cover_image.file, buffer)
-        cover_image_url = f"/uploads/{unique_filename}"
-    
-    # Parse target_date
-    parsed_target_date = None
-    if target_date:
-        try:
-            parsed_target_date = datetime.fromisoformat(target_date.replace('Z', '+00:00'))
-        except:
-            pass
-    
-    db_wish = Wish(
-        title=title,
-        description=description or "",
-        target_date=parsed_target_date,
-        consequence=consequence,
-        cover_image=cover_image_url,
-        visibility=visibility,
-        user_id=user_id,
-        status="current",
-        progress_mode=progress_mode,
-        requires_verification=verifier_ids is not None and len(verifier_ids.strip()) > 2  # Check if verifiers provided
-    )
-    db.add(db_wish)
-    db.flush()  # Get the ID for attachments, tags, milestones, and verifiers
+    # Stream the cover image and attachments to disk concurrently (size limits enforced while streaming)
+    attachment_files = [file for file in files if file and file.filename]
+    uploads = await save_uploads(([cover_image] if cover_image else []) + attachment_files)
+    cover_upload = uploads[0] if cover_image else None
+    stored = uploads[1:] if cover_image else uploads
     
-    # Handle tags
-    if tags:
-        try:
-            tag_names = json.loads(tags)
-            for tag_name in tag_names:
-                tag = get_or_create_tag(db, tag_name)
-                if tag:
-                    db_wish.tags.append(tag)
-                    tag.usage_count += 1
-        except json.JSONDecodeError:
-            print(f"[create_wish] Failed to parse tags JSON: {tags}")
-    
-    # Handle milestones
-    print(f"[create_wish] DEBUG: progress_mode={progress_mode}, milestones={milestones}")
-    if milestones and progress_mode == "milestone":
-        try:
-            from app.models.milestone import Milestone
-            milestone_data = json.loads(milestones)
-            print(f"[create_wish] Parsed milestone data: {milestone_data}")
-            for idx, milestone_item in enumerate(milestone_data):
-                milestone = Milestone(
-                    wish_id=db_wish.id,
-                    title=milestone_item.get('title', ''),
-                    description=milestone_item.get('description', ''),
-                    order_index=idx,
-                    points=int(milestone_item.get('points', 1))  # Default to 1 point if not specified
-                )
-                db.add(milestone)
-            print(f"[create_wish] Created {len(milestone_data)} milestones for wish {db_wish.id}")
-        except json.JSONDecodeError as e:
-            print(f"[create_wish] Failed to parse milestones JSON: {milestones}, error: {e}")
-    
-    # Handle file attachments
-    for file in files:
-        if file and file.filename:
-            # Generate unique filename
-            file_extension = os.path.splitext(file.filename)[1]
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = UPLOAD_DIR / unique_filename
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                content_bytes = await file.read()
-                buffer.write(content_bytes)
-            
-            # Guess MIME type
-            mime_type = mimetypes.guess_type(file.filename)[0] or "application/octet-stream"
-            
-            # Create attachment record
+    # Rows are written through the AsyncSession's sync session, with the same helpers as the sync endpoints
+    def _insert_wish(session: Session) -> Wish:
+        register_blobs(session, uploads)
+        
+        # Parse target_date
+        parsed_target_date = None
+        if target_date:
+            try:
+                parsed_target_date = ensure_utc(datetime.fromisoformat(target_date.replace('Z', '+00:00')))  # Naive input is UTC
+            except:
+                pass
+        
+        db_wish = Wish(
+            title=title,
+            description=description or "",
+            target_date=parsed_target_date,
+            consequence=consequence,
+            cover_image=cover_upload.url if cover_upload else None,
+            cover_blob_sha256=cover_upload.sha256 if cover_upload else None,
+            visibility=visibility,
+            user_id=user_id,
+            status="current",
+            progress_mode=progress_mode,
+            requires_verification=verifier_ids is not None and len(verifier_ids.strip()) > 2  # Check if verifiers provided
+        )
+        session.add(db_wish)
+        session.flush()  # Get the ID for attachments, tags, milestones, and verifiers
+        
+        # Handle tags
+        if tags:
+            try:
+                tag_names = json.loads(tags)
+                for tag_name in tag_names:
+                    tag = get_or_create_tag(session, tag_name)
+                    if tag:
+                        db_wish.tags.append(tag)
+                        tag.usage_count += 1
+            except json.JSONDecodeError:
+                print(f"[create_wish] Failed to parse tags JSON: {tags}")
+        
+        # Handle milestones
+        print(f"[create_wish] DEBUG: progress_mode={progress_mode}, milestones={milestones}")
+        if milestones and progress_mode == "milestone":
+            try:
+                milestone_data = json.loads(milestones)
+                print(f"[create_wish] Parsed milestone data: {milestone_data}")
+                for idx, milestone_item in enumerate(milestone_data):
+                    milestone = Milestone(
+                        wish_id=db_wish.id,
+                        title=milestone_item.get('title', ''),
+                        description=milestone_item.get('description', ''),
+                        order_index=idx,
+                        points=int(milestone_item.get('points', 1))  # Default to 1 point if not specified
+                    )
+                    session.add(milestone)
+                print(f"[create_wish] Created {len(milestone_data)} milestones for wish {db_wish.id}")
+            except json.JSONDecodeError as e:
+                print(f"[create_wish] Failed to parse milestones JSON: {milestones}, error: {e}")
+        
+        # Handle file attachments
+        for upload in stored:
             attachment = Attachment(
-                file_name=file.filename,
-                file_path=f"/uploads/{unique_filename}",
-                file_type=mime_type,
-                file_size=len(content_bytes),
+                file_name=upload.original_name,
+                file_path=upload.url,
+                file_type=upload.content_type,
+                file_size=upload.size,
+                blob_sha256=upload.sha256,
                 wish_id=db_wish.id
             )
-            db.add(attachment)
-    
-    # Handle verifiers
-    if verifier_ids:
-        try:
-            from app.models.completion_verification import CompletionVerification, VerificationStatus
-            from app.api.notifications import create_notification
-            verifier_id_list = json.loads(verifier_ids)
-            print(f"[create_wish] Parsed verifier IDs: {verifier_id_list}")
-            
-            # Remove duplicates and self
-            verifier_id_list = [vid for vid in set(verifier_id_list) if vid != user_id]
-            
-            if len(verifier_id_list) > 0:
-                # Create verification records
-                for verifier_id in verifier_id_list:
-                    # Check if verifier exists
-                    verifier = db.query(User).filter(User.id == verifier_id).first()
-                    if verifier:
-                        verification = CompletionVerification(
-                            wish_id=db_wish.id,
-                            verifier_user_id=verifier_id,
-                            status=VerificationStatus.PENDING
-                        )
-                        db.add(verification)
-                        
-                        # Send notification to verifier
-                        try:
-                            current_user = db.query(User).filter(User.id == user_id).first()
-                            create_notification(
-                                db=db,
-                                user_id=verifier_id,
-                                actor_id=user_id,
-                                notification_type="verification_request",
-                                wish_id=db_wish.id,
-                                content=f"{current_user.username if current_user else 'Someone'} has selected you to verify their goal: {db_wish.title}"
-                            )
-                        except Exception as e:
-                            print(f"[create_wish] Failed to create notification: {e}")
+            session.add(attachment)
+        
+        # Handle verifiers
+        if verifier_ids:
+            try:
+                from app.services.verifications import add_verifiers
+                verifier_id_list = json.loads(verifier_ids)
+                print(f"[create_wish] Parsed verifier IDs: {verifier_id_list}")
                 
-                print(f"[create_wish] Created {len(verifier_id_list)} verification records for wish {db_wish.id}")
-        except json.JSONDecodeError as e:
-            print(f"[create_wish] Failed to parse verifier_ids JSON: {verifier_ids}, error: {e}")
-    
-    db.commit()
-    db.refresh(db_wish)
+                # Remove duplicates and self
+                verifier_id_list = [vid for vid in set(verifier_id_list) if vid != user_id]
+                
+                if len(verifier_id_list) > 0:
+                    # Create verification records for the verifiers that exist (one bulk insert),
+                    # and notify them in one batch
+                    verifiers = session.query(User).filter(User.id.in_(verifier_id_list)).all()
+                    current_user = session.query(User).filter(User.id == user_id).first()
+                    add_verifiers(session, db_wish, verifiers, requested_by=current_user)
+                
+                    print(f"[create_wish] Created {len(verifiers)} verification records for wish {db_wish.id}")
+            except json.JSONDecodeError as e:
+                print(f"[create_wish] Failed to parse verifier_ids JSON: {verifier_ids}, error: {e}")
+        return db_wish
     
-    # Get milestones
-    from app.models.milestone import Milestone
-    milestones = db.query(Milestone).filter(Milestone.wish_id == db_wish.id).order_by(Milestone.order_index).all()
-    
-    # Get verifiers
-    from app.models.completion_verification import CompletionVerification
-    verifications = db.query(CompletionVerification).filter(CompletionVerification.wish_id == db_wish.id).all()
-    
-    # Return with attachments, tags, milestones, and verifications
-    return {
-        "id": db_wish.id,
-        "title": db_wish.title,
-        "description": db_wish.description,
-        "progress": db_wish.progress,
-        "is_completed": db_wish.is_completed,
-        "status": db_wish.status,
-        "created_at": db_wish.created_at.isoformat(),
-        "target_date": db_wish.target_date.isoformat() if db_wish.target_date else None,
-        "consequence": db_wish.consequence,
-        "cover_image": db_wish.cover_image,
-        "user_id": db_wish.user_id,
-        "progress_mode": db_wish.progress_mode,
-        "requires_verification": db_wish.requires_verification,
-        "completion_status": db_wish.completion_status.value if hasattr(db_wish.completion_status, 'value') else db_wish.completion_status,
-        "tags": [{"id": tag.id, "name": tag.name} for tag in db_wish.tags],
-        "milestones": [
-            {
-                "id": m.id,
-                "title": m.title,
-                "description": m.description,
-                "order_index": m.order_index,
-                "points": m.points,
-                "is_completed": m.is_completed,
-                "completed_at": m.completed_at.isoformat() if m.completed_at else None
-            }
-            for m in milestones
-        ],
-        "verifiers": [
-            {
-                "id": v.id,
-                "verifier_user_id": v.verifier_user_id,
-                "status": v.status.value if hasattr(v.status, 'value') else v.status,
-                "verified_at": v.verified_at.isoformat() if v.verified_at else None
-            }
-            for v in verifications
-        ],
-        "attachments": [
-            {
-                "id": att.id,
-                "file_name": att.file_name,
-                "file_path": att.file_path,
-                "file_type": att.file_type,
-                "file_size": att.file_size
-            }
-            for att in db_wish.attachments
-        ]
-    }
+    def _encode_created_wish(session: Session) -> dict:
+        session.refresh(db_wish)
+        
+        # Get milestones and verifiers
+        milestones_by_wish, verifications_by_wish = load_milestones_and_verifications(session, [db_wish.id])
+        
+        # Return with attachments, tags, milestones, and verifications
+        return {
+            **encode_wish(db_wish),
+            "tags": encode_many(encode_tag, db_wish.tags),
+            "milestones": encode_many(encode_milestone, milestones_by_wish[db_wish.id]),
+            "verifiers": encode_many(encode_verifier, verifications_by_wish[db_wish.id]),
+            "attachments": encode_many(encode_attachment, db_wish.attachments)
+        }
+    
+    db_wish = await db.run_sync(_insert_wish)
+    await db.commit()
+    
+    # Thumbnails, dimensions and placeholders are rendered in the background
+    schedule_derivatives(uploads)
+    
+    return json_response(await db.run_sync(_encode_created_wish), status_code=status.HTTP_201_CREATED)
 
 @router.get("")
 def get_wishes(
-    status_filter: Optional[str] = None,
+    status_filter: Optional[WishStatus] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),  # No limit returns every wish
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    from app.models.milestone import Milestone
-    from app.models.completion_verification import CompletionVerification
-    
     # Try to get user from token, default to user_id=1 if offline/no token
     user_id = 1
     if authorization and authorization.startswith("Bearer "):
@@ -293,74 +221,80 @@ def get_wishes(
         except:
             pass
     
-    query = db.query(Wish).filter(Wish.user_id == user_id)
-    
-    # Auto-update statuses before querying
-    all_wishes = query.all()
-    for wish in all_wishes:
-        auto_update_wish_status(wish)
-    db.commit()
-    
-    # Apply filter if provided
-    if status_filter:
-        query = query.filter(Wish.status == status_filter)
-        wishes = query.all()
-    else:
-        wishes = all_wishes
+    # Statuses are kept up to date on write and by the deadline sweeper,
+    # so listing is a pure read. Rows come from Core selects, no ORM hydration;
+    # the status filter is served by the (user_id, status) index.
+    wishes, milestones_by_wish, verifications_by_wish = list_user_wishes(
+        db, user_id, status=status_filter, skip=skip, limit=limit
+    )
     
     # Build response with milestones and verifiers
     result = []
     for wish in wishes:
-        milestones = db.query(Milestone).filter(Milestone.wish_id == wish.id).order_by(Milestone.order_index).all()
-        verifications = db.query(CompletionVerification).filter(CompletionVerification.wish_id == wish.id).all()
-        
-        result.append({
-            "id": wish.id,
-            "title": wish.title,
-            "description": wish.description,
-            "progress": wish.progress,
-            "is_completed": wish.is_completed,
-            "status": wish.status,
-            "created_at": ensure_utc(wish.created_at).isoformat(),
-            "target_date": ensure_utc(wish.target_date).isoformat() if wish.target_date else None,
-            "consequence": wish.consequence,
-            "cover_image": wish.cover_image,
-            "user_id": wish.user_id,
-            "progress_mode": wish.progress_mode,
-            "visibility": wish.visibility,
-            "requires_verification": wish.requires_verification,
-            "completion_status": wish.completion_status.value if hasattr(wish.completion_status, 'value') else wish.completion_status,
-            "milestones": [
-                {
-                    "id": m.id,
-                    "title": m.title,
-                    "description": m.description,
-                    "order_index": m.order_index,
-                    "points": m.points,
-                    "is_completed": m.is_completed,
-                    "completed_at": ensure_utc(m.completed_at).isoformat() if m.completed_at else None
-                }
-                for m in milestones
-            ],
-            "verifiers": [
-                {
-                    "id": v.id,
-                    "verifier_user_id": v.verifier_user_id,
-                    "status": v.status.value if hasattr(v.status, 'value') else v.status,
-                    "verified_at": ensure_utc(v.verified_at).isoformat() if v.verified_at else None
-                }
-                for v in verifications
-            ],
-        })
-    
-    return result
+        data = encode_wish(wish)
+        data["milestones"] = encode_many(encode_milestone, milestones_by_wish[wish.id])
+        data["verifiers"] = encode_many(encode_verifier, verifications_by_wish[wish.id])
+        result.append(data)
+    
+    return json_response(result)
+
+def get_visibility_filter(db: Session, current_user_id: Optional[int], include_own_private: bool = False):
+    """
+    Build the SQL condition for the wishes a viewer may see.
+    Returns (condition, following_ids) so callers can reuse the follow lookup.
+    """
+    from app.models.follow import Follow
+    
+    if not current_user_id:
+        # Not logged in - only show public posts
+        return Wish.visibility == "public", []
+    
+    # Get following relationships
+    following_ids = db.query(Follow.following_id).filter(
+        Follow.follower_id == current_user_id
+    ).all()
+    following_ids = [fid[0] for fid in following_ids]
+    
+    # Get followers (for friends check)
+    followers_ids = db.query(Follow.follower_id).filter(
+        Follow.following_id == current_user_id
+    ).all()
+    followers_ids = [fid[0] for fid in followers_ids]
+    
+    # Friends are mutual follows
+    friends_ids = list(set(following_ids) & set(followers_ids))
+    
+    # Build visibility filter
+    # Show: public posts, own posts (private ones only if asked), posts from followed users if visibility allows
+    visibility_conditions = [
+        Wish.visibility == "public",  # Public posts
+    ]
+    if include_own_private:
+        visibility_conditions.append(Wish.user_id == current_user_id)
+    else:
+        # Own posts, but exclude private ones (e.g. from the feed)
+        visibility_conditions.append((Wish.user_id == current_user_id) & (Wish.visibility != "private"))
+    
+    # Posts visible to followers (if user is following the poster)
+    if following_ids:
+        visibility_conditions.append(
+            (Wish.visibility == "followers") & (Wish.user_id.in_(following_ids))
+        )
+    
+    # Posts visible to friends only (if mutual follow)
+    if friends_ids:
+        visibility_conditions.append(
+            (Wish.visibility == "friends") & (Wish.user_id.in_(friends_ids))
+        )
+    
+    return or_(*visibility_conditions), following_ids
 
 @router.get("/public/feed")
 def get_public_feed(
     filter_type: Optional[str] = None,
     tag: Optional[str] = None,  # Filter by tag name
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get public feed of wishes with engagement stats, sorted by engagement"""
     # Get current user if authenticated
@@ -373,192 +307,70 @@ def get_public_feed(
         except:
             pass
     
-    # Get wishes based on visibility and user relationship
-    from app.models.follow import Follow
-    
     # Start with wishes that are not archived or missed
-    query = db.query(Wish).filter(
-        Wish.status.in_(["current", "completed"])
-    )
+    conditions = [Wish.status.in_(["current", "completed"])]
     
-    if current_user_id:
-        # Get following relationships
-        following_ids = db.query(Follow.following_id).filter(
-            Follow.follower_id == current_user_id
-        ).all()
-        following_ids = [fid[0] for fid in following_ids]
-        
-        # Get followers (for friends check)
-        followers_ids = db.query(Follow.follower_id).filter(
-            Follow.following_id == current_user_id
-        ).all()
-        followers_ids = [fid[0] for fid in followers_ids]
-        
-        # Friends are mutual follows
-        friends_ids = list(set(following_ids) & set(followers_ids))
-        
-        # Build visibility filter
-        # Show: public posts, own NON-PRIVATE posts, posts from followed users if visibility allows
-        visibility_conditions = [
-            Wish.visibility == "public",  # Public posts
-            # Own posts, but exclude private ones from feed
-            (Wish.user_id == current_user_id) & (Wish.visibility != "private"),
-        ]
-        
-        # Posts visible to followers (if user is following the poster)
+    # Get wishes based on visibility and user relationship
+    visibility_filter, following_ids = get_visibility_filter(db, current_user_id)
+    conditions.append(visibility_filter)
+    
+    # Filter by following if specified
+    if current_user_id and filter_type == "Following":
         if following_ids:
-            visibility_conditions.append(
-                (Wish.visibility == "followers") & (Wish.user_id.in_(following_ids))
-            )
-        
-        # Posts visible to friends only (if mutual follow)
-        if friends_ids:
-            visibility_conditions.append(
-                (Wish.visibility == "friends") & (Wish.user_id.in_(friends_ids))
-            )
-        
-        query = query.filter(or_(*visibility_conditions))
-        
-        # Filter by following if specified
-        if filter_type == "Following":
-            if following_ids:
-                query = query.filter(Wish.user_id.in_(following_ids))
-            else:
-                return []
-    else:
-        # Not logged in - only show public posts
-        query = query.filter(Wish.visibility == "public")
+            conditions.append(Wish.user_id.in_(following_ids))
+        else:
+            return []
     
     # Filter by tag if specified
     if tag:
-        query = query.join(Wish.tags).filter(Tag.name == tag.lower())
-    
-    wishes = query.all()
+        conditions.append(Wish.id.in_(
+            select(wish_tags.c.wish_id).join(Tag, Tag.id == wish_tags.c.tag_id).where(Tag.name == tag.lower())
+        ))
+    
+    # Engagement stats and ordering are computed in SQL: "Recent" sorts by
+    # creation date, everything else by engagement score (highest first)
+    entries = list_feed(
+        db,
+        conditions,
+        current_user_id=current_user_id,
+        order="recent" if filter_type == "Recent" else "engagement"
+    )
     
-    # Build feed items with engagement stats
-    feed_items = []
-    for wish in wishes:
-        # Get engagement stats
-        likes_count = db.query(func.count(Like.id)).filter(Like.wish_id == wish.id).scalar() or 0
-        comments_count = db.query(func.count(Comment.id)).filter(Comment.wish_id == wish.id).scalar() or 0
-        views_count = db.query(func.count(View.id)).filter(View.wish_id == wish.id).scalar() or 0
-        
-        # Check if current user liked this
-        is_liked = False
-        if current_user_id:
-            is_liked = db.query(Like).filter(
-                Like.user_id == current_user_id,
-                Like.wish_id == wish.id
-            ).first() is not None
-        
-        # Get wish owner info
-        owner = db.query(User).filter(User.id == wish.user_id).first()
-        
-        # Calculate engagement score (formula: likes * 3 + comments * 5 + views * 0.1)
-        engagement_score = (likes_count * 3) + (comments_count * 5) + (views_count * 0.1)
-        
-        feed_items.append({
-            "wish": {
-                "id": wish.id,
-                "title": wish.title,
-                "description": wish.description,
-                "progress": wish.progress,
-                "is_completed": wish.is_completed,
-                "status": wish.status,
-                "created_at": ensure_utc(wish.created_at).isoformat(),
-                "target_date": ensure_utc(wish.target_date).isoformat() if wish.target_date else None,
-                "cover_image": wish.cover_image,
-                "consequence": wish.consequence,
-                "tags": [{"id": tag.id, "name": tag.name} for tag in wish.tags],
-                "attachments": [
-                    {
-                        "id": att.id,
-                        "file_name": att.file_name,
-                        "file_path": att.file_path,
-                        "file_type": att.file_type,
-                        "file_size": att.file_size
-                    }
-                    for att in wish.attachments
-                ],
-            },
+    feed_items = [
+        {
+            "wish": encode_wish_card(entry),
             "user": {
-                "id": owner.id,
-                "username": owner.username,
-                "email": owner.email,
+                "id": entry.owner_id,
+                "username": entry.owner_username,
+                "email": entry.owner_email,
             },
             "engagement": {
-                "likes_count": likes_count,
-                "comments_count": comments_count,
-                "views_count": views_count,
-                "is_liked": is_liked,
-                "engagement_score": engagement_score,
+                "likes_count": entry.likes_count,
+                "comments_count": entry.comments_count,
+                "views_count": entry.views_count,
+                "is_liked": entry.is_liked,
+                "engagement_score": entry.engagement_score,
             }
-        })
-    
-    # Sort by engagement score (highest first) or by creation date
-    if filter_type == "Popular":
-        feed_items.sort(key=lambda x: x["engagement"]["engagement_score"], reverse=True)
-    elif filter_type == "Recent":
-        feed_items.sort(key=lambda x: x["wish"]["created_at"], reverse=True)
-    else:  # All or default
-        # Sort by engagement score for default view
-        feed_items.sort(key=lambda x: x["engagement"]["engagement_score"], reverse=True)
-    
-    return feed_items
+        }
+        for entry in entries
+    ]
+    
+    return json_response(feed_items)
 
 @router.get("/{wish_id}")
-def get_wish(wish_id: int, db: Session = Depends(get_db)):
-    from app.models.milestone import Milestone
-    from app.models.completion_verification import CompletionVerification
-    
+def get_wish(wish_id: int, db: Session = Depends(get_read_db)):
     wish = db.query(Wish).filter(Wish.id == wish_id).first()
     if not wish:
         raise HTTPException(status_code=404, detail="Wish not found")
     
-    # Get milestones
-    milestones = db.query(Milestone).filter(Milestone.wish_id == wish.id).order_by(Milestone.order_index).all()
-    
-    # Get verifiers
-    verifications = db.query(CompletionVerification).filter(CompletionVerification.wish_id == wish.id).all()
-    
-    return {
-        "id": wish.id,
-        "title": wish.title,
-        "description": wish.description,
-        "progress": wish.progress,
-        "is_completed": wish.is_completed,
-        "status": wish.status,
-        "created_at": ensure_utc(wish.created_at).isoformat(),
-        "target_date": ensure_utc(wish.target_date).isoformat() if wish.target_date else None,
-        "consequence": wish.consequence,
-        "cover_image": wish.cover_image,
-        "user_id": wish.user_id,
-        "progress_mode": wish.progress_mode,
-        "visibility": wish.visibility,
-        "requires_verification": wish.requires_verification,
-        "completion_status": wish.completion_status.value if hasattr(wish.completion_status, 'value') else wish.completion_status,
-        "milestones": [
-            {
-                "id": m.id,
-                "title": m.title,
-                "description": m.description,
-                "order_index": m.order_index,
-                "points": m.points,
-                "is_completed": m.is_completed,
-                "completed_at": ensure_utc(m.completed_at).isoformat() if m.completed_at else None
-            }
-            for m in milestones
-        ],
-        "verifiers": [
-            {
-                "id": v.id,
-                "verifier_user_id": v.verifier_user_id,
-                "status": v.status.value if hasattr(v.status, 'value') else v.status,
-                "verified_at": ensure_utc(v.verified_at).isoformat() if v.verified_at else None
-            }
-            for v in verifications
-        ],
-    }
+    # Get milestones and verifiers
+    milestones_by_wish, verifications_by_wish = load_milestones_and_verifications(db, [wish.id])
+    
+    return json_response({
+        **encode_wish(wish),
+        "milestones": encode_many(encode_milestone, milestones_by_wish[wish.id]),
+        "verifiers": encode_many(encode_verifier, verifications_by_wish[wish.id]),
+    })
 
 @router.patch("/{wish_id}", response_model=WishResponse)
 def update_wish(
@@ -586,6 +398,10 @@ def update_wish(
     for field, value in update_data.items():
         setattr(db_wish, field, value)
     
+    # Re-evaluate status now that progress may have changed
+    if "progress" in update_data:
+        auto_update_wish_status(db_wish)
+    
     db.commit()
     db.refresh(db_wish)
     return db_wish
@@ -1,11 +1,81 @@
 from pydantic_settings import BaseSettings
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./wishes.db"
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with the aiosqlite driver
+    READ_DATABASE_URL: Optional[str] = None  # Read replica for GET handlers
+    SQLITE_READ_ONLY_CONNECTIONS: bool = True  # Without a replica, read from the SQLite file in mode=ro
+    READ_YOUR_WRITES_SECONDS: int = 5  # After a write, the client reads from the writer for this long
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # SQLite connection profile, applied to every new connection
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"  # NORMAL is durable enough under WAL
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024  # Page cache per connection
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait this long for a write lock instead of failing with "database is locked"
+
+    # Threads running sync endpoints, and the connection pool sized to match them
+    WORKER_THREADS: int = 40
+    DB_POOL_SIZE: Optional[int] = None  # Defaults to WORKER_THREADS
+    DB_MAX_OVERFLOW: int = 10  # Background jobs run in their own threads on top of the workers
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+
+    # Request log: every 5xx and slow request, plus this share of the rest
+    REQUEST_LOG_SAMPLE_RATE: float = 0.01
+    REQUEST_LOG_SLOW_MS: int = 1000
+
+    # Per-request SQL counts and timings: Server-Timing header and request log
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_REPEAT_WARN_THRESHOLD: int = 5  # Log a warning when one statement runs this often in a request
+
+    # Optional single writer thread that group-commits small writes (likes, views, notification reads)
+    WRITE_COORDINATOR_ENABLED: bool = False
+    WRITE_BATCH_MAX: int = 64
+    WRITE_BATCH_WAIT_MS: int = 2  # How long the writer waits for more work before committing
+
+    # Background deadline sweeper (marks overdue wishes as missed)
+    DEADLINE_SWEEP_ENABLED: bool = True
+    DEADLINE_SWEEP_INTERVAL_SECONDS: int = 300
+    DEADLINE_SWEEP_CHUNK_SIZE: int = 500
+
+    # Reminders for pending verifications and upcoming deadlines, scheduled in memory
+    REMINDERS_ENABLED: bool = True
+    VERIFICATION_REMINDER_AFTER_HOURS: int = 48
+    VERIFICATION_ESCALATION_AFTER_HOURS: int = 7 * 24
+    DEADLINE_REMINDER_BEFORE_HOURS: int = 24
+    REMINDER_HORIZON_HOURS: int = 6  # Due times held in memory at once
+    REMINDER_BATCH_WINDOW_SECONDS: int = 60  # Reminders this close together are sent in one batch
+
+    # Uploads are streamed to disk in chunks; limits apply to file contents
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_MAX_FILE_BYTES: int = 25 * 1024 * 1024
+    UPLOAD_MAX_REQUEST_BYTES: int = 100 * 1024 * 1024
+
+    # Serving /uploads: "app" streams files from this process; "x-accel-redirect" (nginx)
+    # and "x-sendfile" (Apache, lighttpd) hand the transfer to the fronting server
+    UPLOAD_SERVE_MODE: Literal["app", "x-accel-redirect", "x-sendfile"] = "app"
+    UPLOAD_ACCEL_REDIRECT_PREFIX: str = "/_uploads/"  # nginx `internal` location aliasing uploads/
+    UPLOAD_CACHE_MAX_AGE: int = 365 * 24 * 3600
+
+    # Background collector for uploaded blobs nothing references any more
+    BLOB_GC_ENABLED: bool = True
+    BLOB_GC_INTERVAL_SECONDS: int = 3600
+    BLOB_GC_GRACE_SECONDS: int = 3600
+
+    # Background collector for files under uploads/ that nothing references
+    ORPHAN_GC_ENABLED: bool = True
+    ORPHAN_GC_INTERVAL_SECONDS: int = 24 * 3600
+    ORPHAN_GC_GRACE_SECONDS: int = 24 * 3600
+
+    # Resized image derivatives, rendered in a process pool after upload
+    IMAGE_DERIVATIVES_ENABLED: bool = True
+    IMAGE_WORKERS: int = 2
+
     class Config:
         env_file = ".env"
 
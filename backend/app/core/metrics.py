@@ -0,0 +1,208 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms keep their values in plain dicts keyed by
+label values, so recording a request is a few dict updates under a lock; all
+formatting happens when /metrics is scraped. Values that already live
+elsewhere (pool counters, cache stats, queue lengths) are read at scrape time
+through callback gauges instead of being copied on every change.
+
+Route labels use the templated path ("/api/wishes/{wish_id}"), never the raw
+URL, so the number of series stays bounded.
+"""
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.requests import Request
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labelnames, labelvalues, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [("", self.labelnames, labelvalues, value) for labelvalues, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1):
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str):
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [("", self.labelnames, labelvalues, value) for labelvalues, value in items]
+
+
+class CallbackGauge(_Metric):
+    """A gauge read at scrape time: `collect` returns (label values, value) pairs"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str],
+                 collect: Callable[[], Iterable[Tuple[LabelValues, Optional[float]]]]):
+        super().__init__(name, help, labelnames)
+        self._collect = collect
+
+    def samples(self):
+        return [("", self.labelnames, labelvalues, value) for labelvalues, value in self._collect() if value is not None]
+
+
+class CallbackCounter(CallbackGauge):
+    """A running total kept elsewhere, read at scrape time"""
+    kind = "counter"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(labelvalues, list(counts), total) for labelvalues, (counts, total) in self._values.items()]
+        bucket_labels = self.labelnames + ("le",)
+        samples = []
+        for labelvalues, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(("_bucket", bucket_labels, labelvalues + (_format_value(bound),), cumulative))
+            samples.append(("_sum", self.labelnames, labelvalues, total))
+            samples.append(("_count", self.labelnames, labelvalues, cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback_gauge(self, name: str, help: str, labelnames: Sequence[str], collect) -> CallbackGauge:
+        return self.register(CallbackGauge(name, help, labelnames, collect))
+
+    def callback_counter(self, name: str, help: str, labelnames: Sequence[str], collect) -> CallbackCounter:
+        return self.register(CallbackCounter(name, help, labelnames, collect))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template", ("method", "route")
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being served")
+http_requests_in_flight.set(0)
+db_statements_total = registry.counter(
+    "db_statements_total", "SQL statements issued while serving requests, by route template", ("route",)
+)
+db_duration_seconds_total = registry.counter(
+    "db_duration_seconds_total", "Time spent in the database driver while serving requests, by route template", ("route",)
+)
+
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, or a fixed label for requests no route matched"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
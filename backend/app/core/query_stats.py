@@ -0,0 +1,132 @@
+"""
+Per-request SQL instrumentation.
+
+`instrument(engine)` adds before/after_cursor_execute hooks that time every
+statement and add it to the QueryStats of the request in progress. The stats
+live in a context variable: the request middleware sets a fresh QueryStats,
+and because FastAPI copies the context into the thread pool (sync endpoints)
+and AsyncSession runs inside the request's task, every query an endpoint
+issues lands in the same object. Statements outside a request (background
+jobs, the write coordinator's thread) are not counted.
+
+Statements are grouped by fingerprint: whitespace collapsed and expanded
+IN (?, ?, ...) lists folded to IN (?), so one query run once per row of a
+list shows up as a single fingerprint with a high count: an N+1.
+
+`query_budget` asserts limits on the same counters, for tests and checks:
+
+    with query_budget(max_queries=4) as stats:
+        client.get("/api/notifications/", headers=headers)
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+_EXPANDED_IN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def fingerprint(statement: str) -> str:
+    """The statement with whitespace, IN-list length and literal numbers normalised"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _EXPANDED_IN.sub("(?)", statement)
+    return _NUMBER.sub("N", statement)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # Seconds spent in the database driver
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Fingerprints issued at least `threshold` times, most frequent first"""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Record the statements issued inside the block in a fresh QueryStats.
+
+    On exit they are also added to the enclosing block's stats, if any, so a
+    request made through an in-process client still counts towards a budget
+    around it.
+    """
+    outer = _current.get()
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        if outer is not None:
+            outer.count += stats.count
+            outer.duration += stats.duration
+            outer.fingerprints.update(stats.fingerprints)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument(*engines: Engine):
+    """Record the statements of these engines (sync engines; pass async_engine.sync_engine)"""
+    for engine in set(engines):
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> Iterator[QueryStats]:
+    """Count the statements issued inside the block and fail if it goes over budget.
+
+    `max_repeats` limits how often any single fingerprint may run, which catches
+    N+1 loops even when the total stays small on test data.
+    """
+    with collect_queries() as stats:
+        yield stats
+
+    problems = []
+    if max_queries is not None and stats.count > max_queries:
+        problems.append(f"{stats.count} queries (budget {max_queries})")
+    if max_repeats is not None:
+        for fp, n in stats.repeated(max_repeats + 1):
+            problems.append(f"{n}x {fp[:200]}")
+    if problems:
+        raise QueryBudgetExceeded("Query budget exceeded: " + "; ".join(problems))
@@ -0,0 +1,139 @@
+"""
+Precompiled response encoders.
+
+Each encoder is built once at import time from a fixed field list, so encoding a
+row is a single attrgetter call plus a dict(zip(...)); no per-field isoformat()
+or hasattr(value, 'value') checks. Datetimes come out of the models as aware UTC
+(see UTCDateTime) and enums are str subclasses, so orjson encodes both natively.
+
+Endpoints return `json_response(...)`, which hands the result straight to orjson
+and skips FastAPI's jsonable_encoder walk.
+"""
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from fastapi.responses import ORJSONResponse
+
+from app.services.uploads import derivative_url
+
+
+def make_encoder(fields: Sequence[str], **nested: Callable[[Any], Any]) -> Callable[[Any], dict]:
+    """Build an encoder for the given attribute names.
+
+    Keyword arguments map extra keys to callables applied to the object, for
+    nested collections (e.g. tags=lambda wish: [...]).
+    """
+    keys = tuple(fields)
+    getter = attrgetter(*keys)
+    if len(keys) == 1:
+        get_values = lambda obj: (getter(obj),)
+    else:
+        get_values = getter
+    extras = tuple(nested.items())
+
+    if not extras:
+        def encode(obj) -> dict:
+            return dict(zip(keys, get_values(obj)))
+    else:
+        def encode(obj) -> dict:
+            data = dict(zip(keys, get_values(obj)))
+            for key, fn in extras:
+                data[key] = fn(obj)
+            return data
+    return encode
+
+
+def encode_many(encoder: Callable[[Any], dict], objects: Iterable[Any]) -> list:
+    return [encoder(obj) for obj in objects]
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> ORJSONResponse:
+    return ORJSONResponse(content=content, status_code=status_code, headers=headers)
+
+
+def image_variants(sha256: Optional[str], derivatives: Optional[dict]) -> dict:
+    """URLs of the resized copies of a stored image, e.g. {"thumb": ..., "medium": ...}"""
+    if not sha256 or not derivatives:
+        return {}
+    return {name: derivative_url(sha256, name, extension) for name, extension in derivatives.items()}
+
+
+# Field lists are shared with the read models (app/read_models), which select exactly these columns
+TAG_FIELDS = ("id", "name")
+ATTACHMENT_FIELDS = ("id", "file_name", "file_path", "file_type", "file_size")
+# Image metadata from the attachment's blob (None until derivatives are rendered)
+IMAGE_FIELDS = ("width", "height", "placeholder")
+MILESTONE_FIELDS = ("id", "title", "description", "order_index", "points", "is_completed", "completed_at")
+VERIFIER_FIELDS = ("id", "verifier_user_id", "status", "verified_at")
+USER_SUMMARY_FIELDS = ("id", "username", "email")
+WISH_FIELDS = (
+    "id", "title", "description", "progress", "is_completed", "status", "created_at",
+    "target_date", "consequence", "cover_image", "user_id", "progress_mode", "visibility",
+    "requires_verification", "completion_status",
+)
+WISH_CARD_FIELDS = (
+    "id", "title", "description", "progress", "is_completed", "status", "created_at",
+    "target_date", "cover_image", "consequence",
+)
+NOTIFICATION_FIELDS = ("id", "type", "wish_id", "content", "is_read", "created_at", "updated_at")
+
+encode_tag = make_encoder(TAG_FIELDS)
+
+encode_attachment = make_encoder(
+    ATTACHMENT_FIELDS + IMAGE_FIELDS,
+    variants=lambda att: image_variants(att.blob_sha256, att.derivatives),
+)
+
+encode_milestone = make_encoder(MILESTONE_FIELDS)
+
+encode_verifier = make_encoder(VERIFIER_FIELDS)
+
+encode_user_summary = make_encoder(USER_SUMMARY_FIELDS)
+
+# Full verification record, as shown to the goal owner
+VERIFICATION_FIELDS = (
+    "id", "status", "comment", "dispute_reason", "verifier_reply_to_owner", "verified_at", "created_at",
+)
+# Rows from read_models.load_verifications, with the verifier's name joined in
+encode_verification = make_encoder(
+    VERIFICATION_FIELDS,
+    verifier=lambda v: {"id": v.verifier_id, "username": v.verifier_username},
+)
+
+# A row of read_models.list_verifier_inbox
+encode_inbox_entry = make_encoder(
+    ("id", "wish_id", "status", "created_at"),
+    wish=lambda v: {
+        "id": v.wish_id, "title": v.wish_title, "progress": v.wish_progress,
+        "target_date": v.wish_target_date, "owner_dispute_response": v.owner_dispute_response,
+    },
+    owner=lambda v: {"id": v.owner_id, "username": v.owner_username},
+)
+
+encode_wish = make_encoder(WISH_FIELDS)
+
+def _encode_cover(wish) -> Optional[dict]:
+    if not wish.cover_blob_sha256:
+        return None
+    return {
+        "width": wish.cover_width,
+        "height": wish.cover_height,
+        "placeholder": wish.cover_placeholder,
+        "variants": image_variants(wish.cover_blob_sha256, wish.cover_derivatives),
+    }
+
+
+# Feed card (read_models.FeedEntry): wish plus its cover image metadata, tags and attachments
+encode_wish_card = make_encoder(
+    WISH_CARD_FIELDS,
+    cover=_encode_cover,
+    tags=lambda wish: [encode_tag(tag) for tag in wish.tags],
+    attachments=lambda wish: [encode_attachment(att) for att in wish.attachments],
+)
+
+encode_progress_update = make_encoder(
+    ("id", "wish_id", "user_id", "content", "progress_value", "created_at", "image_url"),
+    attachments=lambda update: [encode_attachment(att) for att in update.attachments],
+)
+
+encode_notification = make_encoder(NOTIFICATION_FIELDS)
@@ -1,14 +1,126 @@
-from sqlalchemy import create_engine
+import os
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Dict, Optional
 from app.core.config import settings
 
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+_is_memory = _is_sqlite and (":memory:" in settings.DATABASE_URL or settings.DATABASE_URL == "sqlite://")
+
+# One connection per worker thread, so sync endpoints never queue for the pool
+_pool_args = {} if _is_memory else {
+    "pool_size": settings.DB_POOL_SIZE or settings.WORKER_THREADS,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+}
+
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    **_pool_args
+)
+
+
+def sqlite_pragmas(read_only: bool = False) -> dict:
+    """The connection profile from settings, as PRAGMA name -> value"""
+    pragmas = {
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,  # Negative: size in KiB rather than pages
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    if read_only:  # The journal mode is the writer's to set; a read-only connection cannot switch it
+        pragmas["query_only"] = 1
+    elif not _is_memory:  # In-memory databases have no journal file to switch
+        pragmas = {"journal_mode": settings.SQLITE_JOURNAL_MODE, **pragmas}
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas(read_only).items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def _read_database_url() -> Optional[str]:
+    """Where read-only sessions connect; None means they share the writer's engine"""
+    if settings.READ_DATABASE_URL:
+        return settings.READ_DATABASE_URL
+    if _is_sqlite and not _is_memory and settings.SQLITE_READ_ONLY_CONNECTIONS:
+        # Same file, opened read-only: readers never take the write lock and cannot write by accident
+        path = os.path.abspath(make_url(settings.DATABASE_URL).database)
+        return f"sqlite:///file:{path}?mode=ro&uri=true"
+    return None
+
+
+_read_url = _read_database_url()
+
+# Engine for GET handlers: a replica, a read-only SQLite connection, or the writer's engine
+if _read_url:
+    read_engine = create_engine(
+        _read_url,
+        connect_args={"check_same_thread": False} if _read_url.startswith("sqlite") else {},
+        **_pool_args
+    )
+else:
+    read_engine = engine
+
+
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    if _is_sqlite:
+        return settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    raise RuntimeError("Set ASYNC_DATABASE_URL to an async driver URL for this database")
+
+
+# Async engine for `async def` endpoints: their database I/O is awaited instead of blocking the event loop
+async_engine = create_async_engine(
+    _async_database_url(),
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    # aiosqlite would otherwise open a new connection for every session
+    **({"poolclass": AsyncAdaptedQueuePool, **_pool_args} if _pool_args else {})
 )
 
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection)
+
+if read_engine is not engine and read_engine.dialect.name == "sqlite":
+    @event.listens_for(read_engine, "connect")
+    def _on_read_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, read_only=True)
+
+
+def pool_status(pool_engine=engine) -> dict:
+    """Connection pool counters, for the health endpoint"""
+    pool = pool_engine.pool
+    status = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if counter is not None:
+            status[name] = counter()
+    return status
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Objects stay usable after commit: reloading expired attributes would need an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -19,3 +131,63 @@ def get_db():
     finally:
         db.close()
 
+# After a successful write, this client's reads go to the writer until the pin expires,
+# so it sees its own changes even if the replica lags behind. The pin is kept three ways:
+# - against the request's bearer credential, in this process. This covers the app, which
+#   keeps no cookies, but only while its requests reach the same worker process;
+# - in the READ_YOUR_WRITES_HEADER response header, holding the expiry, which a client may
+#   echo back on its next requests to keep the pin across workers;
+# - in a cookie, for browsers.
+READ_YOUR_WRITES_COOKIE = "rw_until"
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+_pinned_credentials: Dict[str, float] = {}  # Authorization header -> pin expiry
+
+
+def _credentials(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization")
+    return authorization if authorization and authorization.startswith("Bearer ") else None
+
+
+def pin_reads_to_writer(request: Request) -> float:
+    """Pin this client's reads to the writer; returns the expiry timestamp"""
+    now = time.time()
+    expires = now + settings.READ_YOUR_WRITES_SECONDS
+    credentials = _credentials(request)
+    if credentials:
+        if len(_pinned_credentials) >= 1024:  # Drop expired pins once the map grows
+            for key, until in list(_pinned_credentials.items()):
+                if until <= now:
+                    _pinned_credentials.pop(key, None)
+        _pinned_credentials[credentials] = expires
+    return expires
+
+
+def read_your_writes_active(request: Request) -> bool:
+    now = time.time()
+    credentials = _credentials(request)
+    if credentials and _pinned_credentials.get(credentials, 0) > now:
+        return True
+    for value in (request.headers.get(READ_YOUR_WRITES_HEADER), request.cookies.get(READ_YOUR_WRITES_COOKIE)):
+        try:
+            if value and float(value) > now:
+                return True
+        except ValueError:
+            pass
+    return False
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints, on the read engine unless this client has just written"""
+    if read_engine is engine or read_your_writes_active(request):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
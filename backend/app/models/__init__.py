@@ -12,6 +12,10 @@ from app.models.notification import Notification
 from app.models.engagement import Engagement
 from app.models.user_statistics import UserStatistics
 from app.models.completion_verification import CompletionVerification
+from app.models.sync_change import SyncChange
+from app.models.sync_idempotency_key import SyncIdempotencyKey
+from app.models.blob import Blob
+from app.models.search_index import search_index  # Registers the FTS table/triggers with create_all
 
 __all__ = [
     "User",
@@ -28,4 +32,7 @@ __all__ = [
     "Engagement",
     "UserStatistics",
     "CompletionVerification",
+    "SyncChange",
+    "SyncIdempotencyKey",
+    "Blob",
 ]
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
+from app.models.types import UTCDateTime
 
 class Attachment(Base):
     __tablename__ = "attachments"
@@ -11,12 +12,31 @@ class Attachment(Base):
     file_path = Column(String, nullable=False)  # Path in uploads directory
     file_type = Column(String, nullable=False)  # MIME type
     file_size = Column(Integer, nullable=False)  # Size in bytes
-    created_at = Column(DateTime, default=datetime.utcnow)
+    blob_sha256 = Column(String(64), ForeignKey("blobs.sha256"), nullable=True, index=True)  # Stored content (null for legacy uploads)
+    created_at = Column(UTCDateTime, default=datetime.utcnow)
     
     # Polymorphic association - can belong to either Wish or ProgressUpdate
-    wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=True)
-    progress_update_id = Column(Integer, ForeignKey("progress_updates.id"), nullable=True)
+    wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=True, index=True)
+    progress_update_id = Column(Integer, ForeignKey("progress_updates.id"), nullable=True, index=True)
     
     wish = relationship("Wish", back_populates="attachments")
     progress_update = relationship("ProgressUpdate", back_populates="attachments")
+    blob = relationship("Blob", lazy="joined")  # Image metadata comes with every attachment
+
+    # Image metadata of the stored content (None for legacy uploads and non-images)
+    @property
+    def width(self):
+        return self.blob.width if self.blob else None
+
+    @property
+    def height(self):
+        return self.blob.height if self.blob else None
+
+    @property
+    def placeholder(self):
+        return self.blob.placeholder if self.blob else None
+
+    @property
+    def derivatives(self):
+        return self.blob.derivatives if self.blob else None
 
@@ -0,0 +1,75 @@
+"""
+Content-addressed upload storage.
+
+A Blob row exists once per distinct file content (keyed by SHA-256), together
+with image metadata and the resized derivatives made from it. Attachments and
+wish covers point at it, and `ref_count` is kept up to date by the mapper
+events below, so a blob whose count drops to zero can be garbage collected
+(see app.services.blobs).
+"""
+from sqlalchemy import Column, Integer, String, Text, JSON, event, inspect
+from datetime import datetime, timezone
+from app.database import Base
+from app.models.types import UTCDateTime
+from app.models.attachment import Attachment
+from app.models.wish import Wish
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)  # Hex digest of the content
+    size = Column(Integer, nullable=False)  # Size in bytes
+    content_type = Column(String, nullable=False)  # MIME type of the first upload
+    extension = Column(String, nullable=False, default="")  # File extension of the first upload, e.g. ".jpg"
+    ref_count = Column(Integer, nullable=False, default=0)  # Attachments + wish covers pointing here
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    last_used_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))  # Last upload of this content
+
+    # Filled in by the image derivative pipeline (app.services.derivatives)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    placeholder = Column(Text, nullable=True)  # Tiny blurred preview as a data: URI (LQIP)
+    derivatives = Column(JSON(none_as_null=True), nullable=True)  # {"thumb": ".webp", ...}; NULL = not processed yet
+
+
+def _adjust_ref_count(connection, sha256, delta: int):
+    if sha256:
+        connection.execute(
+            Blob.__table__.update()
+            .where(Blob.sha256 == sha256)
+            .values(ref_count=Blob.ref_count + delta)
+        )
+
+
+def _track_blob_references(model, attribute: str):
+    """Keep Blob.ref_count in step with `model.<attribute>` on insert, update and delete"""
+
+    @event.listens_for(model, "after_insert")
+    def _after_insert(mapper, connection, target):
+        _adjust_ref_count(connection, getattr(target, attribute), 1)
+
+    @event.listens_for(model, "after_delete")
+    def _after_delete(mapper, connection, target):
+        _adjust_ref_count(connection, getattr(target, attribute), -1)
+
+    @event.listens_for(model, "after_update")
+    def _after_update(mapper, connection, target):
+        history = inspect(target).attrs[attribute].history
+        if not history.has_changes():
+            return
+        for old in history.deleted:
+            _adjust_ref_count(connection, old, -1)
+        for new in history.added:
+            _adjust_ref_count(connection, new, 1)
+
+
+_track_blob_references(Attachment, "blob_sha256")
+_track_blob_references(Wish, "cover_blob_sha256")
+
+
+@event.listens_for(Wish, "before_update")
+def _drop_stale_cover_blob(mapper, connection, target):
+    # A cover_image replaced by a plain URL (PATCH / sync) no longer references the uploaded blob
+    state = inspect(target)
+    if state.attrs.cover_image.history.has_changes() and not state.attrs.cover_blob_sha256.history.has_changes():
+        target.cover_blob_sha256 = None
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import UTCDateTime
 import enum
 
 
@@ -13,17 +14,21 @@ class VerificationStatus(str, enum.Enum):
 
 class CompletionVerification(Base):
     __tablename__ = "completion_verifications"
+    __table_args__ = (
+        # Verifier inbox: verifier_user_id = ? AND status = 'pending' ORDER BY id DESC
+        Index("ix_completion_verifications_verifier_user_id_status", "verifier_user_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=False)
+    wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=False, index=True)
     verifier_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(SQLEnum(VerificationStatus), default=VerificationStatus.PENDING, nullable=False)
     comment = Column(Text, nullable=True)  # Verifier's comment
     dispute_reason = Column(Text, nullable=True)  # Why they disputed
     verifier_reply_to_owner = Column(Text, nullable=True)  # Verifier's reply after owner responds to dispute
     proof_url = Column(String, nullable=True)  # Optional evidence link
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    verified_at = Column(DateTime, nullable=True)  # When they made their decision
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    verified_at = Column(UTCDateTime, nullable=True)  # When they made their decision
     
     # Relationships
     wish = relationship("Wish", back_populates="completion_verifications")
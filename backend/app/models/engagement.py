@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, String
 from datetime import datetime
 from app.database import Base
+from app.models.types import UTCDateTime
 
 class Engagement(Base):
     __tablename__ = "engagements"
@@ -9,5 +10,5 @@ class Engagement(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=False)
     action_type = Column(String, nullable=False)  # 'like', 'comment', 'view', 'share'
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(UTCDateTime, default=datetime.utcnow)
 
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from datetime import datetime
 from app.database import Base
+from app.models.types import UTCDateTime
 
 class Like(Base):
     __tablename__ = "likes"
@@ -8,7 +9,11 @@ class Like(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(UTCDateTime, default=datetime.utcnow)
 
-    __table_args__ = (UniqueConstraint('user_id', 'wish_id', name='unique_user_wish_like'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'wish_id', name='unique_user_wish_like'),
+        # Like counts per wish (stats, feed)
+        Index("ix_likes_wish_id", "wish_id"),
+    )
 
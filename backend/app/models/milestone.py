@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Index, event, inspect
+from sqlalchemy.orm import relationship, object_session
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import UTCDateTime
+from app.models.wish import Wish
 
 
 class Milestone(Base):
     __tablename__ = "milestones"
+    __table_args__ = (
+        # Reminder scheduler: is_completed = 0 AND target_date BETWEEN ? AND ?
+        Index("ix_milestones_is_completed_target_date", "is_completed", "target_date"),
+        # Milestones of a wish, in order
+        Index("ix_milestones_wish_id_order_index", "wish_id", "order_index"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     wish_id = Column(Integer, ForeignKey("wishes.id", ondelete="CASCADE"), nullable=False)
@@ -13,11 +22,12 @@ class Milestone(Base):
     description = Column(Text, nullable=True)
     order_index = Column(Integer, default=0)  # For ordering milestones
     points = Column(Integer, default=1)  # Point value/weight of this milestone
-    target_date = Column(DateTime, nullable=True)  # Deadline for this milestone
+    target_date = Column(UTCDateTime, nullable=True)  # Deadline for this milestone
     is_completed = Column(Boolean, default=False)
-    completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    completed_at = Column(UTCDateTime, nullable=True)
+    deadline_reminded_at = Column(UTCDateTime, nullable=True)  # Maintained by app.services.reminders
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     # Relationships
     wish = relationship("Wish", back_populates="milestones")
@@ -26,3 +36,70 @@ class Milestone(Base):
         return f"<Milestone {self.id}: {self.title}>"
 
 
+# Wish.total_points / completed_points are adjusted by the difference each
+# milestone write makes, in the same flush, instead of re-summing all milestones
+
+def _points(points, is_completed):
+    points = points or 0
+    return points, points if is_completed else 0
+
+
+def _adjust_wish_points(connection, target, wish_id, total_delta: int, completed_delta: int):
+    if not wish_id or (total_delta == 0 and completed_delta == 0):
+        return
+    row = connection.execute(
+        Wish.__table__.update()
+        .where(Wish.id == wish_id)
+        .values(
+            total_points=Wish.total_points + total_delta,
+            completed_points=Wish.completed_points + completed_delta
+        )
+        .returning(Wish.total_points, Wish.completed_points)
+    ).first()
+    # Keep a wish loaded in this session in step, without expiring anything else on it
+    session = object_session(target)
+    wish = session.identity_map.get(inspect(Wish).identity_key_from_primary_key((wish_id,))) if session else None
+    if wish is None:
+        wish = target.__dict__.get("wish")  # A new wish inserted in this same flush
+    if row is not None and wish is not None and wish.id == wish_id:
+        set_committed_value(wish, "total_points", row.total_points)
+        set_committed_value(wish, "completed_points", row.completed_points)
+
+
+@event.listens_for(Milestone, "after_insert")
+def _count_inserted_milestone(mapper, connection, target):
+    total, completed = _points(target.points, target.is_completed)
+    _adjust_wish_points(connection, target, target.wish_id, total, completed)
+
+
+@event.listens_for(Milestone, "after_delete")
+def _count_deleted_milestone(mapper, connection, target):
+    total, completed = _points(target.points, target.is_completed)
+    _adjust_wish_points(connection, target, target.wish_id, -total, -completed)
+
+
+_COUNTED_ATTRIBUTES = ("wish_id", "points", "is_completed")
+
+for _name in _COUNTED_ATTRIBUTES:
+    # active_history: load the old value before it is overwritten, even when expired
+    event.listen(getattr(Milestone, _name), "set", lambda target, value, oldvalue, initiator: value,
+                 active_history=True, retval=True)
+
+
+@event.listens_for(Milestone, "after_update")
+def _count_updated_milestone(mapper, connection, target):
+    attrs = inspect(target).attrs
+    histories = [attrs[name].history for name in _COUNTED_ATTRIBUTES]
+    if not any(history.has_changes() for history in histories):
+        return
+    old_wish_id, old_points, old_completed = (
+        history.deleted[0] if history.deleted else getattr(target, name)
+        for name, history in zip(_COUNTED_ATTRIBUTES, histories)
+    )
+    old_total, old_done = _points(old_points, old_completed)
+    new_total, new_done = _points(target.points, target.is_completed)
+    if old_wish_id != target.wish_id:
+        _adjust_wish_points(connection, target, old_wish_id, -old_total, -old_done)
+        _adjust_wish_points(connection, target, target.wish_id, new_total, new_done)
+    else:
+        _adjust_wish_points(connection, target, target.wish_id, new_total - old_total, new_done - old_done)
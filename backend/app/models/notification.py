@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Boolean, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import UTCDateTime
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Notification list and unread count: user_id = ? [AND is_read = 0]
+        Index("ix_notifications_user_id_is_read_updated_at", "user_id", "is_read", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Recipient
@@ -14,8 +19,8 @@ class Notification(Base):
     actor_ids = Column(Text, nullable=True)  # JSON array of user IDs for aggregated notifications
     content = Column(Text, nullable=True)  # For comments, store the comment text
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import UTCDateTime
 
 class ProgressUpdate(Base):
     __tablename__ = "progress_updates"
+    __table_args__ = (
+        # Timeline: wish_id = ? ORDER BY created_at DESC, id DESC (id is the rowid, so it is in the index too)
+        Index("ix_progress_updates_wish_id_created_at", "wish_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=False)
@@ -12,7 +17,7 @@ class ProgressUpdate(Base):
     content = Column(Text, nullable=False)  # Update text/comment
     image_url = Column(String, nullable=True)  # Optional photo with the update
     progress_value = Column(Integer, nullable=True)  # Optional progress snapshot at this update
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     wish = relationship("Wish", back_populates="progress_updates")
     user = relationship("User")
@@ -0,0 +1,140 @@
+"""
+SQLite FTS5 full-text index over wish titles/descriptions, progress updates and comments.
+
+The index is maintained by triggers on the source tables, so every write only
+touches the rows it changed. Rows are keyed by rowid = source id * 4 + kind code,
+which makes trigger updates and deletes direct rowid lookups.
+"""
+from sqlalchemy import Column, Integer, MetaData, Table, Text, event, text
+from app.database import Base
+
+# Kind codes used in the rowid encoding
+SEARCH_KINDS = {"wish": 1, "progress_update": 2, "comment": 3}
+ROWID_STRIDE = 4
+
+# Lightweight description of the virtual table for building queries.
+# It lives in its own MetaData so create_all never tries to create it as a plain table.
+search_index = Table(
+    "search_index",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("kind", Text),
+    Column("wish_id", Integer),
+    Column("title", Text),
+    Column("body", Text),
+)
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED,
+        wish_id UNINDEXED,
+        title,
+        body,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    # Wishes: only re-index when searchable text changes
+    """
+    CREATE TRIGGER IF NOT EXISTS search_wishes_ai AFTER INSERT ON wishes BEGIN
+        INSERT INTO search_index(rowid, kind, wish_id, title, body)
+        VALUES (new.id * 4 + 1, 'wish', new.id, new.title, coalesce(new.description, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_wishes_au AFTER UPDATE OF title, description ON wishes BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+        INSERT INTO search_index(rowid, kind, wish_id, title, body)
+        VALUES (new.id * 4 + 1, 'wish', new.id, new.title, coalesce(new.description, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_wishes_ad AFTER DELETE ON wishes BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    # Progress updates
+    """
+    CREATE TRIGGER IF NOT EXISTS search_progress_updates_ai AFTER INSERT ON progress_updates BEGIN
+        INSERT INTO search_index(rowid, kind, wish_id, title, body)
+        VALUES (new.id * 4 + 2, 'progress_update', new.wish_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_progress_updates_au AFTER UPDATE OF content ON progress_updates BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        INSERT INTO search_index(rowid, kind, wish_id, title, body)
+        VALUES (new.id * 4 + 2, 'progress_update', new.wish_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_progress_updates_ad AFTER DELETE ON progress_updates BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    # Comments
+    """
+    CREATE TRIGGER IF NOT EXISTS search_comments_ai AFTER INSERT ON comments BEGIN
+        INSERT INTO search_index(rowid, kind, wish_id, title, body)
+        VALUES (new.id * 4 + 3, 'comment', new.wish_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_comments_au AFTER UPDATE OF content ON comments BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+        INSERT INTO search_index(rowid, kind, wish_id, title, body)
+        VALUES (new.id * 4 + 3, 'comment', new.wish_id, '', new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_comments_ad AFTER DELETE ON comments BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+]
+
+SEARCH_INDEX_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS search_wishes_ai",
+    "DROP TRIGGER IF EXISTS search_wishes_au",
+    "DROP TRIGGER IF EXISTS search_wishes_ad",
+    "DROP TRIGGER IF EXISTS search_progress_updates_ai",
+    "DROP TRIGGER IF EXISTS search_progress_updates_au",
+    "DROP TRIGGER IF EXISTS search_progress_updates_ad",
+    "DROP TRIGGER IF EXISTS search_comments_ai",
+    "DROP TRIGGER IF EXISTS search_comments_au",
+    "DROP TRIGGER IF EXISTS search_comments_ad",
+    "DROP TABLE IF EXISTS search_index",
+]
+
+# One-off backfill of rows that existed before the index
+SEARCH_INDEX_BACKFILL = [
+    """
+    INSERT INTO search_index(rowid, kind, wish_id, title, body)
+    SELECT id * 4 + 1, 'wish', id, title, coalesce(description, '') FROM wishes
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, wish_id, title, body)
+    SELECT id * 4 + 2, 'progress_update', wish_id, '', content FROM progress_updates
+    """,
+    """
+    INSERT INTO search_index(rowid, kind, wish_id, title, body)
+    SELECT id * 4 + 3, 'comment', wish_id, '', content FROM comments
+    """,
+]
+
+
+def install_search_index(connection, backfill: bool = False):
+    """Create the FTS table and its triggers (SQLite only)"""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DDL:
+        connection.execute(text(statement))
+    if backfill:
+        for statement in SEARCH_INDEX_BACKFILL:
+            connection.execute(text(statement))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    install_search_index(connection)
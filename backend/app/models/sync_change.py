@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from datetime import datetime, timezone
+from app.database import Base
+from app.models.types import UTCDateTime
+
+class SyncChange(Base):
+    """Append-only change log that backs delta sync for offline clients"""
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        # Delta sync: user_id = ? AND id > :since ORDER BY id
+        Index("ix_sync_changes_user_id_id", "user_id", "id"),
+        {"sqlite_autoincrement": True},  # Never reuse ids, the sequence must only grow
+    )
+
+    id = Column(Integer, primary_key=True)  # Monotonically increasing change sequence
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Whose client should pull this change
+    entity_type = Column(String, nullable=False)  # 'wish', 'milestone', 'progress_update', 'notification'
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)  # 'upsert' or 'delete'
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, UniqueConstraint
+from datetime import datetime, timezone
+from app.database import Base
+from app.models.types import UTCDateTime
+
+class SyncIdempotencyKey(Base):
+    """Result of an already applied offline sync operation, keyed by the client's idempotency key"""
+    __tablename__ = "sync_idempotency_keys"
+    __table_args__ = (UniqueConstraint('user_id', 'key', name='unique_user_idempotency_key'),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String, nullable=False)
+    result = Column(Text, nullable=False)  # JSON of the per-operation result returned to the client
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Table
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
+from app.models.types import UTCDateTime
 
 # Association table for many-to-many relationship between wishes and tags
 wish_tags = Table(
@@ -9,7 +10,7 @@ wish_tags = Table(
     Base.metadata,
     Column('wish_id', Integer, ForeignKey('wishes.id'), primary_key=True),
     Column('tag_id', Integer, ForeignKey('tags.id'), primary_key=True),
-    Column('created_at', DateTime, default=datetime.utcnow)
+    Column('created_at', UTCDateTime, default=datetime.utcnow)
 )
 
 class Tag(Base):
@@ -17,7 +18,7 @@ class Tag(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(UTCDateTime, default=datetime.utcnow)
     usage_count = Column(Integer, default=0)  # Track how many times this tag is used
 
     # Relationship to wishes
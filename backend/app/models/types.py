@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from sqlalchemy.types import DateTime, TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """DateTime that is always timezone-aware UTC in Python.
+
+    Values are stored as naive UTC (the format SQLite already holds) and come
+    back with tzinfo=UTC, so callers never need to patch timezones by hand.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from datetime import datetime
 from app.database import Base
+from app.models.types import UTCDateTime
 
 class View(Base):
     __tablename__ = "views"
+    __table_args__ = (
+        # View counts per wish (stats, feed)
+        Index("ix_views_wish_id", "wish_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for anonymous views
     wish_id = Column(Integer, ForeignKey("wishes.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(UTCDateTime, default=datetime.utcnow)
 
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
+from app.models.types import UTCDateTime
 import enum
 
 class WishStatus(str, enum.Enum):
@@ -26,6 +27,16 @@ class WishVisibility(str, enum.Enum):
 
 class Wish(Base):
     __tablename__ = "wishes"
+    __table_args__ = (
+        # Deadline sweeper: status = 'current' AND target_date < now()
+        Index("ix_wishes_status_target_date", "status", "target_date"),
+        # Wish list: user_id = ? [AND status = ?]
+        Index("ix_wishes_user_id_status", "user_id", "status"),
+        # Public feed: status IN (...) AND visibility = ?, newest first
+        Index("ix_wishes_status_visibility_created_at", "status", "visibility", "created_at"),
+        # Reminder scheduler: completion_status = 'pending_verification' AND verification_requested_at < ?
+        Index("ix_wishes_completion_status_verification_requested_at", "completion_status", "verification_requested_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -34,17 +45,30 @@ class Wish(Base):
     is_completed = Column(Boolean, default=False)
     status = Column(SQLEnum(WishStatus), default=WishStatus.CURRENT, nullable=False)
     visibility = Column(SQLEnum(WishVisibility), default=WishVisibility.PUBLIC, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    target_date = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    target_date = Column(UTCDateTime, nullable=True)
     consequence = Column(Text, nullable=True)  # What happens if goal is not completed
     cover_image = Column(String, nullable=True)  # Cover/main image for the goal
+    cover_blob_sha256 = Column(String(64), nullable=True)  # Uploaded cover content (blobs.sha256)
     progress_mode = Column(String, default="manual")  # manual or milestone
+    # Sums over the wish's milestones, kept up to date by the events in app.models.milestone
+    total_points = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_points = Column(Integer, nullable=False, default=0, server_default="0")
     user_id = Column(Integer, ForeignKey("users.id"))
     
     # Verification fields
     requires_verification = Column(Boolean, default=False)  # Does this goal need verification?
     completion_status = Column(SQLEnum(CompletionStatus), default=CompletionStatus.INCOMPLETE, nullable=False)
     owner_dispute_response = Column(Text, nullable=True)  # Owner's response to disputes
+    # Verification records by status, kept up to date by app.services.verifications
+    verifications_pending = Column(Integer, nullable=False, default=0, server_default="0")
+    verifications_approved = Column(Integer, nullable=False, default=0, server_default="0")
+    verifications_disputed = Column(Integer, nullable=False, default=0, server_default="0")
+    # Reminder bookkeeping, maintained by app.services.reminders
+    verification_requested_at = Column(UTCDateTime, nullable=True)  # When completion_status last became pending_verification
+    verification_reminded_at = Column(UTCDateTime, nullable=True)
+    verification_escalated_at = Column(UTCDateTime, nullable=True)
+    deadline_reminded_at = Column(UTCDateTime, nullable=True)
 
     owner = relationship("User", back_populates="wishes")
     progress_updates = relationship("ProgressUpdate", back_populates="wish", cascade="all, delete-orphan")
@@ -0,0 +1,27 @@
+"""
+Read models for the hot list endpoints.
+
+These run SQLAlchemy Core `select()`s of just the columns a response needs and
+return plain rows (`Row` objects or named tuples) instead of ORM instances, so
+listing thousands of wishes never pays for identity-map bookkeeping, attribute
+instrumentation or lazy-load proxies. Rows expose the
+same attribute names as the models, so the encoders in app.core.serializers
+work on both.
+"""
+from app.read_models.wishes import FeedEntry, list_feed, list_user_wishes, load_milestones_and_verifications
+from app.read_models.follows import list_followers, list_following
+from app.read_models.notifications import NotificationEntry, list_notifications
+from app.read_models.verifications import list_verifier_inbox, load_verifications
+
+__all__ = [
+    "FeedEntry",
+    "list_feed",
+    "list_user_wishes",
+    "load_milestones_and_verifications",
+    "list_followers",
+    "list_following",
+    "NotificationEntry",
+    "list_notifications",
+    "list_verifier_inbox",
+    "load_verifications",
+]
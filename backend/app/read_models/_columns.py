@@ -0,0 +1,6 @@
+from typing import Sequence
+
+
+def columns(model, fields: Sequence[str]) -> list:
+    """Model columns for the given attribute names, in order"""
+    return [getattr(model, field) for field in fields]
@@ -0,0 +1,27 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.serializers import USER_SUMMARY_FIELDS
+from app.models.follow import Follow
+from app.models.user import User
+from app.read_models._columns import columns
+
+
+def list_followers(db: Session, user_id: int) -> list:
+    """Rows (id, username, email) of the users following `user_id`, oldest follow first"""
+    return db.execute(
+        select(*columns(User, USER_SUMMARY_FIELDS))
+        .join(Follow, Follow.follower_id == User.id)
+        .where(Follow.following_id == user_id)
+        .order_by(Follow.id)
+    ).all()
+
+
+def list_following(db: Session, user_id: int) -> list:
+    """Rows (id, username, email) of the users `user_id` follows, oldest follow first"""
+    return db.execute(
+        select(*columns(User, USER_SUMMARY_FIELDS))
+        .join(Follow, Follow.following_id == User.id)
+        .where(Follow.follower_id == user_id)
+        .order_by(Follow.id)
+    ).all()
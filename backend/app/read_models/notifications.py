@@ -0,0 +1,57 @@
+import json
+from collections import namedtuple
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.serializers import NOTIFICATION_FIELDS
+from app.models.notification import Notification
+from app.models.user import User
+from app.models.wish import Wish
+from app.read_models._columns import columns
+
+_JOINED_FIELDS = ("wish_title", "actor_id", "actor_username", "actor_ids")
+
+
+# A notification with its wish title and actor names already resolved.
+# wish_title / actor_username are None when the wish or actor no longer exists;
+# actor_usernames and actor_count are None for non-aggregated notifications.
+NotificationEntry = namedtuple(
+    "NotificationEntry", NOTIFICATION_FIELDS + _JOINED_FIELDS + ("actor_usernames", "actor_count")
+)
+
+
+def list_notifications(db: Session, user_id: int, limit: int = 50) -> List[NotificationEntry]:
+    """The user's most recently updated notifications, in two queries"""
+    actor = aliased(User)
+    rows = db.execute(
+        select(
+            *columns(Notification, NOTIFICATION_FIELDS),
+            Wish.title.label("wish_title"),
+            actor.id.label("actor_id"),
+            actor.username.label("actor_username"),
+            Notification.actor_ids,
+        )
+        .outerjoin(Wish, Wish.id == Notification.wish_id)
+        .outerjoin(actor, actor.id == Notification.actor_id)
+        .where(Notification.user_id == user_id)
+        .order_by(Notification.updated_at.desc())
+        .limit(limit)
+    ).all()
+
+    # Aggregated notifications: resolve every listed actor with one lookup
+    actor_ids_by_row = [json.loads(row.actor_ids) if row.actor_ids else None for row in rows]
+    all_ids = {actor_id for ids in actor_ids_by_row if ids for actor_id in ids}
+    usernames = {}
+    if all_ids:
+        usernames = dict(db.execute(select(User.id, User.username).where(User.id.in_(all_ids))).all())
+
+    entries = []
+    for row, ids in zip(rows, actor_ids_by_row):
+        if ids is None:
+            entries.append(NotificationEntry._make((*row, None, None)))
+        else:
+            names = [usernames[actor_id] for actor_id in ids if actor_id in usernames]
+            entries.append(NotificationEntry._make((*row, names, len(ids))))
+    return entries
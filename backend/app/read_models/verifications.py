@@ -0,0 +1,63 @@
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
+
+from app.core.serializers import VERIFICATION_FIELDS
+from app.models.completion_verification import CompletionVerification, VerificationStatus
+from app.models.user import User
+from app.models.wish import CompletionStatus, Wish
+from app.read_models._columns import columns
+
+
+def load_verifications(db: Session, wish_ids: Iterable[int]):
+    """Verification rows with their verifier's username for many wishes, in one query, grouped by wish id"""
+    by_wish = defaultdict(list)
+    rows = db.execute(
+        select(
+            CompletionVerification.wish_id,
+            *columns(CompletionVerification, VERIFICATION_FIELDS),
+            User.id.label("verifier_id"),
+            User.username.label("verifier_username"),
+        )
+        .join(User, User.id == CompletionVerification.verifier_user_id)
+        .where(CompletionVerification.wish_id.in_(list(wish_ids)))
+        .order_by(CompletionVerification.wish_id, CompletionVerification.id)
+    )
+    for row in rows:
+        by_wish[row.wish_id].append(row)
+    return by_wish
+
+
+def list_verifier_inbox(db: Session, verifier_user_id: int, limit: int, before_id: Optional[int] = None) -> List[Row]:
+    """A verifier's pending verifications on goals that are waiting for them, newest first.
+
+    Walks ix_completion_verifications_verifier_user_id_status; wish titles and
+    owner usernames are joined in the same query.
+    """
+    owner = aliased(User)
+    stmt = select(
+        CompletionVerification.id,
+        CompletionVerification.wish_id,
+        CompletionVerification.status,
+        CompletionVerification.created_at,
+        Wish.title.label("wish_title"),
+        Wish.progress.label("wish_progress"),
+        Wish.target_date.label("wish_target_date"),
+        Wish.owner_dispute_response,
+        owner.id.label("owner_id"),
+        owner.username.label("owner_username"),
+    ).join(
+        Wish, Wish.id == CompletionVerification.wish_id
+    ).join(
+        owner, owner.id == Wish.user_id
+    ).where(
+        CompletionVerification.verifier_user_id == verifier_user_id,
+        CompletionVerification.status == VerificationStatus.PENDING,
+        Wish.completion_status == CompletionStatus.PENDING_VERIFICATION,
+    )
+    if before_id is not None:
+        stmt = stmt.where(CompletionVerification.id < before_id)
+    return db.execute(stmt.order_by(CompletionVerification.id.desc()).limit(limit)).all()
@@ -0,0 +1,185 @@
+from collections import defaultdict, namedtuple
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy import Select, exists, false, func, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.serializers import (
+    ATTACHMENT_FIELDS, IMAGE_FIELDS, MILESTONE_FIELDS, TAG_FIELDS, VERIFIER_FIELDS, WISH_CARD_FIELDS, WISH_FIELDS
+)
+from app.models.attachment import Attachment
+from app.models.blob import Blob
+from app.models.comment import Comment
+from app.models.completion_verification import CompletionVerification
+from app.models.like import Like
+from app.models.milestone import Milestone
+from app.models.tag import Tag, wish_tags
+from app.models.user import User
+from app.models.view import View
+from app.models.wish import Wish
+from app.read_models._columns import columns
+
+# Either concrete ids or a select() of wish ids, so large pages are filtered
+# with a subquery instead of one bound parameter per id
+WishIds = Union[Iterable[int], Select]
+
+_COVER_FIELDS = ("cover_blob_sha256", "cover_width", "cover_height", "cover_placeholder", "cover_derivatives")
+_OWNER_FIELDS = ("owner_id", "owner_username", "owner_email")
+_ENGAGEMENT_FIELDS = ("likes_count", "comments_count", "views_count", "is_liked", "engagement_score")
+
+
+# One feed row: the wish card columns, cover image metadata, its owner and engagement counters.
+# A named tuple is built in C from the result row, so hydrating a page is a
+# single tuple allocation per wish
+FeedEntry = namedtuple(
+    "FeedEntry", WISH_CARD_FIELDS + _COVER_FIELDS + _OWNER_FIELDS + _ENGAGEMENT_FIELDS + ("tags", "attachments")
+)
+
+
+def _ids_filter(column, wish_ids: WishIds):
+    if not isinstance(wish_ids, Select):
+        wish_ids = list(wish_ids)
+    return column.in_(wish_ids)
+
+
+def load_milestones_and_verifications(db: Session, wish_ids: WishIds):
+    """Milestone and verifier rows for many wishes in two queries, grouped by wish id"""
+    milestones_by_wish = defaultdict(list)
+    verifications_by_wish = defaultdict(list)
+
+    milestones = db.execute(
+        select(Milestone.wish_id, *columns(Milestone, MILESTONE_FIELDS))
+        .where(_ids_filter(Milestone.wish_id, wish_ids))
+        .order_by(Milestone.wish_id, Milestone.order_index)
+    )
+    for m in milestones:
+        milestones_by_wish[m.wish_id].append(m)
+
+    verifications = db.execute(
+        select(CompletionVerification.wish_id, *columns(CompletionVerification, VERIFIER_FIELDS))
+        .where(_ids_filter(CompletionVerification.wish_id, wish_ids))
+    )
+    for v in verifications:
+        verifications_by_wish[v.wish_id].append(v)
+
+    return milestones_by_wish, verifications_by_wish
+
+
+def load_tags_and_attachments(db: Session, wish_ids: WishIds):
+    """Tag and attachment rows for many wishes in two queries, grouped by wish id"""
+    tags_by_wish = defaultdict(list)
+    attachments_by_wish = defaultdict(list)
+
+    tags = db.execute(
+        select(wish_tags.c.wish_id, *columns(Tag, TAG_FIELDS))
+        .join(Tag, Tag.id == wish_tags.c.tag_id)
+        .where(_ids_filter(wish_tags.c.wish_id, wish_ids))
+    )
+    for t in tags:
+        tags_by_wish[t.wish_id].append(t)
+
+    attachments = db.execute(
+        select(
+            Attachment.wish_id,
+            *columns(Attachment, ATTACHMENT_FIELDS),
+            Attachment.blob_sha256,
+            *columns(Blob, IMAGE_FIELDS),
+            Blob.derivatives,
+        )
+        .outerjoin(Blob, Blob.sha256 == Attachment.blob_sha256)
+        .where(_ids_filter(Attachment.wish_id, wish_ids))
+        .order_by(Attachment.id)
+    )
+    for a in attachments:
+        attachments_by_wish[a.wish_id].append(a)
+
+    return tags_by_wish, attachments_by_wish
+
+
+def list_user_wishes(db: Session, user_id: int, status=None, skip: int = 0, limit: Optional[int] = None):
+    """A user's wishes as rows, plus their milestone and verifier rows grouped by wish id"""
+    conditions = [Wish.user_id == user_id]
+    if status is not None:
+        conditions.append(Wish.status == status)
+
+    page = select(Wish.id).where(*conditions).order_by(Wish.id).offset(skip)
+    if limit is not None:
+        page = page.limit(limit)
+
+    wishes = db.execute(
+        select(*columns(Wish, WISH_FIELDS)).where(*conditions).order_by(Wish.id).offset(skip).limit(limit)
+    ).all()
+    milestones_by_wish, verifications_by_wish = load_milestones_and_verifications(db, page)
+    return wishes, milestones_by_wish, verifications_by_wish
+
+
+def _count_by_wish(model):
+    return select(model.wish_id, func.count().label("n")).group_by(model.wish_id).subquery()
+
+
+def list_feed(
+    db: Session,
+    conditions: list,
+    current_user_id: Optional[int] = None,
+    order: str = "engagement"
+) -> List[FeedEntry]:
+    """Feed entries for the wishes matching `conditions`, with engagement stats computed in SQL.
+
+    `order` is "engagement" (score, highest first) or "recent" (newest first).
+    """
+    likes = _count_by_wish(Like)
+    comments = _count_by_wish(Comment)
+    views = _count_by_wish(View)
+
+    likes_count = func.coalesce(likes.c.n, 0)
+    comments_count = func.coalesce(comments.c.n, 0)
+    views_count = func.coalesce(views.c.n, 0)
+    # Same formula as before: likes * 3 + comments * 5 + views * 0.1
+    engagement_score = likes_count * 3 + comments_count * 5 + views_count * literal(0.1)
+
+    if current_user_id:
+        is_liked = exists().where(Like.wish_id == Wish.id, Like.user_id == current_user_id)
+    else:
+        is_liked = false()
+
+    cover = aliased(Blob)
+
+    stmt = select(
+        *columns(Wish, WISH_CARD_FIELDS),
+        Wish.cover_blob_sha256,
+        cover.width.label("cover_width"),
+        cover.height.label("cover_height"),
+        cover.placeholder.label("cover_placeholder"),
+        cover.derivatives.label("cover_derivatives"),
+        User.id.label("owner_id"),
+        User.username.label("owner_username"),
+        User.email.label("owner_email"),
+        likes_count.label("likes_count"),
+        comments_count.label("comments_count"),
+        views_count.label("views_count"),
+        is_liked.label("is_liked"),
+        engagement_score.label("engagement_score"),
+    ).join(
+        User, User.id == Wish.user_id
+    ).outerjoin(
+        cover, cover.sha256 == Wish.cover_blob_sha256
+    ).outerjoin(
+        likes, likes.c.wish_id == Wish.id
+    ).outerjoin(
+        comments, comments.c.wish_id == Wish.id
+    ).outerjoin(
+        views, views.c.wish_id == Wish.id
+    ).where(*conditions)
+
+    if order == "recent":
+        stmt = stmt.order_by(Wish.created_at.desc(), Wish.id)
+    else:
+        stmt = stmt.order_by(engagement_score.desc(), Wish.id)
+
+    rows = db.execute(stmt).all()
+    if not rows:
+        return []
+
+    tags_by_wish, attachments_by_wish = load_tags_and_attachments(db, select(Wish.id).where(*conditions))
+    make = FeedEntry._make
+    return [make((*row, tags_by_wish[row.id], attachments_by_wish[row.id])) for row in rows]
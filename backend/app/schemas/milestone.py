@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from app.schemas.types import UTCDatetime
+from typing import List, Optional
 
 
 class MilestoneBase(BaseModel):
@@ -8,7 +9,7 @@ class MilestoneBase(BaseModel):
     description: Optional[str] = None
     order_index: int = 0
     points: int = 1
-    target_date: Optional[datetime] = None
+    target_date: Optional[UTCDatetime] = None
 
 
 class MilestoneCreate(MilestoneBase):
@@ -20,10 +21,19 @@ class MilestoneUpdate(BaseModel):
     description: Optional[str] = None
     order_index: Optional[int] = None
     points: Optional[int] = None
-    target_date: Optional[datetime] = None
+    target_date: Optional[UTCDatetime] = None
     is_completed: Optional[bool] = None
 
 
+class MilestoneBulkItem(MilestoneUpdate):
+    id: int
+
+
+class MilestoneBulkUpdate(BaseModel):
+    order: Optional[List[int]] = None  # Milestone ids in their new order; order_index becomes the position
+    updates: List[MilestoneBulkItem] = []  # Edits and (un)completions, applied before the reorder
+
+
 class Milestone(MilestoneBase):
     id: int
     wish_id: int
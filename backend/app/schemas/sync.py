@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+from app.schemas.wish import WishCreate, WishUpdate
+from app.schemas.milestone import MilestoneBase
+
+class SyncWishCreate(WishCreate):
+    tags: List[str] = []
+    progress_mode: str = "manual"  # manual or milestone
+    milestones: List[MilestoneBase] = []
+
+class SyncProgressCreate(BaseModel):
+    content: str = ""
+    progress_value: Optional[int] = None
+
+class SyncOperation(BaseModel):
+    op: Literal["create_wish", "update_wish", "progress"]
+    idempotency_key: str = Field(..., min_length=1, max_length=200)
+    # Target wish for update_wish/progress: a server id, or the client_id of a
+    # wish created by an earlier create_wish in the same batch
+    wish_id: Optional[int] = None
+    wish_client_id: Optional[str] = None
+    client_id: Optional[str] = None  # Client-side id of the wish created by create_wish
+    wish: Optional[SyncWishCreate] = None  # create_wish payload
+    update: Optional[WishUpdate] = None  # update_wish payload
+    progress: Optional[SyncProgressCreate] = None  # progress payload
+
+class SyncBatchRequest(BaseModel):
+    operations: List[SyncOperation] = Field(..., max_length=500)
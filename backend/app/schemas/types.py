@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def assume_utc(value: datetime) -> datetime:
+    """Naive datetimes from clients (e.g. Dart's toIso8601String()) are UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# A datetime that is always timezone-aware once validated
+UTCDatetime = Annotated[datetime, AfterValidator(assume_utc)]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from app.schemas.types import UTCDatetime
 from typing import Optional, List
 from enum import Enum
 
@@ -18,7 +19,7 @@ class WishVisibility(str, Enum):
 class WishCreate(BaseModel):
     title: str
     description: Optional[str] = None
-    target_date: Optional[datetime] = None
+    target_date: Optional[UTCDatetime] = None
     consequence: Optional[str] = None
     cover_image: Optional[str] = None
     visibility: Optional[WishVisibility] = WishVisibility.PUBLIC
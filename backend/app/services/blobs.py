@@ -0,0 +1,139 @@
+"""
+Blob bookkeeping for the content-addressed upload store.
+
+`register_blobs` records freshly stored uploads; reference counts are then
+maintained by the mapper events in app.models.blob. `collect_unreferenced_blobs`
+deletes blobs nobody has referenced for a grace period, and
+`run_blob_collector` runs it periodically from the app lifespan.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.blob import Blob
+from app.services.uploads import BLOB_TMP_DIR, StoredUpload, blob_path, derivative_path
+
+logger = logging.getLogger(__name__)
+
+
+def register_blobs(db: Session, uploads: Iterable[StoredUpload]):
+    """Insert a Blob row per stored upload, or mark an existing one as just used.
+
+    Refreshing last_used_at keeps the collector away from content that was
+    re-uploaded while unreferenced, until the new attachment is committed.
+    """
+    now = datetime.now(timezone.utc)
+    rows = {
+        upload.sha256: {
+            "sha256": upload.sha256,
+            "size": upload.size,
+            "content_type": upload.content_type,
+            "extension": upload.extension,
+            "ref_count": 0,
+            "created_at": now,
+            "last_used_at": now,
+        }
+        for upload in uploads
+    }
+    if not rows:
+        return
+    stmt = sqlite_insert(Blob).values(list(rows.values()))
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[Blob.sha256],
+        set_={"last_used_at": stmt.excluded.last_used_at}
+    ))
+
+
+def _move_aside(paths) -> list:
+    """Rename a blob's files into the tmp directory; returns (original, moved) pairs"""
+    moved = []
+    for path in paths:
+        aside = BLOB_TMP_DIR / f"{uuid.uuid4()}.collected"
+        try:
+            os.replace(path, aside)
+        except FileNotFoundError:
+            continue
+        os.utime(aside)  # Keeps the orphan collector, which sweeps tmp by mtime, off it
+        moved.append((path, aside))
+    return moved
+
+
+def collect_unreferenced_blobs(db: Session, now: Optional[datetime] = None, grace_seconds: Optional[int] = None) -> int:
+    """Delete blobs with no references that were last used before the grace period.
+
+    The candidates' files are moved aside first, then the rows are deleted
+    (re-checking ref_count and last_used_at in the same statement). Only the
+    files of rows that were actually deleted are removed; the others are moved
+    back. While a file is aside, an upload of the same content cannot reuse it:
+    it either refreshed the row first, which keeps the row from being deleted,
+    or found no row and stored its own copy (see uploads._commit_blob).
+    Returns the number of blobs deleted.
+    """
+    now = now or datetime.now(timezone.utc)
+    grace_seconds = settings.BLOB_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = now - timedelta(seconds=grace_seconds)
+    collectable = and_(Blob.ref_count <= 0, Blob.last_used_at < cutoff)
+
+    candidates = db.execute(
+        select(Blob.sha256, Blob.extension, Blob.derivatives).where(collectable)
+    ).all()
+    db.rollback()  # End the read before touching files
+    if not candidates:
+        return 0
+
+    moved = {}
+    for sha256, extension, derivatives in candidates:
+        paths = [blob_path(sha256, extension)]
+        paths += [derivative_path(sha256, name, ext) for name, ext in (derivatives or {}).items()]
+        moved[sha256] = _move_aside(paths)
+
+    deleted = set()
+    try:
+        deleted = set(db.execute(
+            delete(Blob)
+            .where(Blob.sha256.in_(list(moved)), collectable)
+            .returning(Blob.sha256)
+        ).scalars().all())
+        db.commit()
+    finally:
+        reclaimed = 0
+        for sha256, files in moved.items():
+            for original, aside in files:
+                if sha256 in deleted:
+                    reclaimed += aside.stat().st_size
+                    aside.unlink()
+                else:
+                    # Used again meanwhile; an upload may also have stored its own identical copy
+                    os.replace(aside, original)
+
+    if deleted:
+        logger.info(f"Blob collector removed {len(deleted)} blob(s), {reclaimed} bytes")
+    return len(deleted)
+
+
+def _run_collection():
+    db = SessionLocal()
+    try:
+        return collect_unreferenced_blobs(db)
+    finally:
+        db.close()
+
+
+async def run_blob_collector(interval_seconds: Optional[int] = None):
+    """Run the collector forever, once every `interval_seconds`."""
+    interval_seconds = interval_seconds or settings.BLOB_GC_INTERVAL_SECONDS
+    while True:
+        try:
+            await asyncio.to_thread(_run_collection)
+        except Exception:
+            logger.exception("Blob collection failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,72 @@
+"""
+Records every change to sync-visible entities in the `sync_changes` log.
+
+ORM writes are captured automatically by an `after_flush` hook, so the change
+rows are written in the same transaction as the data they describe. Bulk
+`query.update()` calls bypass the ORM and must call `record_changes` instead.
+"""
+from typing import Iterable, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models.milestone import Milestone
+from app.models.notification import Notification
+from app.models.progress_update import ProgressUpdate
+from app.models.sync_change import SyncChange
+from app.models.wish import Wish
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Model -> entity_type stored in the change log
+TRACKED_ENTITIES = {
+    Wish: "wish",
+    Milestone: "milestone",
+    ProgressUpdate: "progress_update",
+    Notification: "notification",
+}
+
+
+def record_changes(db: Session, changes: Iterable[Tuple[int, str, int, str]]):
+    """Append (user_id, entity_type, entity_id, operation) rows to the change log"""
+    rows = [
+        {"user_id": user_id, "entity_type": entity_type, "entity_id": entity_id, "operation": operation}
+        for user_id, entity_type, entity_id, operation in changes
+        if user_id is not None
+    ]
+    if rows:
+        db.connection().execute(SyncChange.__table__.insert(), rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_changes(session: Session, flush_context):
+    pending = []
+    for obj in session.new:
+        if type(obj) in TRACKED_ENTITIES:
+            pending.append((obj, UPSERT))
+    for obj in session.dirty:
+        if type(obj) in TRACKED_ENTITIES and session.is_modified(obj, include_collections=False):
+            pending.append((obj, UPSERT))
+    for obj in session.deleted:
+        if type(obj) in TRACKED_ENTITIES:
+            pending.append((obj, DELETE))
+    if not pending:
+        return
+
+    # Milestones only know their wish; resolve owners from this flush first,
+    # then with a single query for the rest
+    wish_owners = {obj.id: obj.user_id for obj, _ in pending if isinstance(obj, Wish)}
+    missing = {obj.wish_id for obj, _ in pending if isinstance(obj, Milestone) and obj.wish_id not in wish_owners}
+    if missing:
+        rows = session.connection().execute(select(Wish.id, Wish.user_id).where(Wish.id.in_(missing)))
+        wish_owners.update({wish_id: user_id for wish_id, user_id in rows})
+
+    changes = []
+    for obj, operation in pending:
+        if isinstance(obj, Milestone):
+            user_id = wish_owners.get(obj.wish_id)
+        else:
+            user_id = obj.user_id
+        changes.append((user_id, TRACKED_ENTITIES[type(obj)], obj.id, operation))
+    record_changes(session, changes)
@@ -0,0 +1,88 @@
+"""
+Background sweeper that marks overdue wishes as missed.
+
+Runs on a timer instead of on every read, so `GET /api/wishes` stays a pure
+read and wishes are marked missed even if their owner never opens the app.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.notification import Notification
+from app.models.wish import Wish, WishStatus
+from app.services.change_tracking import record_changes, UPSERT
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_missed_wishes(db: Session, now: Optional[datetime] = None, chunk_size: Optional[int] = None) -> int:
+    """Mark every current wish whose deadline has passed as missed.
+
+    Candidates are found through the (status, target_date) index and updated
+    in chunks, each chunk in its own short transaction together with the
+    owner notifications. Returns the number of wishes marked as missed.
+    """
+    now = now or datetime.now(timezone.utc)
+    chunk_size = chunk_size or settings.DEADLINE_SWEEP_CHUNK_SIZE
+    total = 0
+
+    while True:
+        overdue = db.query(Wish.id, Wish.user_id, Wish.title).filter(
+            Wish.status == WishStatus.CURRENT,
+            Wish.target_date < now,
+            Wish.progress < 100  # 100% wishes are waiting on verification, not missed
+        ).order_by(Wish.target_date).limit(chunk_size).all()
+
+        if not overdue:
+            break
+
+        wish_ids = [row.id for row in overdue]
+        db.query(Wish).filter(
+            Wish.id.in_(wish_ids),
+            Wish.status == WishStatus.CURRENT
+        ).update({Wish.status: WishStatus.MISSED}, synchronize_session=False)
+        record_changes(db, [(row.user_id, "wish", row.id, UPSERT) for row in overdue])
+
+        # Let each owner know their goal was missed
+        db.add_all([
+            Notification(
+                user_id=row.user_id,
+                type="wish_missed",
+                wish_id=row.id,
+                content=f"Your goal '{row.title}' has passed its deadline"
+            )
+            for row in overdue
+        ])
+        db.commit()
+
+        total += len(overdue)
+        if len(overdue) < chunk_size:
+            break
+
+    if total:
+        logger.info(f"Deadline sweep marked {total} wish(es) as missed")
+    return total
+
+
+def _run_sweep():
+    db = SessionLocal()
+    try:
+        return sweep_missed_wishes(db)
+    finally:
+        db.close()
+
+
+async def run_deadline_sweeper(interval_seconds: Optional[int] = None):
+    """Run the sweep forever, once every `interval_seconds`."""
+    interval_seconds = interval_seconds or settings.DEADLINE_SWEEP_INTERVAL_SECONDS
+    while True:
+        try:
+            await asyncio.to_thread(_run_sweep)
+        except Exception:
+            logger.exception("Deadline sweep failed")
+        await asyncio.sleep(interval_seconds)
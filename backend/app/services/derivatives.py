@@ -0,0 +1,164 @@
+"""
+Image derivative pipeline.
+
+After an image is stored, a process pool (CPU-bound work stays off the event
+loop and out of the GIL) reads its dimensions and renders resized copies next
+to the blob, plus a tiny LQIP placeholder clients can show while loading. The
+results are recorded on the Blob row, and the encoders expose them as
+`variants` URLs so clients fetch the smallest adequate size.
+"""
+import asyncio
+import base64
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.blob import Blob
+from app.services.uploads import StoredUpload, blob_path, derivative_path
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels; a size is skipped when the original is not larger
+DERIVATIVE_SIZES = {"thumb": 320, "medium": 1080}
+PLACEHOLDER_SIZE = 16
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+# Image types Pillow cannot rasterize
+_SKIPPED_TYPES = {"image/svg+xml"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_tasks = set()  # Keep scheduled tasks referenced until they finish
+
+
+def is_derivable(content_type: str) -> bool:
+    return content_type.startswith("image/") and content_type not in _SKIPPED_TYPES
+
+
+def render_derivatives(source: str, sha256: str) -> dict:
+    """Worker process: measure the image and write its derivatives. Returns the Blob fields."""
+    from PIL import Image, ImageOps, features
+
+    if features.check("webp"):
+        image_format, extension, mime_type = "WEBP", ".webp", "image/webp"
+        options = {"quality": WEBP_QUALITY, "method": 4}
+    else:
+        image_format, extension, mime_type = "JPEG", ".jpg", "image/jpeg"
+        options = {"quality": JPEG_QUALITY, "optimize": True}
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        if image_format == "JPEG" or not has_alpha:
+            image = image.convert("RGB")
+        elif image.mode != "RGBA":
+            image = image.convert("RGBA")
+
+        derivatives = {}
+        for name, box in DERIVATIVE_SIZES.items():
+            if max(width, height) <= box:
+                continue
+            resized = image.copy()
+            resized.thumbnail((box, box), Image.Resampling.LANCZOS)
+            target = derivative_path(sha256, name, extension)
+            partial = target.with_name(target.name + ".part")
+            resized.save(partial, format=image_format, **options)
+            os.replace(partial, target)
+            derivatives[name] = extension
+
+        # A WebP this small is ~100 bytes, cheap enough to inline in every response
+        preview = image.convert("RGB")
+        preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        buffer = io.BytesIO()
+        preview.save(buffer, format=image_format, quality=50)
+        placeholder = f"data:{mime_type};base64," + base64.b64encode(buffer.getvalue()).decode()
+
+    return {"width": width, "height": height, "placeholder": placeholder, "derivatives": derivatives}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _pool
+
+
+def pending_derivative_tasks() -> int:
+    """Images queued or rendering in this process"""
+    return len(_tasks)
+
+
+def shutdown_derivative_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _record_result(sha256: str, fields: dict):
+    db = SessionLocal()
+    try:
+        db.query(Blob).filter(Blob.sha256 == sha256).update(fields, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def process_blob(sha256: str, extension: str):
+    """Render one blob's derivatives in the pool and record the result"""
+    loop = asyncio.get_running_loop()
+    source = str(blob_path(sha256, extension))
+    try:
+        fields = await loop.run_in_executor(_get_pool(), render_derivatives, source, sha256)
+    except Exception as e:
+        # Not a decodable image: remember that, so it is not retried on every start
+        logger.warning(f"Could not render derivatives for blob {sha256}: {e}")
+        fields = {"derivatives": {}}
+    await asyncio.to_thread(_record_result, sha256, fields)
+
+
+def schedule_derivatives(uploads: Iterable[StoredUpload]):
+    """Queue derivative rendering for newly stored images (call after the blobs are committed)"""
+    if not settings.IMAGE_DERIVATIVES_ENABLED:
+        return
+    seen = set()
+    for upload in uploads:
+        # Deduplicated content was queued when it was first stored
+        if upload.deduplicated or upload.sha256 in seen or not is_derivable(upload.content_type):
+            continue
+        seen.add(upload.sha256)
+        task = asyncio.create_task(process_blob(upload.sha256, upload.extension))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+
+def _pending_blobs():
+    db = SessionLocal()
+    try:
+        return db.query(Blob.sha256, Blob.extension).filter(
+            Blob.derivatives.is_(None),
+            Blob.content_type.like("image/%"),
+            Blob.content_type.notin_(_SKIPPED_TYPES)
+        ).all()
+    finally:
+        db.close()
+
+
+async def process_pending_derivatives():
+    """Render derivatives for images stored while the pipeline was not running"""
+    pending = await asyncio.to_thread(_pending_blobs)
+    if not pending:
+        return
+    logger.info(f"Rendering derivatives for {len(pending)} stored image(s)")
+    limit = asyncio.Semaphore(settings.IMAGE_WORKERS)
+
+    async def run(sha256, extension):
+        async with limit:
+            await process_blob(sha256, extension)
+
+    await asyncio.gather(*(run(sha256, extension) for sha256, extension in pending))
@@ -0,0 +1,154 @@
+"""
+Garbage collector for files under uploads/ that nothing references.
+
+The blob collector (app.services.blobs) only sees blobs that have a row. Files
+without one are left behind by requests that failed between writing the file
+and committing, by derivatives of deleted blobs, by abandoned partial uploads,
+and by legacy uploads whose wish or progress update was deleted.
+
+The upload tree is walked depth-first with each directory's entries sorted, and
+every referenced path is streamed from the database in the same order, so the
+two sequences are merge-joined without holding either one in memory. Files
+that are unreferenced and older than the grace period are deleted.
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.attachment import Attachment
+from app.models.blob import Blob
+from app.models.progress_update import ProgressUpdate
+from app.models.wish import Wish
+from app.services.uploads import UPLOAD_DIR, UPLOAD_URL_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# Paths are compared with "/" mapped below every other character, so that plain
+# string order matches a depth-first walk with sorted directory entries
+_SEPARATOR = "\x01"
+
+_REFERENCE_BATCH_SIZE = 1000
+
+
+@dataclass
+class OrphanReport:
+    scanned_files: int = 0
+    deleted_files: int = 0
+    reclaimed_bytes: int = 0
+
+
+def _sort_key(relative_path: str) -> str:
+    return relative_path.replace("/", _SEPARATOR)
+
+
+def _walk(directory: str, prefix: str = "") -> Iterator[Tuple[str, os.DirEntry]]:
+    """Regular files below `directory` as (sort key, entry), in sort key order"""
+    with os.scandir(directory) as it:
+        entries = sorted((entry for entry in it if not entry.name.startswith(".")), key=lambda entry: entry.name)
+    for entry in entries:
+        relative_path = prefix + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk(entry.path, relative_path + "/")
+        elif entry.is_file(follow_symlinks=False):
+            yield _sort_key(relative_path), entry
+
+
+def _referenced_paths(db: Session) -> Iterator[str]:
+    """Sort keys of every path under uploads/ the database refers to, in order (may repeat)"""
+    url_prefix = UPLOAD_URL_PREFIX + "/"
+    shard = (
+        literal("blobs/") + func.substr(Blob.sha256, 1, 2) + "/" + func.substr(Blob.sha256, 3, 2) + "/" + Blob.sha256
+    )
+    derivatives = func.json_each(Blob.derivatives).table_valued("key", "value")
+
+    def url_paths(column):
+        return select(func.substr(column, len(url_prefix) + 1).label("path")).where(column.startswith(url_prefix))
+
+    paths = union_all(
+        select((shard + Blob.extension).label("path")),
+        select((shard + "_" + derivatives.c.key + derivatives.c.value).label("path"))
+        .select_from(Blob).join(derivatives, literal(True)),
+        url_paths(Attachment.file_path),
+        url_paths(Wish.cover_image),
+        url_paths(ProgressUpdate.image_url),
+    ).subquery()
+    key = func.replace(paths.c.path, "/", _SEPARATOR)
+
+    # SQLite sorts (spilling to its temp store if needed); rows are fetched in batches
+    result = db.execute(select(key).order_by(key), execution_options={"yield_per": _REFERENCE_BATCH_SIZE})
+    for (path_key,) in result:
+        yield path_key
+
+
+def collect_orphaned_files(
+    db: Session,
+    now: Optional[datetime] = None,
+    grace_seconds: Optional[int] = None,
+    dry_run: bool = False
+) -> OrphanReport:
+    """Delete files under uploads/ that are unreferenced and older than the grace period.
+
+    The grace period covers uploads whose request has not committed yet; a
+    deduplicated upload refreshes the stored file's mtime for the same reason.
+    With `dry_run` nothing is deleted, and the report says what would have been.
+    """
+    now = now or datetime.now(timezone.utc)
+    grace_seconds = settings.ORPHAN_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = (now - timedelta(seconds=grace_seconds)).timestamp()
+
+    report = OrphanReport()
+    references = _referenced_paths(db)
+    reference = next(references, None)
+
+    for key, entry in _walk(str(UPLOAD_DIR)):
+        report.scanned_files += 1
+        while reference is not None and reference < key:
+            reference = next(references, None)
+        if reference == key:
+            continue
+
+        try:
+            stat_result = entry.stat(follow_symlinks=False)
+            if stat_result.st_mtime >= cutoff:
+                continue
+            if not dry_run:
+                os.unlink(entry.path)
+        except FileNotFoundError:
+            continue
+        report.deleted_files += 1
+        report.reclaimed_bytes += stat_result.st_size
+
+    if report.deleted_files:
+        action = "would remove" if dry_run else "removed"
+        logger.info(
+            f"Orphan collector {action} {report.deleted_files} of {report.scanned_files} file(s), "
+            f"{report.reclaimed_bytes} bytes"
+        )
+    return report
+
+
+def _run_collection():
+    db = SessionLocal()
+    try:
+        return collect_orphaned_files(db)
+    finally:
+        db.close()
+
+
+async def run_orphan_collector(interval_seconds: Optional[int] = None):
+    """Run the collector forever, once every `interval_seconds`."""
+    interval_seconds = interval_seconds or settings.ORPHAN_GC_INTERVAL_SECONDS
+    while True:
+        try:
+            await asyncio.to_thread(_run_collection)
+        except Exception:
+            logger.exception("Orphan collection failed")
+        await asyncio.sleep(interval_seconds)
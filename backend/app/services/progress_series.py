@@ -0,0 +1,190 @@
+"""
+Downsampled progress history for charts.
+
+A wish's (created_at, progress_value) points are reduced to at most N points,
+either with Largest-Triangle-Three-Buckets (keeps the visual shape) or with a
+per-bucket maximum computed by SQLite in one window-function query. Results are
+kept in an LRU cache per wish; it is invalidated after a commit that touched
+the wish's progress updates, so a chart is normally one dictionary lookup.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.models.progress_update import ProgressUpdate
+from app.models.wish import Wish
+
+LTTB = "lttb"
+BUCKET_MAX = "max"
+
+Point = Tuple[datetime, int]
+
+_DIRTY_KEY = "progress_series_dirty_wishes"
+
+
+def lttb(points: List[Point], threshold: int) -> List[Point]:
+    """Largest-Triangle-Three-Buckets: keep the first and last point, and from
+    each bucket in between the point forming the largest triangle with the
+    previously kept point and the average of the next bucket."""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    xs = [created_at.timestamp() for created_at, _ in points]
+    ys = [value for _, value in points]
+    bucket_size = (n - 2) / (threshold - 2)
+
+    sampled = [points[0]]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        next_start, next_end = end, min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def load_series(db: Session, wish_id: int) -> List[Point]:
+    """Every progress point of a wish, oldest first"""
+    rows = db.execute(
+        select(ProgressUpdate.created_at, ProgressUpdate.progress_value)
+        .where(ProgressUpdate.wish_id == wish_id, ProgressUpdate.progress_value.isnot(None))
+        .order_by(ProgressUpdate.created_at, ProgressUpdate.id)
+    )
+    return [tuple(row) for row in rows]
+
+
+def load_bucket_max_series(db: Session, wish_id: int, points: int) -> List[Point]:
+    """At most `points` points: the highest value of each of `points` equal-count buckets"""
+    numbered = select(
+        ProgressUpdate.created_at,
+        ProgressUpdate.progress_value,
+        func.ntile(points).over(order_by=(ProgressUpdate.created_at, ProgressUpdate.id)).label("bucket"),
+    ).where(
+        ProgressUpdate.wish_id == wish_id, ProgressUpdate.progress_value.isnot(None)
+    ).subquery()
+    # SQLite returns the bare created_at column from the row holding the max()
+    rows = db.execute(
+        select(numbered.c.created_at, func.max(numbered.c.progress_value))
+        .group_by(numbered.c.bucket)
+        .order_by(numbered.c.bucket)
+    )
+    return [tuple(row) for row in rows]
+
+
+class SeriesCache:
+    """LRU of downsampled series, keyed by wish id, then (method, points)"""
+
+    def __init__(self, max_wishes: int = 1024):
+        self.max_wishes = max_wishes
+        self._entries: "OrderedDict[int, Dict[Tuple[str, int], List[Point]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation: a series computed from a snapshot taken
+        # before a commit must not be stored after that commit invalidated it
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, wish_id: int, key: Tuple[str, int]) -> Optional[List[Point]]:
+        with self._lock:
+            series = self._entries.get(wish_id, {}).get(key)
+            if series is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(wish_id)
+            self.hits += 1
+            return series
+
+    def put(self, wish_id: int, key: Tuple[str, int], series: List[Point], generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.setdefault(wish_id, {})[key] = series
+            self._entries.move_to_end(wish_id)
+            while len(self._entries) > self.max_wishes:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, wish_ids):
+        with self._lock:
+            self._generation += 1
+            for wish_id in wish_ids:
+                if self._entries.pop(wish_id, None) is not None:
+                    self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "wishes": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+series_cache = SeriesCache()
+
+
+def get_progress_series(db: Session, wish_id: int, points: int, method: str = LTTB) -> List[Point]:
+    key = (method, points)
+    series = series_cache.get(wish_id, key)
+    if series is not None:
+        return series
+
+    generation = series_cache.generation
+    if method == BUCKET_MAX:
+        series = load_bucket_max_series(db, wish_id, points)
+    else:
+        series = lttb(load_series(db, wish_id), points)
+    series_cache.put(wish_id, key, series, generation)
+    return series
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_series(session: Session, flush_context):
+    changed = set()
+    for obj in session.new:
+        if isinstance(obj, ProgressUpdate) and obj.progress_value is not None:
+            changed.add(obj.wish_id)
+    for obj in session.dirty:
+        if isinstance(obj, ProgressUpdate) and session.is_modified(obj, include_collections=False):
+            changed.add(obj.wish_id)
+    for obj in session.deleted:
+        if isinstance(obj, (ProgressUpdate, Wish)):
+            changed.add(obj.wish_id if isinstance(obj, ProgressUpdate) else obj.id)
+    if changed:
+        session.info.setdefault(_DIRTY_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_series(session: Session):
+    changed = session.info.pop(_DIRTY_KEY, None)
+    if changed:
+        series_cache.invalidate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_series(session: Session):
+    session.info.pop(_DIRTY_KEY, None)
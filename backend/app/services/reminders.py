@@ -0,0 +1,412 @@
+"""
+Reminder scheduler for pending verifications and upcoming deadlines.
+
+Due times are kept in an in-memory heap instead of being polled for:
+
+- verification reminder: verifiers of a wish still pending verification
+  VERIFICATION_REMINDER_AFTER_HOURS after it was requested get a nudge
+- verification escalation: after VERIFICATION_ESCALATION_AFTER_HOURS the owner
+  is told how many verifiers have not responded yet
+- wish / milestone deadline: the owner is reminded DEADLINE_REMINDER_BEFORE_HOURS
+  before a target date
+
+Only due times within the next REMINDER_HORIZON_HOURS are held. They are loaded
+through indexed range queries at startup and whenever the horizon runs out, and
+commits that change a due time push it onto the heap directly. Entries are never
+removed: when one fires, the reminder is claimed with a conditional UPDATE that
+re-checks the row, so stale and duplicate entries simply claim nothing. The
+*_reminded_at columns that UPDATE sets keep reminders from repeating after a
+restart. Everything due within REMINDER_BATCH_WINDOW_SECONDS is sent together.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.milestone import Milestone
+from app.models.notification import Notification
+from app.models.completion_verification import CompletionVerification, VerificationStatus
+from app.models.wish import CompletionStatus, Wish, WishStatus
+
+logger = logging.getLogger(__name__)
+
+VERIFICATION_REMINDER = "verification_reminder"
+VERIFICATION_ESCALATION = "verification_escalation"
+WISH_DEADLINE = "wish_deadline"
+MILESTONE_DEADLINE = "milestone_deadline"
+
+# (due_at, kind, wish or milestone id)
+DueItem = Tuple[datetime, str, int]
+
+_PENDING_KEY = "reminder_due_items"
+
+
+def _reminder_after() -> timedelta:
+    return timedelta(hours=settings.VERIFICATION_REMINDER_AFTER_HOURS)
+
+
+def _escalation_after() -> timedelta:
+    return timedelta(hours=settings.VERIFICATION_ESCALATION_AFTER_HOURS)
+
+
+def _deadline_before() -> timedelta:
+    return timedelta(hours=settings.DEADLINE_REMINDER_BEFORE_HOURS)
+
+
+def load_due_items(db: Session, now: datetime, until: datetime) -> List[DueItem]:
+    """Every unsent reminder due before `until` (including overdue ones)"""
+    items = []
+
+    pending = Wish.completion_status == CompletionStatus.PENDING_VERIFICATION
+    for kind, sent_column, after in (
+        (VERIFICATION_REMINDER, Wish.verification_reminded_at, _reminder_after()),
+        (VERIFICATION_ESCALATION, Wish.verification_escalated_at, _escalation_after()),
+    ):
+        rows = db.execute(
+            select(Wish.id, Wish.verification_requested_at).where(
+                pending,
+                Wish.verification_requested_at <= until - after,
+                sent_column.is_(None),
+            )
+        )
+        items.extend((requested_at + after, kind, wish_id) for wish_id, requested_at in rows)
+
+    # Deadlines that have already passed are the deadline sweeper's business
+    before = _deadline_before()
+    rows = db.execute(
+        select(Wish.id, Wish.target_date).where(
+            Wish.status == WishStatus.CURRENT,
+            Wish.target_date > now,
+            Wish.target_date <= until + before,
+            Wish.deadline_reminded_at.is_(None),
+        )
+    )
+    items.extend((target_date - before, WISH_DEADLINE, wish_id) for wish_id, target_date in rows)
+
+    rows = db.execute(
+        select(Milestone.id, Milestone.target_date).where(
+            Milestone.is_completed == False,
+            Milestone.target_date > now,
+            Milestone.target_date <= until + before,
+            Milestone.deadline_reminded_at.is_(None),
+        )
+    )
+    items.extend((target_date - before, MILESTONE_DEADLINE, milestone_id) for milestone_id, target_date in rows)
+    return items
+
+
+def _send_verification_reminders(db: Session, wish_ids: List[int], now: datetime, until: datetime):
+    claimed = db.execute(
+        update(Wish)
+        .where(
+            Wish.id.in_(wish_ids),
+            Wish.completion_status == CompletionStatus.PENDING_VERIFICATION,
+            Wish.verification_requested_at <= until - _reminder_after(),
+            Wish.verification_reminded_at.is_(None),
+        )
+        .values(verification_reminded_at=now)
+        .returning(Wish.id, Wish.user_id, Wish.title)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not claimed:
+        return []
+
+    wishes = {row.id: row for row in claimed}
+    verifiers = db.execute(
+        select(CompletionVerification.wish_id, CompletionVerification.verifier_user_id).where(
+            CompletionVerification.wish_id.in_(wishes),
+            CompletionVerification.status == VerificationStatus.PENDING,
+        )
+    )
+    return [
+        Notification(
+            user_id=verifier_user_id,
+            type=VERIFICATION_REMINDER,
+            wish_id=wish_id,
+            actor_id=wishes[wish_id].user_id,
+            content=f"'{wishes[wish_id].title}' is still waiting for your verification"
+        )
+        for wish_id, verifier_user_id in verifiers
+    ]
+
+
+def _send_verification_escalations(db: Session, wish_ids: List[int], now: datetime, until: datetime):
+    claimed = db.execute(
+        update(Wish)
+        .where(
+            Wish.id.in_(wish_ids),
+            Wish.completion_status == CompletionStatus.PENDING_VERIFICATION,
+            Wish.verification_requested_at <= until - _escalation_after(),
+            Wish.verification_escalated_at.is_(None),
+        )
+        .values(verification_escalated_at=now)
+        .returning(Wish.id, Wish.user_id, Wish.title, Wish.verifications_pending)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return [
+        Notification(
+            user_id=row.user_id,
+            type=VERIFICATION_ESCALATION,
+            wish_id=row.id,
+            content=f"{row.verifications_pending} verifier(s) haven't responded to '{row.title}' yet"
+        )
+        for row in claimed
+        if row.verifications_pending
+    ]
+
+
+def _send_wish_deadline_reminders(db: Session, wish_ids: List[int], now: datetime, until: datetime):
+    claimed = db.execute(
+        update(Wish)
+        .where(
+            Wish.id.in_(wish_ids),
+            Wish.status == WishStatus.CURRENT,
+            Wish.target_date > now,
+            Wish.target_date <= until + _deadline_before(),
+            Wish.deadline_reminded_at.is_(None),
+        )
+        .values(deadline_reminded_at=now)
+        .returning(Wish.id, Wish.user_id, Wish.title)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return [
+        Notification(
+            user_id=row.user_id,
+            type=WISH_DEADLINE,
+            wish_id=row.id,
+            content=f"Your goal '{row.title}' is due soon"
+        )
+        for row in claimed
+    ]
+
+
+def _send_milestone_deadline_reminders(db: Session, milestone_ids: List[int], now: datetime, until: datetime):
+    claimed = db.execute(
+        update(Milestone)
+        .where(
+            Milestone.id.in_(milestone_ids),
+            Milestone.is_completed == False,
+            Milestone.target_date > now,
+            Milestone.target_date <= until + _deadline_before(),
+            Milestone.deadline_reminded_at.is_(None),
+        )
+        .values(deadline_reminded_at=now)
+        .returning(Milestone.wish_id, Milestone.title)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not claimed:
+        return []
+
+    owners = dict(db.execute(
+        select(Wish.id, Wish.user_id).where(
+            Wish.id.in_({row.wish_id for row in claimed}),
+            Wish.status == WishStatus.CURRENT,
+        )
+    ).all())
+    return [
+        Notification(
+            user_id=owners[row.wish_id],
+            type=MILESTONE_DEADLINE,
+            wish_id=row.wish_id,
+            content=f"Your milestone '{row.title}' is due soon"
+        )
+        for row in claimed
+        if row.wish_id in owners
+    ]
+
+
+_SENDERS = {
+    VERIFICATION_REMINDER: _send_verification_reminders,
+    VERIFICATION_ESCALATION: _send_verification_escalations,
+    WISH_DEADLINE: _send_wish_deadline_reminders,
+    MILESTONE_DEADLINE: _send_milestone_deadline_reminders,
+}
+
+
+def send_due_reminders(db: Session, items: Iterable[DueItem], now: Optional[datetime] = None) -> int:
+    """Claim and send the given reminders in one transaction; returns the number of notifications.
+
+    Items due up to REMINDER_BATCH_WINDOW_SECONDS from now are sent early, so
+    that reminders falling close together go out in one batch.
+    """
+    now = now or datetime.now(timezone.utc)
+    until = now + timedelta(seconds=settings.REMINDER_BATCH_WINDOW_SECONDS)
+
+    ids_by_kind = defaultdict(set)
+    for _, kind, entity_id in items:
+        ids_by_kind[kind].add(entity_id)
+
+    notifications = []
+    for kind, entity_ids in ids_by_kind.items():
+        notifications.extend(_SENDERS[kind](db, list(entity_ids), now, until))
+    db.add_all(notifications)
+    db.commit()
+
+    if notifications:
+        logger.info(f"Reminder scheduler sent {len(notifications)} notification(s)")
+    return len(notifications)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class ReminderScheduler:
+    """Min-heap of upcoming reminders, driven by one asyncio task"""
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, str, int]] = []
+        self._sequence = itertools.count()  # Tie-breaker, so heap entries never compare kinds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.horizon_end: Optional[datetime] = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, items: Iterable[DueItem]):
+        """Add due times; safe to call from any thread, a no-op while the scheduler is not running"""
+        loop = self._loop
+        if loop is None:
+            return
+        items = list(items)
+        if items:
+            loop.call_soon_threadsafe(self._push, items)
+
+    def _push(self, items: Iterable[DueItem]):
+        head = self._heap[0][0] if self._heap else None
+        for due_at, kind, entity_id in items:
+            # Values assigned in this session (not loaded) can still be naive; they are UTC
+            due_at = _as_utc(due_at)
+            # Anything later is picked up when the horizon moves past it
+            if due_at <= self.horizon_end:
+                heapq.heappush(self._heap, (due_at, next(self._sequence), kind, entity_id))
+        if self._heap and (head is None or self._heap[0][0] < head):
+            self._wakeup.set()
+
+    def _pop_due(self, until: datetime) -> List[DueItem]:
+        due = []
+        while self._heap and self._heap[0][0] <= until:
+            due_at, _, kind, entity_id = heapq.heappop(self._heap)
+            due.append((due_at, kind, entity_id))
+        return due
+
+    async def _extend_horizon(self, now: datetime):
+        # Move the horizon first: commits from here on push their own due times,
+        # and the query below sees everything committed before
+        self.horizon_end = now + timedelta(hours=settings.REMINDER_HORIZON_HOURS)
+        self._push(await asyncio.to_thread(_run_load, now, self.horizon_end))
+
+    async def run(self):
+        self._heap = []
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.horizon_end = datetime.now(timezone.utc)
+        batch_window = timedelta(seconds=settings.REMINDER_BATCH_WINDOW_SECONDS)
+        try:
+            while True:
+                now = datetime.now(timezone.utc)
+                try:
+                    if now >= self.horizon_end:
+                        await self._extend_horizon(now)
+                    due = self._pop_due(now + batch_window)
+                    if due:
+                        await asyncio.to_thread(_run_send, due)
+                        continue
+                except Exception:
+                    logger.exception("Reminder scheduler failed")
+                    await asyncio.sleep(settings.REMINDER_BATCH_WINDOW_SECONDS)
+                    continue
+
+                next_at = min(self._heap[0][0], self.horizon_end) if self._heap else self.horizon_end
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max((next_at - now).total_seconds(), 0))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+
+
+reminder_scheduler = ReminderScheduler()
+
+
+def _run_load(now: datetime, until: datetime) -> List[DueItem]:
+    db = SessionLocal()
+    try:
+        return load_due_items(db, now, until)
+    finally:
+        db.close()
+
+
+def _run_send(items: List[DueItem]) -> int:
+    db = SessionLocal()
+    try:
+        return send_due_reminders(db, items)
+    finally:
+        db.close()
+
+
+async def run_reminder_scheduler():
+    await reminder_scheduler.run()
+
+
+# Reminder bookkeeping follows the row it belongs to: a new verification request
+# or a moved deadline makes its reminders due again
+
+@event.listens_for(Wish, "before_insert")
+@event.listens_for(Wish, "before_update")
+def _reset_wish_reminders(mapper, connection, target: Wish):
+    state = inspect(target)
+    if state.attrs.completion_status.history.added and \
+            target.completion_status == CompletionStatus.PENDING_VERIFICATION:
+        target.verification_requested_at = datetime.now(timezone.utc)
+        target.verification_reminded_at = None
+        target.verification_escalated_at = None
+    if state.attrs.target_date.history.added:
+        target.deadline_reminded_at = None
+
+
+@event.listens_for(Milestone, "before_update")
+def _reset_milestone_reminders(mapper, connection, target: Milestone):
+    if inspect(target).attrs.target_date.history.added:
+        target.deadline_reminded_at = None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_due_items(session: Session, flush_context):
+    items = []
+    for obj in itertools.chain(session.new, session.dirty):
+        if isinstance(obj, Wish):
+            attrs = inspect(obj).attrs
+            requested_at = obj.verification_requested_at
+            if attrs.verification_requested_at.history.added and requested_at is not None:
+                items.append((requested_at + _reminder_after(), VERIFICATION_REMINDER, obj.id))
+                items.append((requested_at + _escalation_after(), VERIFICATION_ESCALATION, obj.id))
+            if attrs.target_date.history.added and obj.target_date is not None:
+                items.append((obj.target_date - _deadline_before(), WISH_DEADLINE, obj.id))
+        elif isinstance(obj, Milestone):
+            if inspect(obj).attrs.target_date.history.added and obj.target_date is not None:
+                items.append((obj.target_date - _deadline_before(), MILESTONE_DEADLINE, obj.id))
+    if items:
+        session.info.setdefault(_PENDING_KEY, []).extend(items)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_due_items(session: Session):
+    items = session.info.pop(_PENDING_KEY, None)
+    if items:
+        reminder_scheduler.schedule(items)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_due_items(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,232 @@
+"""
+Streaming upload pipeline into the content-addressed blob store.
+
+Each UploadFile is copied to disk in fixed-size chunks; the writes (and the
+SHA-256 update, which releases the GIL) run in worker threads so the event loop
+never blocks on disk I/O, and no upload is ever held in memory as a whole.
+Per-file and per-request size limits are enforced while streaming, and all the
+files of a request are written concurrently.
+
+Finished files are stored by content hash under uploads/blobs/ab/cd/<sha256><ext>.
+Storing content that already has a blob row just drops the new copy, so
+repeated uploads (and sync retries) are idempotent and cost no extra disk space.
+"""
+import asyncio
+import hashlib
+import mimetypes
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.config import settings
+
+UPLOAD_DIR = Path("uploads")
+UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_URL_PREFIX = "/uploads"
+
+BLOB_DIR = UPLOAD_DIR / "blobs"
+BLOB_TMP_DIR = BLOB_DIR / "tmp"  # Partial uploads, before their hash is known
+BLOB_TMP_DIR.mkdir(parents=True, exist_ok=True)
+
+# Serialises storing the same content (e.g. one image sent twice in a request), striped by hash
+_COMMIT_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def blob_relative_path(sha256: str, extension: str = "") -> str:
+    """Two-level sharded location of a blob, relative to UPLOAD_DIR"""
+    return f"blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def blob_path(sha256: str, extension: str = "") -> Path:
+    return UPLOAD_DIR / blob_relative_path(sha256, extension)
+
+
+def blob_url(sha256: str, extension: str = "") -> str:
+    return f"{UPLOAD_URL_PREFIX}/{blob_relative_path(sha256, extension)}"
+
+
+def derivative_relative_path(sha256: str, name: str, extension: str) -> str:
+    """Resized copy of a blob, stored next to it: blobs/ab/cd/<sha256>_<name><ext>"""
+    return blob_relative_path(f"{sha256}_{name}", extension)  # Same shard: the name starts with the hash
+
+
+def derivative_path(sha256: str, name: str, extension: str) -> Path:
+    return UPLOAD_DIR / derivative_relative_path(sha256, name, extension)
+
+
+def derivative_url(sha256: str, name: str, extension: str) -> str:
+    return f"{UPLOAD_URL_PREFIX}/{derivative_relative_path(sha256, name, extension)}"
+
+
+@dataclass
+class StoredUpload:
+    original_name: str
+    url: str
+    content_type: str
+    extension: str
+    size: int
+    sha256: str
+    deduplicated: bool  # The content was already stored
+
+
+class UploadBudget:
+    """Bytes still allowed for the current request, shared by all of its files"""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.remaining = max_bytes if max_bytes is not None else settings.UPLOAD_MAX_REQUEST_BYTES
+
+    def consume(self, size: int):
+        self.remaining -= size
+        if self.remaining < 0:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Uploads exceed the per-request limit of {settings.UPLOAD_MAX_REQUEST_BYTES} bytes"
+            )
+
+
+def _file_too_large(name: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File '{name}' exceeds the limit of {settings.UPLOAD_MAX_FILE_BYTES} bytes"
+    )
+
+
+def _write_chunk(buffer, hasher, chunk: bytes):
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+def _remove(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _find_blob(sha256: str) -> Optional[Path]:
+    """The stored file for this content, whatever extension it was first uploaded with"""
+    shard = blob_path(sha256).parent
+    if not shard.is_dir():
+        return None
+    if (shard / sha256).exists():
+        return shard / sha256
+    for path in shard.glob(f"{sha256}.*"):  # Not derivatives, which are <sha256>_<name>.<ext>
+        return path
+    return None
+
+
+def _touch_blob(sha256: str) -> Optional[str]:
+    """Mark the blob's row as just used; returns its extension, or None if it has no row"""
+    from datetime import datetime, timezone
+    from sqlalchemy import update
+    from app.database import SessionLocal
+    from app.models.blob import Blob
+
+    db = SessionLocal()
+    try:
+        extension = db.execute(
+            update(Blob)
+            .where(Blob.sha256 == sha256)
+            .values(last_used_at=datetime.now(timezone.utc))
+            .returning(Blob.extension)
+        ).scalar()
+        db.commit()
+        return extension
+    finally:
+        db.close()
+
+
+def _commit_blob(partial_path: Path, sha256: str, extension: str) -> Tuple[str, bool]:
+    """Move a finished upload into place.
+
+    The stored copy is only reused while its Blob row exists: refreshing the
+    row's last_used_at keeps the blob collector off it until the request
+    commits. Without a row the collector may be removing the stored file right
+    now, so the new copy is moved into place over it (under the same name)
+    instead.
+
+    Returns the extension the blob is stored under and whether this call stored the file.
+    """
+    with _COMMIT_LOCKS[int(sha256[:4], 16) % len(_COMMIT_LOCKS)]:
+        stored_extension = _touch_blob(sha256)
+        if stored_extension is not None:
+            existing = blob_path(sha256, stored_extension)
+            if existing.exists():
+                _remove(partial_path)
+                os.utime(existing)  # Fresh again for the orphan collector, which goes by mtime
+                return stored_extension, False
+            extension = stored_extension  # Moved aside by the collector: store ours where the row expects it
+        else:
+            existing = _find_blob(sha256)
+            if existing is not None:
+                extension = existing.name[len(sha256):]  # One file per content, even before its row exists
+        final_path = blob_path(sha256, extension)
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(partial_path, final_path)  # Atomic: concurrent writers of the same content both succeed
+        return extension, True
+
+
+async def save_upload(file: UploadFile, budget: Optional[UploadBudget] = None) -> StoredUpload:
+    """Stream one upload into the blob store"""
+    budget = budget or UploadBudget()
+    original_name = file.filename or "upload"
+
+    # Starlette already knows the size of spooled uploads: reject before copying anything
+    if file.size is not None and file.size > settings.UPLOAD_MAX_FILE_BYTES:
+        raise _file_too_large(original_name)
+
+    extension = os.path.splitext(original_name)[1].lower()
+    partial_path = BLOB_TMP_DIR / f"{uuid.uuid4()}.part"
+
+    hasher = hashlib.sha256()
+    size = 0
+    buffer = await asyncio.to_thread(open, partial_path, "wb")
+    try:
+        try:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.UPLOAD_MAX_FILE_BYTES:
+                    raise _file_too_large(original_name)
+                budget.consume(len(chunk))
+                await asyncio.to_thread(_write_chunk, buffer, hasher, chunk)
+        finally:
+            await asyncio.to_thread(buffer.close)
+        sha256 = hasher.hexdigest()
+        extension, created = await asyncio.to_thread(_commit_blob, partial_path, sha256, extension)
+    except BaseException:
+        await asyncio.to_thread(_remove, partial_path)
+        raise
+
+    return StoredUpload(
+        original_name=original_name,
+        url=blob_url(sha256, extension),
+        content_type=mimetypes.guess_type(original_name)[0] or "application/octet-stream",
+        extension=extension,
+        size=size,
+        sha256=sha256,
+        deduplicated=not created,
+    )
+
+
+async def save_uploads(files: List[UploadFile], budget: Optional[UploadBudget] = None) -> List[StoredUpload]:
+    """Stream several uploads concurrently, returning them in order.
+
+    If any upload fails the error is raised; blobs already stored by the others
+    are left for the blob garbage collector, since a concurrent request may be
+    sharing the same content.
+    """
+    budget = budget or UploadBudget()
+    results = await asyncio.gather(
+        *(save_upload(file, budget) for file in files),
+        return_exceptions=True
+    )
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
@@ -0,0 +1,121 @@
+"""
+Completion verification bookkeeping.
+
+Each wish carries counters of its verification records by status. They are
+changed only through the helpers here, with single UPDATE ... RETURNING
+statements, so after a vote the consensus is read from the returned counters
+instead of reloading every verification of the wish.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.api.notifications import notify_users
+from app.models.completion_verification import CompletionVerification, VerificationStatus
+from app.models.user import User
+from app.models.wish import Wish
+
+_COUNTERS = {
+    VerificationStatus.PENDING: "verifications_pending",
+    VerificationStatus.APPROVED: "verifications_approved",
+    VerificationStatus.DISPUTED: "verifications_disputed",
+}
+
+
+def adjust_verification_counts(db: Session, wish: Wish, deltas: Dict[VerificationStatus, int]) -> Row:
+    """Add `deltas` to the wish's counters atomically; returns the new (pending, approved, disputed)"""
+    table = Wish.__table__
+    columns = [table.c[name] for name in _COUNTERS.values()]
+    counts = db.execute(
+        update(table)
+        .where(table.c.id == wish.id)
+        .values({table.c[_COUNTERS[status]]: table.c[_COUNTERS[status]] + delta for status, delta in deltas.items()})
+        .returning(*columns)
+    ).one()
+    # Keep the loaded wish in step without marking it dirty
+    for name, value in zip(_COUNTERS.values(), counts):
+        set_committed_value(wish, name, value)
+    return counts
+
+
+def add_verifiers(db: Session, wish: Wish, verifiers: Iterable[User], requested_by: User, commit: bool = False) -> List[User]:
+    """Create pending verification records for `verifiers` with one bulk insert and notify them in one batch"""
+    verifiers = list(verifiers)
+    if not verifiers:
+        return verifiers
+
+    db.execute(insert(CompletionVerification), [
+        {"wish_id": wish.id, "verifier_user_id": verifier.id, "status": VerificationStatus.PENDING}
+        for verifier in verifiers
+    ])
+    adjust_verification_counts(db, wish, {VerificationStatus.PENDING: len(verifiers)})
+
+    notify_users(
+        db=db,
+        user_ids=[verifier.id for verifier in verifiers],
+        actor_id=requested_by.id,
+        notification_type="verification_request",
+        wish_id=wish.id,
+        content=f"{requested_by.username} has selected you to verify their goal: {wish.title}",
+        commit=commit
+    )
+    return verifiers
+
+
+def record_vote(
+    db: Session,
+    wish: Wish,
+    verifier_user_id: int,
+    approved: bool,
+    comment: Optional[str] = None,
+    dispute_reason: Optional[str] = None
+) -> Optional[Row]:
+    """Record a verifier's decision if their verification is still pending.
+
+    The status check and the write are one conditional UPDATE, so concurrent
+    votes cannot both count. Returns the wish's new counters, or None if there
+    was no pending verification for this verifier.
+    """
+    status = VerificationStatus.APPROVED if approved else VerificationStatus.DISPUTED
+    voted = db.execute(
+        update(CompletionVerification)
+        .where(
+            CompletionVerification.wish_id == wish.id,
+            CompletionVerification.verifier_user_id == verifier_user_id,
+            CompletionVerification.status == VerificationStatus.PENDING
+        )
+        .values(
+            status=status,
+            comment=comment,
+            dispute_reason=None if approved else dispute_reason,
+            verified_at=datetime.now(timezone.utc)
+        )
+        .returning(CompletionVerification.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if voted is None:
+        return None
+    return adjust_verification_counts(db, wish, {VerificationStatus.PENDING: -1, status: 1})
+
+
+def reset_disputed(db: Session, wish: Wish) -> List[int]:
+    """Put the wish's disputed verifications back to pending; returns their verifier ids"""
+    verifier_ids = db.execute(
+        update(CompletionVerification)
+        .where(
+            CompletionVerification.wish_id == wish.id,
+            CompletionVerification.status == VerificationStatus.DISPUTED
+        )
+        .values(status=VerificationStatus.PENDING, verified_at=None)
+        .returning(CompletionVerification.verifier_user_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if verifier_ids:
+        adjust_verification_counts(
+            db, wish, {VerificationStatus.DISPUTED: -len(verifier_ids), VerificationStatus.PENDING: len(verifier_ids)}
+        )
+    return verifier_ids
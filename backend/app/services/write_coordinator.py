@@ -0,0 +1,154 @@
+"""
+Optional single-writer thread that group-commits small writes.
+
+SQLite has one write lock. With every request committing its own transaction,
+bursts of likes, views and notification updates queue behind busy_timeout
+waits and each pays for its own commit. With WRITE_COORDINATOR_ENABLED, such
+units of work are handed to one writer thread instead. It takes whatever has
+queued up (at most WRITE_BATCH_MAX units, waiting up to WRITE_BATCH_WAIT_MS
+for more), runs each unit in its own SAVEPOINT inside one BEGIN IMMEDIATE
+transaction, commits once and then resolves every caller's future.
+
+A unit that raises only rolls back its own savepoint; the exception is
+re-raised in the request that submitted it. If the group commit itself fails,
+each unit is retried alone so one bad write cannot fail its neighbours.
+
+A unit is a function taking the writer's Session. It must not commit, and
+should return plain values: ORM objects belong to the writer's session.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteUnit = Tuple[Callable[[Session], object], Future]
+
+_STOP = object()
+
+
+class WriteCoordinator:
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.units = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="write-coordinator", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish the queued work, then stop the writer thread"""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        future: "Future[T]" = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "units": self.units,
+        }
+
+    def _next_batch(self) -> Tuple[List[WriteUnit], bool]:
+        """Block for one unit, then gather what else arrives within the batch window"""
+        batch = []
+        item = self._queue.get()
+        wait = settings.WRITE_BATCH_WAIT_MS / 1000
+        while item is not _STOP:
+            batch.append(item)
+            if len(batch) >= settings.WRITE_BATCH_MAX:
+                return batch, False
+            try:
+                item = self._queue.get(timeout=wait) if wait else self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                try:
+                    self._commit_batch(batch)
+                except Exception as exc:  # Never leave a caller waiting on a dead writer
+                    logger.exception("Write batch failed")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(exc)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[WriteUnit]):
+        outcomes = []
+        db = SessionLocal()
+        try:
+            if engine.dialect.name == "sqlite":
+                # Take the write lock up front; a plain SAVEPOINT would open a
+                # transaction that releasing it commits
+                db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                try:
+                    with db.begin_nested():
+                        outcomes.append((future, fn(db), None))
+                except Exception as exc:
+                    outcomes.append((future, None, exc))
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            logger.warning(f"Group commit of {len(batch)} writes failed ({exc}); retrying them one by one")
+            for unit in batch:
+                self._commit_batch([unit])
+            return
+        finally:
+            db.close()
+
+        self.batches += 1
+        self.units += len(batch)
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+write_coordinator = WriteCoordinator()
+
+
+def run_write(db: Session, fn: Callable[[Session], T]) -> T:
+    """Run a unit of work and commit it.
+
+    Goes through the writer thread while it runs; otherwise the unit runs on
+    the request's own session and is committed right away.
+    """
+    if not write_coordinator.running:
+        result = fn(db)
+        db.commit()
+        return result
+    return write_coordinator.submit(fn).result()
@@ -0,0 +1,176 @@
+"""
+Sync Session vs AsyncSession under concurrent requests.
+
+Seeds a throwaway SQLite database (100 users, 50k wishes with milestones) and
+serves the same milestone-list endpoint three ways from a FastAPI app driven
+in-process through httpx:
+
+- `async def` + sync Session: what the milestone, progress and create-wish
+  handlers used to do; every query blocks the event loop
+- `def` + sync Session: FastAPI runs the handler in its thread pool
+- `async def` + AsyncSession (aiosqlite): what those handlers do now
+
+While the clients run, a probe sleeps for a few milliseconds at a time and
+records how late it wakes up: the event loop lag every other request on the
+loop would see. Run from the backend directory:
+
+    python -m benchmarks.bench_async_db [concurrency] [requests]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.database import Base, apply_sqlite_pragmas
+import app.models  # noqa: F401  (resolve relationships)
+from app.core.serializers import encode_many, encode_milestone
+from app.models.milestone import Milestone
+from app.models.user import User
+from app.models.wish import Wish
+
+USERS = 100
+WISHES = 50_000
+POOL_SIZE = 40
+PROBE_INTERVAL = 0.005
+
+
+def seed(engine):
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Wish), [
+            {
+                "id": i, "title": f"Wish {i}", "description": "Run a marathon before the end of the year",
+                "user_id": rng.randint(1, USERS), "status": "current", "progress": 0,
+                "visibility": "public", "created_at": now, "progress_mode": "milestone",
+            }
+            for i in range(1, WISHES + 1)
+        ])
+        conn.execute(insert(Milestone), [
+            {"wish_id": i, "title": f"step {j}", "order_index": j, "points": 1}
+            for i in range(1, WISHES + 1) for j in range(3)
+        ])
+
+
+def milestone_queries(wish_id):
+    """The wish's milestones, plus a count that scans the owner's wishes to give SQLite some work"""
+    owner = select(Wish.user_id).where(Wish.id == wish_id).scalar_subquery()
+    return (
+        select(Milestone).where(Milestone.wish_id == wish_id).order_by(Milestone.order_index),
+        select(func.count(Wish.id)).where(Wish.user_id == owner, Wish.title.like("%7%")),
+    )
+
+
+def build_app(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=POOL_SIZE)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool, pool_size=POOL_SIZE
+    )
+    for sync_engine in (engine, async_engine.sync_engine):
+        event.listen(sync_engine, "connect", lambda dbapi_connection, record: apply_sqlite_pragmas(dbapi_connection))
+    SyncSession = sessionmaker(bind=engine)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    app = FastAPI()
+
+    @app.get("/blocking/{wish_id}")
+    async def blocking(wish_id: int):
+        milestones, count = milestone_queries(wish_id)
+        with SyncSession() as db:
+            return {"milestones": encode_many(encode_milestone, db.scalars(milestones)), "count": db.scalar(count)}
+
+    @app.get("/threadpool/{wish_id}")
+    def threadpool(wish_id: int):
+        milestones, count = milestone_queries(wish_id)
+        with SyncSession() as db:
+            return {"milestones": encode_many(encode_milestone, db.scalars(milestones)), "count": db.scalar(count)}
+
+    @app.get("/async/{wish_id}")
+    async def async_session(wish_id: int):
+        milestones, count = milestone_queries(wish_id)
+        async with AsyncSession() as db:
+            rows = await db.scalars(milestones)
+            return {"milestones": encode_many(encode_milestone, rows), "count": await db.scalar(count)}
+
+    return app, engine, async_engine
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return pick(0.5), pick(0.99), samples[-1] * 1000
+
+
+async def run_path(app, route, concurrency, requests):
+    rng = random.Random(7)
+    wish_ids = [rng.randint(1, WISHES) for _ in range(requests)]
+    latencies, lags = [], []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker(queue):
+            while queue:
+                wish_id = queue.pop()
+                start = time.perf_counter()
+                response = await client.get(f"/{route}/{wish_id}")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(PROBE_INTERVAL)
+                lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(wish_ids) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    p50, p99, _ = percentiles(latencies)
+    lag_p50, lag_p99, lag_max = percentiles(lags)
+    print(
+        f"  {route:<11} {requests / elapsed:6.0f} req/s  request p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  "
+        f"| loop lag p50 {lag_p50:6.1f} ms  p99 {lag_p99:6.1f} ms  max {lag_max:6.1f} ms  "
+        f"({len(lags)} wake-ups in {elapsed:.1f} s)"
+    )
+
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    seed_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(seed_engine)
+    seed(seed_engine)
+    seed_engine.dispose()
+
+    app, engine, async_engine = build_app(path)
+    print(f"{requests} milestone-list requests from {concurrency} concurrent clients, {WISHES} wishes")
+    for route in ("blocking", "threadpool", "async"):
+        await run_path(app, route, concurrency, requests)
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""
+ORM hydration vs Core read models on a 100k-wish dataset.
+
+Seeds a throwaway SQLite database (100 users, 100k wishes of which 10% belong
+to user 1, tags, likes, milestones), then measures latency and peak Python
+memory (tracemalloc, separate run) for the feed and wish-list paths, ORM
+instances vs app.read_models rows. Both sides end in the same encoded response. Run from the backend directory:
+
+    python -m benchmarks.bench_read_models [wishes]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import Base
+import app.models  # noqa: F401  (resolve relationships)
+from app.core.serializers import encode_many, encode_milestone, encode_verifier, encode_wish, encode_wish_card
+from app.models.like import Like
+from app.models.milestone import Milestone
+from app.models.tag import Tag, wish_tags
+from app.models.user import User
+from app.models.wish import Wish
+from app.read_models import list_feed, list_user_wishes
+
+USERS = 100
+
+
+def seed(engine, wish_count):
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"}
+            for i in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Tag), [{"id": i, "name": f"tag{i}", "usage_count": 0} for i in range(1, 51)])
+        conn.execute(insert(Wish), [
+            {
+                "id": i, "title": f"Wish {i}", "description": "Run a marathon before the end of the year",
+                "user_id": 1 if i % 10 == 0 else rng.randint(2, USERS), "status": "current", "progress": i % 100,
+                "visibility": "public", "created_at": now, "progress_mode": "manual",
+            }
+            for i in range(1, wish_count + 1)
+        ])
+        conn.execute(insert(wish_tags), [
+            {"wish_id": i, "tag_id": rng.randint(1, 50)} for i in range(1, wish_count + 1, 2)
+        ])
+        conn.execute(insert(Milestone), [
+            {"wish_id": i, "title": "step", "order_index": 0, "points": 1} for i in range(1, wish_count + 1, 3)
+        ])
+        likes = {(rng.randint(1, USERS), rng.randint(1, wish_count)) for _ in range(wish_count)}
+        conn.execute(insert(Like), [{"user_id": u, "wish_id": w} for u, w in likes])
+
+
+def measure(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    # Tracing slows everything down, so memory gets its own run
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MiB  ({len(result)} rows)")
+
+
+def feed_orm(engine):
+    with Session(engine) as db:
+        wishes = db.query(Wish).filter(
+            Wish.status.in_(["current", "completed"]), Wish.visibility == "public"
+        ).options(selectinload(Wish.tags), selectinload(Wish.attachments)).all()
+        return [encode_wish_card(w) for w in wishes]
+
+
+def feed_read_model(engine):
+    with Session(engine) as db:
+        entries = list_feed(db, [Wish.status.in_(["current", "completed"]), Wish.visibility == "public"])
+        return [encode_wish_card(e) for e in entries]
+
+
+def wish_list_orm(engine, user_id):
+    with Session(engine) as db:
+        wishes = db.query(Wish).filter(Wish.user_id == user_id).order_by(Wish.id).options(
+            selectinload(Wish.milestones), selectinload(Wish.completion_verifications)
+        ).all()
+        return [
+            {
+                **encode_wish(w),
+                "milestones": encode_many(encode_milestone, w.milestones),
+                "verifiers": encode_many(encode_verifier, w.completion_verifications),
+            }
+            for w in wishes
+        ]
+
+
+def wish_list_read_model(engine, user_id):
+    with Session(engine) as db:
+        wishes, milestones, verifiers = list_user_wishes(db, user_id)
+        return [
+            {
+                **encode_wish(w),
+                "milestones": encode_many(encode_milestone, milestones[w.id]),
+                "verifiers": encode_many(encode_verifier, verifiers[w.id]),
+            }
+            for w in wishes
+        ]
+
+
+def main():
+    wish_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    seed(engine, wish_count)
+
+    print(f"Feed over {wish_count} public wishes (the read model also computes engagement counts)")
+    measure("ORM + selectinload", lambda: feed_orm(engine))
+    measure("read model", lambda: feed_read_model(engine))
+
+    print(f"Wish list for user 1 ({wish_count // 10} wishes)")
+    measure("ORM + selectinload", lambda: wish_list_orm(engine, 1))
+    measure("read model", lambda: wish_list_read_model(engine, 1))
+
+
+if __name__ == "__main__":
+    main()
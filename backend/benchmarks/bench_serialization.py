@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: hand-built dicts + jsonable_encoder + json vs precompiled encoders + orjson.
+
+Builds transient Wish objects (no database needed) and times both paths
+for a feed-sized list. Run from the backend directory:
+
+    python -m benchmarks.bench_serialization [rows]
+"""
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.serializers import encode_many, encode_wish, json_response
+import app.models  # noqa: F401  (resolve relationships)
+from app.models.wish import Wish, WishStatus
+
+
+def ensure_utc(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def legacy_wish_to_dict(wish):
+    """The per-field dict the endpoints used to build"""
+    return {
+        "id": wish.id,
+        "title": wish.title,
+        "description": wish.description,
+        "progress": wish.progress,
+        "is_completed": wish.is_completed,
+        "status": wish.status.value if hasattr(wish.status, "value") else wish.status,
+        "created_at": ensure_utc(wish.created_at).isoformat() if wish.created_at else None,
+        "target_date": ensure_utc(wish.target_date).isoformat() if wish.target_date else None,
+        "consequence": wish.consequence,
+        "cover_image": wish.cover_image,
+        "user_id": wish.user_id,
+        "progress_mode": wish.progress_mode,
+        "visibility": wish.visibility.value if hasattr(wish.visibility, "value") else wish.visibility,
+        "requires_verification": wish.requires_verification,
+        "completion_status": wish.completion_status.value if hasattr(wish.completion_status, "value") else wish.completion_status,
+    }
+
+
+def make_wishes(count):
+    now = datetime.now(timezone.utc)
+    return [
+        Wish(
+            id=i,
+            title=f"Wish {i}",
+            description="Run a marathon before the end of the year",
+            progress=i % 100,
+            is_completed=False,
+            status=WishStatus.CURRENT,
+            created_at=now,
+            target_date=now,
+            consequence=None,
+            cover_image=None,
+            user_id=i % 50,
+            progress_mode="manual",
+            visibility="public",
+            requires_verification=False,
+            completion_status="incomplete",
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label, fn, rows, repeat=5):
+    best = min(_run(fn) for _ in range(repeat))
+    print(f"{label:<40} {best * 1000:8.2f} ms  {best / rows * 1e6:6.2f} us/row")
+    return best
+
+
+def _run(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    wishes = make_wishes(rows)
+    print(f"Serializing {rows} wishes (best of 5)")
+
+    old = timed(
+        "dict + jsonable_encoder + json.dumps",
+        lambda: json.dumps(jsonable_encoder([legacy_wish_to_dict(w) for w in wishes])).encode(),
+        rows,
+    )
+    new = timed(
+        "encode_wish + orjson",
+        lambda: json_response(encode_many(encode_wish, wishes)).body,
+        rows,
+    )
+    print(f"Speed-up: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Query budgets for the hot endpoints, with N+1 detection.
+
+Migrates a throwaway SQLite database to head and seeds one user with many
+wishes, each liked, commented on and viewed by several others, plus a full
+notification list with aggregated entries. Every hot endpoint is then called
+in-process inside app.core.query_stats.query_budget: the request fails its
+budget if it issues more statements than allowed, or runs any one statement
+(by fingerprint) more than MAX_REPEATS times. With WISHES rows per list a
+query-per-row loop shows up as a fingerprint repeated about WISHES times.
+Run from the backend directory:
+
+    python -m benchmarks.check_query_budgets [-v]
+
+Exits with status 1 if an endpoint goes over budget.
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault("SECRET_KEY", "query-budgets")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'budgets.db')}"
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from app.core.query_stats import QueryBudgetExceeded, query_budget
+from app.core.security import create_access_token
+from app.database import SessionLocal
+from app.models.comment import Comment
+from app.models.follow import Follow
+from app.models.like import Like
+from app.models.milestone import Milestone
+from app.models.notification import Notification
+from app.models.user import User
+from app.models.view import View
+from app.models.wish import Wish
+from main import app
+
+WISHES = 20
+FANS = 6
+MAX_REPEATS = 3  # Auth lookups and the like legitimately repeat a little
+
+# (path, statement budget); {wish} and {user} are filled in after seeding
+BUDGETS = [
+    ("/api/wishes/public/feed", 8),
+    ("/api/wishes/public/feed?filter_type=Recent", 8),
+    ("/api/wishes/public/feed?filter_type=Following", 8),
+    ("/api/wishes", 5),
+    ("/api/wishes/{wish}", 5),
+    ("/api/wishes/{wish}/milestones", 3),
+    ("/api/engagements/wishes/{wish}/stats", 5),
+    ("/api/engagements/wishes/{wish}/comments", 2),
+    ("/api/users/{user}/followers", 3),
+    ("/api/users/{user}/following", 3),
+    ("/api/notifications/", 3),
+    ("/api/notifications/unread-count", 2),
+    ("/api/users/{user}", 6),
+    ("/api/users/{user}/wishes", 6),
+]
+
+
+def migrate():
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+    command.upgrade(config, "head")
+
+
+def seed():
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        owner = User(email="owner@example.com", username="owner", hashed_password="x")
+        fans = [User(email=f"fan{i}@example.com", username=f"fan{i}", hashed_password="x") for i in range(FANS)]
+        db.add_all([owner, *fans])
+        db.flush()
+
+        wishes = [Wish(title=f"Wish {i}", user_id=owner.id, created_at=now - timedelta(hours=i)) for i in range(WISHES)]
+        db.add_all(wishes)
+        db.flush()
+
+        rows = []
+        for fan in fans:
+            rows.append(Follow(follower_id=fan.id, following_id=owner.id))
+            rows.append(Follow(follower_id=owner.id, following_id=fan.id))
+        for wish in wishes:
+            rows.append(Milestone(wish_id=wish.id, title="First step", order_index=0))
+            rows.append(Milestone(wish_id=wish.id, title="Second step", order_index=1))
+            for fan in fans:
+                rows.append(Like(user_id=fan.id, wish_id=wish.id))
+                rows.append(Comment(user_id=fan.id, wish_id=wish.id, content="Keep going"))
+                rows.append(View(user_id=fan.id, wish_id=wish.id))
+            rows.append(Notification(
+                user_id=owner.id, type="like_aggregated", wish_id=wish.id,
+                actor_ids=json.dumps([fan.id for fan in fans]),
+            ))
+            rows.append(Notification(user_id=owner.id, type="comment", wish_id=wish.id, actor_id=fans[0].id))
+        db.add_all(rows)
+        db.commit()
+        return owner.id, wishes[0].id
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+    migrate()
+    owner_id, wish_id = seed()
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'owner@example.com'})}"}
+    failures = 0
+    for path, budget in BUDGETS:
+        url = path.format(wish=wish_id, user=owner_id)
+        try:
+            with query_budget(max_queries=budget, max_repeats=MAX_REPEATS) as stats:
+                response = client.get(url, headers=headers)
+        except QueryBudgetExceeded as exc:
+            failures += 1
+            print(f"FAIL {path}: {exc}")
+            continue
+        if response.status_code >= 400:
+            failures += 1
+            print(f"FAIL {path}: HTTP {response.status_code} {response.text[:200]}")
+            continue
+        print(f"ok   {path}: {stats.count}/{budget} statements, {stats.duration_ms:.1f} ms")
+        if verbose:
+            for statement, count in stats.fingerprints.most_common():
+                print(f"    {count}x {statement[:150]}")
+
+    if failures:
+        print(f"{failures} endpoint(s) over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
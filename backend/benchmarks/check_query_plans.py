@@ -0,0 +1,176 @@
+"""
+EXPLAIN QUERY PLAN regression check for the hot queries.
+
+Builds a throwaway SQLite database with the Alembic migration chain (so the
+indexes under test are the ones migrations create, not create_all), seeds a
+few rows, then calls the hot endpoints in-process and records every statement
+they send to the database. Each recorded statement is run through
+EXPLAIN QUERY PLAN; a plan step that scans a whole table without an index
+(`SCAN likes`, as opposed to `SEARCH likes USING INDEX ...` or
+`SCAN likes USING COVERING INDEX ...`) fails the check. Run from the backend
+directory:
+
+    python -m benchmarks.check_query_plans [-v]
+
+Exits with status 1 if a full table scan is found.
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault("SECRET_KEY", "query-plans")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'plans.db')}"
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.security import create_access_token
+from app.database import Base, SessionLocal, async_engine, engine, read_engine
+from app.models.comment import Comment
+from app.models.completion_verification import CompletionVerification
+from app.models.follow import Follow
+from app.models.like import Like
+from app.models.milestone import Milestone
+from app.models.notification import Notification
+from app.models.user import User
+from app.models.view import View
+from app.models.wish import CompletionStatus, Wish
+from main import app
+
+# Endpoints whose queries run on every page load, as (method, path) with {wish} / {user} placeholders
+HOT_REQUESTS = [
+    ("GET", "/api/wishes/public/feed"),
+    ("GET", "/api/wishes/public/feed?filter_type=Recent"),
+    ("GET", "/api/wishes"),
+    ("GET", "/api/wishes/{wish}"),
+    ("GET", "/api/wishes/{wish}/milestones"),
+    ("GET", "/api/engagements/wishes/{wish}/stats"),
+    ("GET", "/api/engagements/wishes/{wish}/comments"),
+    ("GET", "/api/users/{user}/followers"),
+    ("GET", "/api/users/{user}/following"),
+    ("GET", "/api/users/{user}/is-following"),
+    ("GET", "/api/notifications/"),
+    ("GET", "/api/notifications/unread-count"),
+    ("GET", "/api/verifications/inbox"),
+    ("GET", "/api/verifications/wishes/{wish}/verifications"),
+    ("POST", "/api/engagements/likes"),
+]
+
+_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+def migrate():
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+    command.upgrade(config, "head")
+
+
+def seed():
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        users = [User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="x") for i in range(3)]
+        db.add_all(users)
+        db.flush()
+        owner, friend, other = users
+        wishes = [
+            Wish(title=f"Wish {i}", user_id=owner.id, created_at=now - timedelta(days=i), target_date=now + timedelta(days=30))
+            for i in range(3)
+        ]
+        db.add_all(wishes)
+        db.flush()
+        wish = wishes[0]
+        wish.completion_status = CompletionStatus.PENDING_VERIFICATION
+        db.add_all([
+            Follow(follower_id=friend.id, following_id=owner.id),
+            Follow(follower_id=owner.id, following_id=friend.id),
+            Like(user_id=friend.id, wish_id=wish.id),
+            Comment(user_id=friend.id, wish_id=wish.id, content="Go!"),
+            View(user_id=other.id, wish_id=wish.id),
+            Milestone(wish_id=wish.id, title="First step", order_index=0),
+            Notification(user_id=owner.id, type="like", wish_id=wish.id, actor_id=friend.id),
+            CompletionVerification(wish_id=wish.id, verifier_user_id=friend.id),
+        ])
+        db.commit()
+        return owner.id, friend.id, wish.id
+
+
+def record_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            statements.append((statement, parameters))
+
+    for sync_engine in {engine, read_engine, async_engine.sync_engine}:
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def full_scans(plan, tables):
+    """Plan steps that read every row of a table, ignoring subqueries and CTEs"""
+    scans = []
+    for row in plan:
+        match = _SCAN.match(row[3])
+        if match:
+            name = match.group(1)
+            table = name if name in tables else re.sub(r"_\d+$", "", name)  # Aliases such as blobs_1
+            if table in tables:
+                scans.append(row[3])
+    return scans
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+    migrate()
+    owner_id, friend_id, wish_id = seed()
+    statements = record_statements()
+    tables = set(Base.metadata.tables)
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'user0@example.com'})}"}
+    failures = 0
+    raw = engine.raw_connection()
+    try:
+        for method, path in HOT_REQUESTS:
+            url = path.format(wish=wish_id, user=friend_id)
+            statements.clear()
+            if method == "POST":
+                response = client.post(url, json={"wish_id": wish_id}, headers=headers)
+            else:
+                response = client.get(url, headers=headers)
+            if response.status_code >= 400:
+                print(f"FAIL {method} {url}: HTTP {response.status_code} {response.text[:200]}")
+                failures += 1
+                continue
+
+            scans = []
+            for statement, parameters in statements:
+                plan = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                for scan in full_scans(plan, tables):
+                    scans.append((scan, statement))
+                if verbose:
+                    print(f"    {' '.join(statement.split())[:120]}")
+                    for row in plan:
+                        print(f"        {row[3]}")
+            if scans:
+                failures += 1
+                print(f"FAIL {method} {path}")
+                for scan, statement in scans:
+                    print(f"    {scan}: {' '.join(statement.split())[:200]}")
+            else:
+                print(f"ok   {method} {path} ({len(statements)} statements)")
+    finally:
+        raw.close()
+
+    if failures:
+        print(f"{failures} hot request(s) scan a full table")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,29 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.api import auth, wishes, users, engagements, progress_updates, notifications, tags, follows, milestones, verifications
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from app.api import auth, wishes, users, engagements, progress_updates, notifications, tags, follows, milestones, verifications, sync, search, uploads
+from app.core.config import settings
+from app.database import (
+    pool_status, pin_reads_to_writer, read_engine, engine, async_engine,
+    READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER
+)
+from app.core.query_stats import collect_queries, instrument
+from app.core import metrics
+from app.services.progress_series import series_cache
+from app.services.reminders import reminder_scheduler
+from app.services.deadline_sweeper import run_deadline_sweeper
+from app.services.reminders import run_reminder_scheduler
+from app.services.blobs import run_blob_collector
+from app.services.orphan_files import run_orphan_collector
+from app.services.write_coordinator import write_coordinator
+from app.services.derivatives import process_pending_derivatives, shutdown_derivative_pool, pending_derivative_tasks
+from contextlib import asynccontextmanager
+import anyio
+import asyncio
 import logging
+import orjson
+import random
 import time
-from pathlib import Path
 
 # Configure logging
 logging.basicConfig(
@@ -13,27 +32,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync endpoints run in AnyIO's thread pool; match it to the connection pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.WORKER_THREADS
+
+    if settings.WRITE_COORDINATOR_ENABLED:
+        write_coordinator.start()
+
+    # Start background jobs
+    background_tasks = []
+    if settings.DEADLINE_SWEEP_ENABLED:
+        background_tasks.append(asyncio.create_task(run_deadline_sweeper()))
+    if settings.REMINDERS_ENABLED:
+        background_tasks.append(asyncio.create_task(run_reminder_scheduler()))
+    if settings.BLOB_GC_ENABLED:
+        background_tasks.append(asyncio.create_task(run_blob_collector()))
+    if settings.ORPHAN_GC_ENABLED:
+        background_tasks.append(asyncio.create_task(run_orphan_collector()))
+    if settings.IMAGE_DERIVATIVES_ENABLED:
+        background_tasks.append(asyncio.create_task(process_pending_derivatives()))
+
+    yield
+
+    # Stop background jobs
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    shutdown_derivative_pool()
+    write_coordinator.stop()
+
 app = FastAPI(
     title="EmptyWishes API",
     description="API for managing wishes and challenges",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add request logging middleware
+# Count and time every statement, per request
+if settings.QUERY_STATS_ENABLED:
+    instrument(engine, read_engine, async_engine.sync_engine)
+
+# Request metrics, plus a sampled structured log line: every failed or slow
+# request is logged, the rest only at REQUEST_LOG_SAMPLE_RATE
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    logger.info(f"Request: {request.method} {request.url.path}")
-    
+    start_time = time.perf_counter()
+    metrics.http_requests_in_flight.inc()
+    response = None
     try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"Response: {request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.2f}s")
-        return response
-    except Exception as e:
-        process_time = time.time() - start_time
-        logger.error(f"Error: {request.method} {request.url.path} - {str(e)} - Time: {process_time:.2f}s")
-        raise
+        with collect_queries() as queries:
+            response = await call_next(request)
+    finally:
+        metrics.http_requests_in_flight.dec()
+        process_time = time.perf_counter() - start_time
+        status_code = response.status_code if response is not None else 500
+        route = metrics.route_template(request)
+        metrics.http_requests_total.inc(request.method, route, str(status_code))
+        metrics.http_request_duration_seconds.observe(process_time, request.method, route)
+        if queries.count:
+            metrics.db_statements_total.inc(route, amount=queries.count)
+            metrics.db_duration_seconds_total.inc(route, amount=queries.duration)
+
+        if status_code >= 500 or process_time * 1000 >= settings.REQUEST_LOG_SLOW_MS \
+                or random.random() < settings.REQUEST_LOG_SAMPLE_RATE:
+            record = {
+                "method": request.method,
+                "route": route,
+                "path": request.url.path,
+                "status": status_code,
+                "duration_ms": round(process_time * 1000, 1),
+                "db_statements": queries.count,
+                "db_ms": round(queries.duration_ms, 1),
+            }
+            logger.log(logging.ERROR if status_code >= 500 else logging.INFO, orjson.dumps(record).decode())
+
+    if settings.QUERY_STATS_ENABLED:
+        response.headers["Server-Timing"] = (
+            f'db;dur={queries.duration_ms:.1f};desc="statements: {queries.count}", app;dur={process_time * 1000:.1f}'
+        )
+        # The same statement over and over is usually a query per row of a list
+        for statement, count in queries.repeated(settings.QUERY_REPEAT_WARN_THRESHOLD):
+            logger.warning(f"Repeated query: {request.method} {route} ran {count}x: {statement[:300]}")
+    return response
+
+# After a successful write, pin this client's reads to the writer for a few seconds
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if read_engine is not engine and request.method in WRITE_METHODS and response.status_code < 400:
+        expires = str(pin_reads_to_writer(request))
+        response.headers[READ_YOUR_WRITES_HEADER] = expires
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            expires,
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+# Reject oversized uploads from their Content-Length, before the body is read.
+# Uploads without a length are still limited while they are streamed to disk.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and \
+                int(content_length) > settings.UPLOAD_MAX_REQUEST_BYTES + MULTIPART_OVERHEAD_BYTES:
+            return ORJSONResponse(
+                status_code=413,
+                content={"detail": f"Uploads exceed the per-request limit of {settings.UPLOAD_MAX_REQUEST_BYTES} bytes"}
+            )
+    return await call_next(request)
 
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +157,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors sent in headers, query timings, the read-your-writes pin
+    expose_headers=["X-Next-Cursor", "Server-Timing", READ_YOUR_WRITES_HEADER],
 )
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
@@ -53,11 +171,11 @@ app.include_router(tags.router, prefix="/api/tags", tags=["tags"])
 app.include_router(follows.router, prefix="/api/users", tags=["follows"])
 app.include_router(milestones.router, tags=["milestones"])
 app.include_router(verifications.router, prefix="/api/verifications", tags=["verifications"])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 
-# Mount uploads directory for serving uploaded images
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Uploaded files, with long-lived caching headers
+app.include_router(uploads.router, prefix="/uploads", tags=["uploads"])
 
 @app.get("/")
 def root():
@@ -67,3 +185,57 @@ def root():
 def health_check():
     return {"status": "healthy", "message": "Backend is reachable"}
 
+# Gauges read when /metrics is scraped
+def _pool_samples(counter):
+    pools = [("write", engine)] + ([("read", read_engine)] if read_engine is not engine else [])
+    return [((name,), pool_status(pool_engine).get(counter)) for name, pool_engine in pools]
+
+metrics.registry.callback_gauge(
+    "db_pool_size", "Connections the pool keeps open", ("pool",), lambda: _pool_samples("size"))
+metrics.registry.callback_gauge(
+    "db_pool_checked_out", "Connections in use", ("pool",), lambda: _pool_samples("checkedout"))
+metrics.registry.callback_gauge(
+    "db_pool_overflow", "Connections beyond pool_size (negative while below it)", ("pool",), lambda: _pool_samples("overflow"))
+metrics.registry.callback_gauge(
+    "worker_threads_busy", "Sync endpoints running in the thread pool", (),
+    lambda: [((), anyio.to_thread.current_default_thread_limiter().borrowed_tokens)])
+
+def _series_cache_samples(key):
+    stats = series_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    values = dict(stats, hit_ratio=stats["hits"] / lookups if lookups else None)
+    return [((), values[key])]
+
+metrics.registry.callback_counter(
+    "progress_series_cache_hits_total", "Progress series cache hits", (), lambda: _series_cache_samples("hits"))
+metrics.registry.callback_counter(
+    "progress_series_cache_misses_total", "Progress series cache misses", (), lambda: _series_cache_samples("misses"))
+metrics.registry.callback_gauge(
+    "progress_series_cache_hit_ratio", "Share of progress series lookups served from the cache", (),
+    lambda: _series_cache_samples("hit_ratio"))
+metrics.registry.callback_gauge(
+    "progress_series_cache_wishes", "Wishes with cached progress series", (), lambda: _series_cache_samples("wishes"))
+
+metrics.registry.callback_gauge(
+    "write_coordinator_queue_depth", "Writes waiting for the writer thread", (),
+    lambda: [((), write_coordinator.stats()["queued"])])
+metrics.registry.callback_gauge(
+    "reminder_scheduler_pending", "Reminders held in the scheduler's heap", (), lambda: [((), len(reminder_scheduler))])
+metrics.registry.callback_gauge(
+    "image_derivative_tasks", "Images queued or rendering derivatives", (), lambda: [((), pending_derivative_tasks())])
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of the request, database and queue metrics"""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/db")
+def database_health():
+    """Connection pool counters, to tell pool exhaustion apart from lock waits"""
+    return {
+        "pool": pool_status(),
+        "read_pool": pool_status(read_engine) if read_engine is not engine else None,
+        "worker_threads": settings.WORKER_THREADS,
+        "write_coordinator": write_coordinator.stats(),
+    }
+